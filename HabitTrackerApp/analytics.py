@@ -1,11 +1,60 @@
 from habits import Habits
-import json
-import os
+import heapq
+from collections import namedtuple
 from datetime import datetime, timezone
+from timestamp_codec import format_checkoff, iso_history, parse_checkoff, today_day_number, SECONDS_PER_DAY
+from streaks import calculate_history_streaks, current_streak
+from instrumentation import instrument_methods
 
+
+# The results returned by the Analytics class. None of the analytics print their results
+# themselves; this is done by the "analytics_output" module, which can print them for the
+# menu or convert them into JSON for scripts. Plain named tuples are used, like "StreakResult".
+
+# The names of the habits found by an analytic:
+# - habit_names (list): The names of the habits.
+# - periodicity (str): The periodicity the habits were filtered by, or None.
+# - archived (bool): Whether the habits are archived.
+HabitListResult = namedtuple("HabitListResult", ["habit_names", "periodicity", "archived"])
+
+# The longest streak of a single habit, or of the habit with the longest streak across all habits:
+# - habit_name (str): The name of the habit, or None if no streak was found.
+# - periodicity (str): The periodicity of the habit, or None if no streak was found.
+# - longest_streak (int): The length of the streak in days or weeks.
+# - all_habits (bool): Whether the streak is the longest across all habits rather than of a single habit.
+LongestStreakResult = namedtuple("LongestStreakResult", ["habit_name", "periodicity", "longest_streak", "all_habits"])
+
+# The habits with the most or the least check-offs:
+# - ranking (str): Either "most" or "least".
+# - check_off_count (int): The number of check-offs of these habits, or None if no habits were found.
+# - habit_names (list): The names of all habits with that number of check-offs.
+CheckoffCountResult = namedtuple("CheckoffCountResult", ["ranking", "check_off_count", "habit_names"])
+
+# The check-offs of a habit within a range of dates:
+# - habit_name (str): The name of the habit.
+# - start_date (str): The first date of the range (YYYY-MM-DD), or None if the range is open.
+# - end_date (str): The last date of the range (YYYY-MM-DD), or None if the range is open.
+# - checkoffs (list): The check-offs within the range as ISO 8601 strings, or None if they were only counted.
+# - check_off_count (int): The number of check-offs within the range.
+CheckoffRangeResult = namedtuple("CheckoffRangeResult", ["habit_name", "start_date", "end_date", "checkoffs", "check_off_count"])
+
+# A single check-off within the check-offs of several habits, as found by "get_checkoffs_across_habits()":
+# - checked_off_at (str): The check-off as an ISO 8601 string.
+# - habit_name (str): The name of the habit.
+# - periodicity (str): The periodicity of the habit.
+CheckoffEvent = namedtuple("CheckoffEvent", ["checked_off_at", "habit_name", "periodicity"])
+
+# The statistics of a single habit, read from its summary record.
+HabitStatistics = namedtuple("HabitStatistics", ["name", "periodicity", "archived", "has_checked_off_today", "total_count",
+                                                 "current_streak", "longest_streak", "first_checkoff", "last_checkoff"])
+
+# The results of all analytics covering every habit, as created by "full_report()".
+FullReport = namedtuple("FullReport", ["habits", "habits_by_periodicity", "archived_habits", "longest_streak", "most_checkoffs", "least_checkoffs"])
+
+@instrument_methods
 class Analytics(Habits):
     
-    def __init__(self, habit_data: dict = None, habit_name: str = None):
+    def __init__(self, habit_data: dict = None, habit_name: str = None, storage = None):
         """This is the constructor for the Analytics class.
 
         Args:
@@ -13,50 +62,41 @@ class Analytics(Habits):
             imported from the Habits parent class. Defaults to None.
             habit_name (str, optional): Stores the name of a given habit that a user wishes
             to interact with and is imported from the Habits parent class. Defaults to None.
+            storage (HabitStorage, optional): The storage the habits are kept in, which is
+            imported from the Habits parent class. Defaults to None (the storage of "storage_mode").
         """
-        super().__init__(habit_data, habit_name)
+        super().__init__(habit_data, habit_name, storage)
         
         
     def show_all_habits(self):
-        """This method displays the names of all habits stored within the
-        "Habits" folder. The method loops through all JSON files and then
-        loads the names of the habits from each file. The names are printed before
-        the next name is temporarily stored in the "loaded_habit" variable.
+        """This method collects the names of all unarchived habits stored within the
+        "Habits" folder. The method loops through all unarchived habits and then
+        loads the names of the habits from each one.
+        
+        Returns:
+            habits (HabitListResult): The names of all unarchived habits.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json") == True:
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-                    if (loaded_habit.get("archived") == True):
-                        continue
-                    print("- "+ loaded_habit.get("name"))
+        habit_names = [loaded_habit.get("name") for loaded_habit in self._storage().iter_habits(archived=False, include_history=False)]
+        return HabitListResult(habit_names, None, False)
                     
     
     def get_longest_streak_single_habit(self):
         """This method calculates the longest streak of check-offs for a single habit.
-        This is done by keeping counters for the current streak and the longest streak.
-        The method checks the periodicity of the habit (daily or weekly) and calculates
-        the streak accordingly after the entire check-off history has loaded and converted
-        from ISO format to a datetime object. A loop is then used to iterate through
-        the converted check-off history, checking the difference in days between each
-        consecutive check-off. If the difference is 1 day (for daily habits) or between
-        7 and 13 days (for weekly habits), the streak counter is incremented.
+        The check-off history and periodicity (daily or weekly) of the habit are passed
+        to the streak engine, which checks the difference in days between each
+        consecutive check-off in a single pass. If the difference is 1 day (for daily habits)
+        or between 7 and 13 days (for weekly habits), the streak continues.
         
         Returns:
-            longest_streak (int): The longest streak found for a given habit and its periodicity.
+            longest_streak (LongestStreakResult): The longest streak found for a given habit and its periodicity.
         """
         
-        # Counters to keep track of the current and longest streaks
-        streak_counter = 1
-        longest_streak = 1
-        
         # Loads the habit data from the JSON file. This method is inherited from the Habits class.
         self.habit_data = self.load_habit_file()
 
@@ -70,253 +110,82 @@ class Analytics(Habits):
             print("The habit \"" + self.habit_name + "\" is archived and cannot be viewed. Please unarchive the habit first.")
             return None
         
-        # The check-off history and the periodicity of the habit are stored.
-        unconverted_checkoffs = self.habit_data.get("check_off_history", [])
+        # The check-off history (decoded into epoch seconds) and the periodicity of the habit are stored.
+        # The storage keeps decoded histories where it can (see "HabitStorage.load_epoch_history()"),
+        # so a history that has not changed since it was last decoded is not parsed again.
+        checkoff_epochs = self._storage().load_epoch_history(self.habit_data["name"])
         checkoff_periodicity = self.habit_data.get("periodicity")
         
-        # A loop runs to convert each entry in the check-off history from a string to a datetime object,
-        # then appends these new values into a new list.
-        converted_checkoffs = []
-        for unconverted_datetime in unconverted_checkoffs:
-            converted_datetime = datetime.fromisoformat(unconverted_datetime.replace("Z", "+00:00"))
-            converted_checkoffs.append(converted_datetime)
-
-        # A loop runs for each entry in the converted check-off history. The difference in days
-        # between each consecutive check-off is calculated and stored a variable.
-        for i in range(1, len(converted_checkoffs)):
-            difference_in_days = (converted_checkoffs[i].date() - converted_checkoffs[i - 1].date()).days
-            
-            # If the difference between check-offs is 1 day (for daily habits) or between 7
-            # and 13 days (for weekly habits), the streak counter is incremented.
-            # Otherwise, the streak counter is reset to 1.
-            if (checkoff_periodicity == "daily") and (difference_in_days == 1):
-                streak_counter += 1
-            elif (checkoff_periodicity == "weekly") and (7 <= difference_in_days <= 13):
-                streak_counter += 1
-            else:
-                streak_counter = 1
-            
-            # The longest streak is compared to the current streak counter and updated should the current streak
-            # be greater than the longest streak.  
-            longest_streak = max(longest_streak, streak_counter)
-        
-        # The longest streak is outputted to the user, with the output specifying the habit's periodicity.
-        if checkoff_periodicity == "daily":
-            print("The longest streak for the habit \"" + self.habit_name + "\" is " + str(longest_streak) + " days.")
-            return longest_streak
-            
-        elif checkoff_periodicity == "weekly":
-            print("The longest streak for the habit \"" + self.habit_name + "\" is " + str(longest_streak) + " weeks.")
-            return longest_streak
-        
-        else:
-            print("Unforseen error occurred. Please check the periodicity of the habit.")
-            return None
+        # The streak engine calculates the longest streak in a single pass over the check-off history.
+        longest_streak = calculate_history_streaks(checkoff_epochs, checkoff_periodicity).longest_streak
+        return LongestStreakResult(self.habit_name, checkoff_periodicity, longest_streak, False)
     
 
     def get_longest_streak_all_habits(self):
         """This method calculates the longest streak of check-offs out of all habits
         stored in the "Habits" folder. The method loops through each JSON file in the
-        folder, loading the habit data and calculating each habit's streak. At the end,
+        folder, loading the habit data and reading each habit's longest streak from its summary record
+        (see "_iter_habit_summaries()", which can split this work between several processes). At the end,
         the streak is compared with the current longest streak stored and saved if it is
-        longer, alongside the habit name. Both the habit name and the streak length is outputted
-        at the end.
+        longer, alongside the habit name.
         
         Returns:
-            longest_streak_all_habits(int) = The longest streak found amongst all currently stored habits.
+            longest_streak (LongestStreakResult): The longest streak found amongst all currently stored habits.
+            Should no streak have been found, the name and periodicity of the habit are None.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
         # Counters to keep track of the longest streak and the name of the
         # habit with the longest streak.
         longest_streak_all_habits = 0
-        habit_with_longest_streak = ""
-
-        # A loop runs to load through all JSON files within the "Habits" directory,
-        # then stores a list of all checkoff history and a habit's periodicity.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json"):
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-
-                    if (loaded_habit.get("archived") == True):
-                        continue
-                                            
-                    unconverted_checkoffs = loaded_habit.get("check_off_history", [])
-                    checkoff_periodicity = loaded_habit.get("periodicity")
-
-                    # A loop runs to convert each entry in the check-off history from a string to a datetime object,
-                    # then appends these new values into a new list.
-                    converted_checkoffs = []
-                    for unconverted_datetime in unconverted_checkoffs:
-                        converted_datetime = datetime.fromisoformat(unconverted_datetime.replace("Z", "+00:00"))
-                        converted_checkoffs.append(converted_datetime)
-
-                    # More counters are defined to keep track of an individual habit's current streak as
-                    # # the loop is being read, as well as the overall maximum streak of a given habit.
-                    streak_counter = 1
-                    single_habit_max_streak = 1
-
-                    # A loop runs for each entry in the converted check-off history. The difference in days
-                    # between each consecutive check-off is calculated and stored a variable.
-                    for i in range(1, len(converted_checkoffs)):
-                        difference_in_days = (converted_checkoffs[i].date() - converted_checkoffs[i - 1].date()).days
-                        
-                        # If the difference between check-offs is 1 day (for daily habits) or between 7
-                        # and 13 days (for weekly habits), the streak counter is incremented.
-                        # Otherwise, the streak counter is reset to 1.
-                        if (checkoff_periodicity == "daily") and (difference_in_days == 1):
-                            streak_counter += 1
-                        elif (checkoff_periodicity == "weekly") and (7 <= difference_in_days <= 13):
-                            streak_counter += 1
-                        else:
-                            streak_counter = 1
-                            
-                        # The longest streak of a single habit is compared to the current longest streak.
-                        # The biggest value is then selected and stored as the new longest streak.
-                        single_habit_max_streak = max(single_habit_max_streak, streak_counter)
-
-                    # The longest streak of a single habit is compared to the longest streak amongst all habits.
-                    # If the former is greater, the value is assigned to the latter and the name of that habit is stored.
-                    if single_habit_max_streak > longest_streak_all_habits:
-                        longest_streak_all_habits = single_habit_max_streak
-                        habit_with_longest_streak = loaded_habit.get("name")
-                        habit_periodicity = loaded_habit.get("periodicity")
-
-        # The longest streak amongst all habits is outputted alongside the name of the habit. In the event that
-        # there are no streaks found, the user is notified.
-        if longest_streak_all_habits > 1:
+        habit_with_longest_streak = None
+        habit_periodicity = None
+
+        # A loop runs to load through all unarchived habits, then reads the longest streak
+        # of each habit from its summary record instead of recalculating it from the history.
+        for habit_name, periodicity, archived, summary in self._iter_habit_summaries(archived=False):
+            single_habit_max_streak = summary["longest_streak"]
+
+            # The longest streak of a single habit is compared to the longest streak amongst all habits.
+            # If the former is greater, the value is assigned to the latter and the name of that habit is stored.
+            if single_habit_max_streak > longest_streak_all_habits:
+                longest_streak_all_habits = single_habit_max_streak
+                habit_with_longest_streak = habit_name
+                habit_periodicity = periodicity
+
+        # A single check-off does not make a streak, in which case no habit is returned.
+        if longest_streak_all_habits <= 1:
+            return LongestStreakResult(None, None, 0, True)
             
-            if habit_periodicity == "daily":
-                print("The longest streak across all habits is made by \"" + habit_with_longest_streak + "\" with " + str(longest_streak_all_habits) + " days.\n")
-                return longest_streak_all_habits
-                
-            elif habit_periodicity == "weekly":
-                print("The longest streak across all habits is made by \"" + habit_with_longest_streak + "\" with " + str(longest_streak_all_habits) + " weeks.\n")
-                return longest_streak_all_habits
-                
-            else:
-                print("There is an error regarding the periodicities. Please check that the habit has a periodicity within the habit file.")
- 
-        else:
-            print("No streaks were found across any habits. Either no streak has been made yet or no check-off history was found.")
-        
-        return None
+        return LongestStreakResult(habit_with_longest_streak, habit_periodicity, longest_streak_all_habits, True)
 
 
     def get_most_checkoff_history(self):
         """This method checks through all JSON files in the "Habits" folder and
         determines which habit has the most check-offs. The method keeps track of
         the maximum number of check-offs and the corresponding habit names. If multiple
-        habits have the same maximum number of check-offs, all of them are printed.
+        habits have the same maximum number of check-offs, all of them are returned.
         
         Returns:
-            habit (list): Stores the names of all habits that have the most checkoff history.
+            habits (CheckoffCountResult): The names of all habits that have the most checkoff history.
         """
-        
-        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
-            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
-            return None
-        
-        # Counters to keep track of the maximum number of check-offs and the corresponding habit names.
-        most_checkoffs = 0
-        habits_with_most_checkoffs = []
-        
-        # A loop runs to check through all JSON files in the "Habits" folder.
-        # The method checks whether the file ends with ".json" and then loads the data.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json"):
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-
-                    if (loaded_habit.get("archived") == True):
-                        continue
-
-                    # The number of check-offs for the current habit is compared to the current
-                    # holder of the habit with most values. If the current habit has more check-offs,
-                    # the highest number of check-offs is updated and the habit name is stored.
-                    if len(loaded_habit.get("check_off_history", [])) > most_checkoffs:
-                        most_checkoffs = len(loaded_habit.get("check_off_history", []))
-                        habits_with_most_checkoffs = [loaded_habit.get("name")]
-                        
-                    # If the current habit has the same number of check-offs as the maximum,
-                    # the habit name is added to the list of habits with the most check-offs.
-                    elif len(loaded_habit.get("check_off_history", [])) == most_checkoffs:
-                        habits_with_most_checkoffs.append(loaded_habit.get("name"))
-        
-        # A loop runs to print the habit(s) with the most check-offs.
-        if habits_with_most_checkoffs:
-            print("The habit(s) with the most check-offs (" + str(most_checkoffs) + ") are:")
-            for habit in habits_with_most_checkoffs:
-                print("- " + habit)
-            return habit
-        
-        else:
-            print("No habits were found. Please create a new habit.")
-            return None
+        return self._rank_checkoff_history("most")
         
 
     def get_least_checkoff_history(self):
         """This method checks through all JSON files in the "Habits" folder and
         determines which habit has the least check-offs. The method keeps track of
         the minimum number of check-offs and the corresponding habit names. If multiple
-        habits have the same minimum number of check-offs, all of them are printed.
+        habits have the same minimum number of check-offs, all of them are returned.
         
         Returns:
-            habit (list): Stores the names of all habits that have the least checkoff history.
+            habits (CheckoffCountResult): The names of all habits that have the least checkoff history.
         """
-        
-        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
-            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
-            return None
-        
-        # Counters to keep track of the minimum number of check-offs and the corresponding habit names.
-        # It should be noted that the minimum number of check-offs is initially set to infinity so that
-        # any initial value during the loop will be less than least_checkoffs.
-        least_checkoffs = float("inf")
-        habits_with_least_checkoffs = []
-        
-        # A loop runs to check through all JSON files in the "Habits" folder.
-        # The method checks whether the file ends with ".json" and then loads the data.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json") == True:
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-
-                    if (loaded_habit.get("archived") == True):
-                        continue
-
-                    # The number of check-offs for the current habit is compared to the current
-                    # holder of the habit with least values. If the current habit has less check-offs,
-                    # the lowest number of check-offs is updated and the habit name is stored.
-                    if len(loaded_habit.get("check_off_history", [])) < least_checkoffs:
-                        least_checkoffs = len(loaded_habit.get("check_off_history", []))
-                        habits_with_least_checkoffs = [loaded_habit.get("name")]
-                        
-                    # If the current habit has the same number of check-offs as the minimum,
-                    # the habit name is added to the list of habits with the least check-offs.
-                    elif len(loaded_habit.get("check_off_history", [])) == least_checkoffs:
-                        habits_with_least_checkoffs.append(loaded_habit.get("name"))
-        
-        # A loop runs to print the habit(s) with the least check-offs.
-        if habits_with_least_checkoffs:
-            print("The habit(s) with the least check-offs (" + str(least_checkoffs) + ") are:")
-            for habit in habits_with_least_checkoffs:
-                print("- " + habit)
-            return habit
-        
-        else:
-            print("No habits were found. Please create a new habit.")
-            return None
+        return self._rank_checkoff_history("least")
 
     
     def get_habits_with_same_periodicity(self, wanted_periodicity: str = "daily"):
@@ -327,54 +196,44 @@ class Analytics(Habits):
         Args:
             wanted_periodicity (str, optional): This is the periodicity to search
             for that is specified by the user. Defaults to "daily".
+        
+        Returns:
+            habits (HabitListResult): The names of all unarchived habits with that periodicity.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
-        # Used to store all habits with the same periodicity as the one specified by the user.
+        # Loops through each unarchived habit with the periodicity specified by the user,
+        # and adds the habit name to the list.
         all_habits = []
-        
-        # Loops through each JSON file in the "Habits" folder, then checks whether the file ends with ".json".
-        # If it does, the file is opened and the periodicity of the habit is checked.
-        # If the periodicity matches the one specified by the user, the habit name is added to the list.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json"):
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-
-                    if (loaded_habit.get("archived") == True):
-                        continue
-                                            
-                    periodicity = loaded_habit.get("periodicity")
-                    
-                    if wanted_periodicity == periodicity:
-                        all_habits.append(loaded_habit.get("name")) 
-
-        if all_habits:
-            print("The following habits have the periodicity of \"" + wanted_periodicity + "\":")
-            for habit in all_habits:
-                print("- " + habit)
-            return habit
-                
-        else:
-            print("No habits were found with that periodicity. Please create a new habit with that periodicity.")
-            return None
+        for loaded_habit in self._storage().iter_habits(archived=False, periodicity=wanted_periodicity, include_history=False):
+            all_habits.append(loaded_habit.get("name"))
+
+        return HabitListResult(all_habits, wanted_periodicity, False)
         
        
-    def get_history_of_checkoffs_time_range(self):
+    def get_history_of_checkoffs_time_range(self, start_date: str = None, end_date: str = None):
         """This method gets the history of check-offs for a specific habit within
-        a specified range of dates. The habit is loaded from the JSON file and the user
-        is then prompted to enter a start and end date. The method checks if the dates
-        are in the correct format (YYYY-MM-DD) and converts them to datetime objects.
-        Afterwards, the method filters the check-off history based on the specified date range
-        and outputs the filtered check-off history to the user after being sanitised for
-        readability.
+        a specified range of dates. The habit is loaded from the JSON file and, unless
+        any dates were passed in, the user is then prompted to enter a start and end date.
+        The method checks if the dates are in the correct format (YYYY-MM-DD). Afterwards,
+        the check-offs within the range are found via "get_checkoffs_in_range()".
+        
+        Args:
+            start_date (str, optional): The first date of the range (YYYY-MM-DD). Defaults to None (prompted).
+            end_date (str, optional): The last date of the range (YYYY-MM-DD). Defaults to None (prompted).
+        
+        Returns:
+            checkoffs (CheckoffRangeResult): The check-offs of the habit within the range of dates.
         """
         
+        # Dates that were passed in are used directly, without prompting the user.
+        if (start_date is not None) or (end_date is not None):
+            return self.get_checkoffs_in_range(start_date, end_date)
+        
         # Loads the habit data from the JSON file. This method is inherited from the Habits class.
         self.habit_data = self.load_habit_file()
 
@@ -389,85 +248,345 @@ class Analytics(Habits):
             return None
         
         # A loop is made that prompts the user for a start and end date, then checks if they are valid. If they are,
-        # the dates are then converted to datetime objects with the UTC timezone and formatted. The loop
-        # is then exited. If the dates are not valid, a ValueError is raised and the user is informed
-        # that they have entered an incorrect date format. The loop continues until valid dates are entered.
-
+        # the dates are formatted and the loop is then exited. If the dates are not valid, a ValueError is raised
+        # and the user is informed that they have entered an incorrect date format. The loop continues until valid dates are entered.
         while True:
             start_date = input("Enter start date (YYYY-MM-DD): ")
-            
+
             try:
-                start_date = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                
+                start_date = datetime.strptime(start_date, "%Y-%m-%d").date().isoformat()
+        
                 end_date = input("Enter end date (YYYY-MM-DD): ")
-                end_date = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                
+                end_date = datetime.strptime(end_date, "%Y-%m-%d").date().isoformat()
+            
                 # Checks if the start date is later than the end date and prints an error message accordingly.
                 if start_date > end_date:
                     print("The start date cannot be later than the end date. Please enter an earlier start date.")
                     continue
-                
+            
                 break
             
             except ValueError:
                 print("You have entered an incorrect date format. Please use YYYY-MM-DD.")
-            
-        # Retrieves the check-off history from the habit data formats it into datetime objects,
-        # then filters the check-offs based on the specified date range. The accepted dates are then
-        # appended to a new list called "filtered_checkoffs".
-        filtered_checkoffs = []
-        for checkoff in self.habit_data.get("check_off_history", []):
-            checkoff_date = datetime.fromisoformat(checkoff.replace("Z", "+00:00"))
-            if start_date <= checkoff_date <= end_date:
-                filtered_checkoffs.append(checkoff)
-        
-        # The specified start and end dates are formatted to only include the date part.
-        start_date = start_date.date()
-        end_date = end_date.date()
-        
-        # All check-offs within the specified date range are printed to the user.
-        # If no check-offs are found, the user is informed that no check-offs were found within the date range.
-        if filtered_checkoffs:
-            print("\nAll check-offs between " + str(start_date) + " and " + str(end_date) + " are:")
-            for checkoff in filtered_checkoffs:
-                checkoff = datetime.fromisoformat(checkoff.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
-                print("- " + checkoff)
-        else:
-            print("\nNo check-offs were found between " + str(start_date) + " and " + str(end_date) + ". Please try again with a different date range or check the habit off.")   
-       
         
+        return self._checkoffs_in_range(start_date, end_date)
+    
+    
+    def get_checkoffs_in_range(self, start_date: str = None, end_date: str = None, count_only: bool = False):
+        """This method finds the check-offs of a habit between two dates (both inclusive) without
+        prompting the user. Either date can be left out to leave the range open on that side.
+        As check-offs are stored in chronological order, the range is found by binary search,
+        so only the check-offs within the range are read, or none at all when only counting them.
+        
+        Args:
+            start_date (str, optional): The first date of the range (YYYY-MM-DD). Defaults to None (the first check-off).
+            end_date (str, optional): The last date of the range (YYYY-MM-DD). Defaults to None (the last check-off).
+            count_only (bool, optional): Whether only the number of check-offs is returned. Defaults to False.
+        
+        Raises:
+            ValueError: If a date is not in the format YYYY-MM-DD or the start date is later than the end date.
+        
+        Returns:
+            checkoffs (CheckoffRangeResult): The check-offs of the habit within the range of dates.
+        """
+        
+        # Loads the habit data from the JSON file. This method is inherited from the Habits class.
+        self.habit_data = self.load_habit_file()
+
+        # In the event that the habit cannot be found, the method terminates.
+        if (self.habit_data == False):
+            return None
+
+        # Checks whether the habit is archived. If it is, an error message is printed
+        # and the method ends.
+        if (self.habit_data.get("archived") == True):
+            print("The habit \"" + self.habit_name + "\" is archived and cannot be viewed. Please unarchive the habit first.")
+            return None
+        
+        return self._checkoffs_in_range(start_date, end_date, count_only)
+    
+    
+    def get_checkoffs_across_habits(self, start_date: str = None, end_date: str = None, periodicity: str = None, archived: bool = False):
+        """This method finds the check-offs of all habits between two dates (both inclusive) and
+        returns them in chronological order. Either date can be left out to leave the range open
+        on that side. Only the summary records are read to find the habits with check-offs
+        within the range. Their histories are merged lazily, each being loaded (and its range
+        found by binary search) only once the merge reaches it, so the check-offs can be streamed
+        to the terminal or a CSV file without holding every history or sorting all check-offs first.
+        
+        Args:
+            start_date (str, optional): The first date of the range (YYYY-MM-DD). Defaults to None (the first check-off).
+            end_date (str, optional): The last date of the range (YYYY-MM-DD). Defaults to None (the last check-off).
+            periodicity (str, optional): Only includes the habits with this periodicity. Defaults to None (all periodicities).
+            archived (bool, optional): Only includes the habits with this archived status. Defaults to False (unarchived
+            habits only), while None includes all habits.
+        
+        Raises:
+            ValueError: If a date is not in the format YYYY-MM-DD or the start date is later than the end date.
+        
+        Returns:
+            checkoffs (generator): A generator of every check-off (CheckoffEvent) within the range, or None
+            if no "Habits" folder was found.
+        """
+        
+        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
+        if not self._storage().exists():
+            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
+            return None
+        
+        start_date, end_date, start_epoch, end_epoch = self._parse_date_range(start_date, end_date)
+        
+        # Only the habits whose first and last check-off overlap the range take part in the merge,
+        # which is decided from their summary records without loading any histories.
+        merged_habits = []
+        for loaded_habit in self._storage().iter_habits(archived=archived, periodicity=periodicity, include_history=False):
+            summary = self._habit_summary(loaded_habit)
+            if summary["last_checkoff"] is None:
+                continue
+            if (start_epoch is not None) and (parse_checkoff(summary["last_checkoff"]) < start_epoch):
+                continue
+            if (end_epoch is not None) and (parse_checkoff(summary["first_checkoff"]) > end_epoch):
+                continue
+            merged_habits.append((loaded_habit.get("name"), loaded_habit.get("periodicity")))
+        
+        return self._merge_checkoffs(merged_habits, start_epoch, end_epoch)
+    
+    
     def get_archived_habits(self):
-        """This method loads all archived habits from the "Habits" directory if it exists.
-        Each habit's "archive" attribute is then stored in a list, then is checked to see
-        whether the habit is archived. If so, the habit name is added to the list and then outputted.
+        """This method finds all archived habits if the "Habits" directory exists. In the JSON
+        storage mode, archived habits are kept within the archive directory, whose index lists
+        the name of every archived habit, so no habit files are opened. Habits that were archived
+        before the archive directory existed are found via the archived status stored within the
+        index of the "Habits" directory. In the other storage modes, each habit's "archive"
+        attribute is checked to see whether the habit is archived (see "HabitStorage.archived_habit_names()").
+        
+        Returns:
+            habits (HabitListResult): The names of all archived habits.
+        """
+        
+        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
+        if not self._storage().exists():
+            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
+            return None
+        
+        return HabitListResult(self._storage().archived_habit_names(), None, True)
+    
+    
+    def get_habit_statistics(self):
+        """This method collects the statistics of all habits within the "Habits" folder.
+        The statistics are read from the summary record of each habit, so no check-off
+        histories are loaded.
+        
+        Returns:
+            habit_statistics (list): The HabitStatistics of every habit, containing its name, periodicity,
+            archived status, checked-off status, total number of check-offs, current and longest
+            streak, and its first and last check-off.
+        """
+        
+        # Checks whether the "Habits" directory exists and returns no statistics if it doesn't.
+        if not self._storage().exists():
+            return []
+        
+        # The summary stores the streak up to the last check-off, so the current streak is
+        # compared with today's date, as a streak whose next check-off is overdue is broken.
+        today = today_day_number()
+        habit_statistics = []
+        for loaded_habit in self._storage().iter_habits(include_history=False):
+            self._refresh_checked_off(loaded_habit)
+            summary = self._habit_summary(loaded_habit)
+            habit_statistics.append(HabitStatistics(
+                name=loaded_habit.get("name"),
+                periodicity=loaded_habit.get("periodicity"),
+                archived=loaded_habit.get("archived", False),
+                has_checked_off_today=loaded_habit.get("has_checked_off_today", False),
+                **dict(summary, current_streak=current_streak(summary, loaded_habit.get("periodicity"), today))))
+        
+        return habit_statistics
+    
+    
+    def full_report(self):
+        """This method creates a report of all analytics that cover every habit, namely all
+        unarchived habits, the habits of each periodicity, all archived habits, the longest
+        streak across all habits, and the habits with the most and the least check-offs.
+        Instead of calling each of these analytics separately (each of which loads every
+        habit again), the habits are loaded once and all analytics are calculated together
+        from their summary records.
+        
+        Returns:
+            report (FullReport): The results of all analytics, or None if no "Habits" folder was found.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
-        # Used to store all archived habits.
+        habit_names = []
+        habits_by_periodicity = {"daily": [], "weekly": []}
         archived_habits = []
+        longest_streak = LongestStreakResult(None, None, 0, True)
+        rankings = {"most": CheckoffCountResult("most", None, []), "least": CheckoffCountResult("least", None, [])}
+        
+        # A single loop runs through all habits. Archived habits are only listed, while every
+        # unarchived habit is compared against the current longest streak and the current
+        # most and least check-offs, using the same rules as the individual analytics.
+        for habit_name, periodicity, archived, summary in self._iter_habit_summaries():
+            if archived == True:
+                archived_habits.append(habit_name)
+                continue
+            
+            habit_names.append(habit_name)
+            habits_by_periodicity.setdefault(periodicity, []).append(habit_name)
+            
+            if (summary["longest_streak"] > 1) and (summary["longest_streak"] > longest_streak.longest_streak):
+                longest_streak = LongestStreakResult(habit_name, periodicity, summary["longest_streak"], True)
+            
+            for ranking, result in rankings.items():
+                rankings[ranking] = self._rank_habit(result, habit_name, summary["total_count"])
+        
+        return FullReport(HabitListResult(habit_names, None, False),
+                          {periodicity: HabitListResult(names, periodicity, False) for periodicity, names in habits_by_periodicity.items()},
+                          HabitListResult(archived_habits, None, True), longest_streak, rankings["most"], rankings["least"])
+    
+    
+    def _rank_checkoff_history(self, ranking: str):
+        """This method determines which unarchived habits have the most or the least check-offs.
+        The number of check-offs of every habit is read from its summary record.
+
+        Args:
+            ranking (str): Either "most" or "least".
+        
+        Returns:
+            habits (CheckoffCountResult): The names of all habits with the most or least check-offs.
+        """
+        
+        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
+        if not self._storage().exists():
+            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
+            return None
+        
+        result = CheckoffCountResult(ranking, None, [])
+        for habit_name, periodicity, archived, summary in self._iter_habit_summaries(archived=False):
+            result = self._rank_habit(result, habit_name, summary["total_count"])
+        return result
+        
+        
+    def _iter_habit_summaries(self, archived: bool = None):
+        """This method yields the summary record of every habit, for the analytics that need
+        nothing else. Should the process mode be enabled (via "HABIT_TRACKER_PROCESS_WORKERS")
+        and the JSON store be large enough, the habit files are summarised by a pool of
+        processes. Otherwise, the habits are summarised one after the other, as before
+        (see "HabitStorage.iter_summaries()").
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+
+        Yields:
+            habit_name (str): The name of the habit.
+            periodicity (str): The periodicity of the habit.
+            archived (bool): Whether the habit is archived.
+            summary (dict): The summary record of the habit.
+        """
+        yield from self._storage().iter_summaries(archived)
+        
+        
+    def _rank_habit(self, result: CheckoffCountResult, habit_name: str, total_checkoffs: int):
+        """This method compares the number of check-offs of a habit to the current holder(s) of
+        the most or least check-offs. If the habit has more (or less) check-offs, it replaces them,
+        while a habit with the same number of check-offs is added to them.
+
+        Args:
+            result (CheckoffCountResult): The habits with the most or least check-offs so far.
+            habit_name (str): The name of the habit to compare.
+            total_checkoffs (int): The number of check-offs of the habit.
+        
+        Returns:
+            result (CheckoffCountResult): The updated habits with the most or least check-offs.
+        """
+        if (result.check_off_count is None) or ((result.ranking == "most") and (total_checkoffs > result.check_off_count)) \
+                or ((result.ranking == "least") and (total_checkoffs < result.check_off_count)):
+            return CheckoffCountResult(result.ranking, total_checkoffs, [habit_name])
+        
+        if total_checkoffs == result.check_off_count:
+            result.habit_names.append(habit_name)
+        return result
+    
+    
+    def _checkoffs_in_range(self, start_date: str, end_date: str, count_only: bool = False):
+        """This method finds the check-offs of the loaded habit between two dates via the
+        range query of the storage (see "HabitStorage.checkoffs_in_range()").
+
+        Args:
+            start_date (str): The first date of the range (YYYY-MM-DD), or None.
+            end_date (str): The last date of the range (YYYY-MM-DD), or None.
+            count_only (bool, optional): Whether only the number of check-offs is returned. Defaults to False.
+
+        Raises:
+            ValueError: If a date is not in the format YYYY-MM-DD or the start date is later than the end date.
+
+        Returns:
+            checkoffs (CheckoffRangeResult): The check-offs of the habit within the range of dates.
+        """
+        start_date, end_date, start_epoch, end_epoch = self._parse_date_range(start_date, end_date)
+        
+        storage = self._storage()
+        if count_only:
+            return CheckoffRangeResult(self.habit_name, start_date, end_date, None, storage.count_checkoffs_in_range(self.habit_data, start_epoch, end_epoch))
+        
+        filtered_checkoffs = iso_history(storage.checkoffs_in_range(self.habit_data, start_epoch, end_epoch))
+        return CheckoffRangeResult(self.habit_name, start_date, end_date, filtered_checkoffs, len(filtered_checkoffs))
+    
+    
+    def _parse_date_range(self, start_date: str, end_date: str):
+        """This method converts a range of dates into epoch seconds in UTC, with the end date
+        including the whole day. Either date can be None to leave the range open on that side.
+
+        Args:
+            start_date (str): The first date of the range (YYYY-MM-DD), or None.
+            end_date (str): The last date of the range (YYYY-MM-DD), or None.
+
+        Raises:
+            ValueError: If a date is not in the format YYYY-MM-DD or the start date is later than the end date.
+
+        Returns:
+            date_range (tuple): The normalised start and end dates, followed by the start and end in epoch seconds.
+        """
+        start_epoch = None
+        end_epoch = None
+        if start_date is not None:
+            start_date = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            start_epoch = int(start_date.timestamp())
+            start_date = start_date.date().isoformat()
+        if end_date is not None:
+            end_date = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            end_epoch = int(end_date.timestamp()) + SECONDS_PER_DAY - 1
+            end_date = end_date.date().isoformat()
+        if (start_epoch is not None) and (end_epoch is not None) and (start_epoch > end_epoch):
+            raise ValueError("The start date cannot be later than the end date.")
+        
+        return start_date, end_date, start_epoch, end_epoch
+    
+    
+    def _merge_checkoffs(self, merged_habits: list, start_epoch: int = None, end_epoch: int = None):
+        """This generator merges the check-offs of several habits into chronological order.
+        As every history is already sorted, "heapq.merge()" only keeps the next check-off of
+        each habit in its heap, and every check-off is only converted when it is reached.
+        The history of every habit is loaded once, and only its check-offs within the range
+        are visited (see "HabitStorage.iter_checkoff_range()").
+
+        Args:
+            merged_habits (list): The name and periodicity of every habit to merge.
+            start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+            end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+        Yields:
+            checkoff (CheckoffEvent): The next check-off across all habits.
+        """
+        storage = self._storage()
+        
+        def habit_checkoffs(habit_name: str, periodicity: str):
+            for checkoff in storage.iter_checkoff_range(habit_name, start_epoch, end_epoch):
+                yield parse_checkoff(checkoff), habit_name, periodicity, checkoff
         
-        # Loops through each JSON file in the "Habits" folder, then checks whether the file ends with ".json".
-        # If it does, the file is opened and the "archived" key is checked. Should the habit be archived,
-        # the habit name is added to the list of archived habits.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json"):
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-                    if loaded_habit.get("archived") == True:
-                        archived_habits.append(loaded_habit.get("name"))
-        
-        # A loop runs to print all archived habits from the saved list.
-        # If no archived habits are found, the user is informed.
-        if archived_habits:
-            print("The following habits are archived:")
-            for habit in archived_habits:
-                print("- " + habit)
-        else:
-            print("No archived habits found.")
-        
-        return None
+        for epoch_seconds, habit_name, periodicity, checkoff in heapq.merge(*[habit_checkoffs(*merged_habit) for merged_habit in merged_habits]):
+            yield CheckoffEvent(format_checkoff(checkoff), habit_name, periodicity)
@@ -0,0 +1,213 @@
+import csv
+import json
+from analytics import HabitListResult, LongestStreakResult, CheckoffCountResult, CheckoffRangeResult, CheckoffEvent, FullReport
+from timestamp_codec import format_checkoff
+
+
+# This module is the presentation layer of the Analytics class. The analytics only return
+# result objects, which are either formatted as the messages shown within the menu or
+# converted into JSON for scripts.
+
+
+def format_result(result):
+    """This function formats the result of an analytic as the message shown to the user.
+
+    Args:
+        result: The result returned by a method of the Analytics class, or None if the
+        analytic failed (in which case the reason was already printed).
+
+    Returns:
+        message (str): The formatted result, which may be empty.
+    """
+    if result is None:
+        return ""
+    if isinstance(result, list):
+        return _format_statistics(result)
+    return _FORMATTERS[type(result)](result)
+
+
+def print_result(result):
+    """This function prints the result of an analytic, unless there is nothing to print.
+
+    Args:
+        result: The result returned by a method of the Analytics class.
+    """
+    message = format_result(result)
+    if message:
+        print(message)
+
+
+def to_data(result):
+    """This function converts the result of an analytic into plain dictionaries and lists.
+
+    Args:
+        result: The result returned by a method of the Analytics class.
+
+    Returns:
+        data: The result as data that can be written as JSON.
+    """
+    if hasattr(result, "_asdict"):
+        return {field: to_data(value) for field, value in result._asdict().items()}
+    if isinstance(result, dict):
+        return {key: to_data(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [to_data(value) for value in result]
+    return result
+
+
+def to_json(result, indent: int = 4):
+    """This function converts the result of an analytic into JSON.
+
+    Args:
+        result: The result returned by a method of the Analytics class.
+        indent (int, optional): The indentation of the JSON document. Defaults to 4.
+
+    Returns:
+        json_result (str): The result as JSON.
+    """
+    return json.dumps(to_data(result), indent=indent)
+
+
+def write_checkoffs(checkoffs, write_file, as_csv: bool = False):
+    """This function writes the check-offs found by "get_checkoffs_across_habits()" one by one,
+    so that they are streamed rather than collected first.
+
+    Args:
+        checkoffs (generator): The check-offs (CheckoffEvent) to write.
+        write_file: The open file (or standard output) to write to.
+        as_csv (bool, optional): Whether the check-offs are written as CSV with a header row
+        instead of one readable line per check-off. Defaults to False.
+
+    Returns:
+        check_off_count (int): The number of check-offs written.
+    """
+    check_off_count = 0
+    if as_csv:
+        csv_writer = csv.writer(write_file)
+        csv_writer.writerow(CheckoffEvent._fields)
+        for checkoff in checkoffs:
+            csv_writer.writerow(checkoff)
+            check_off_count += 1
+        return check_off_count
+
+    for checkoff in checkoffs:
+        write_file.write(format_checkoff(checkoff.checked_off_at, "%Y-%m-%d %H:%M:%S") + " - " + checkoff.habit_name + "\n")
+        check_off_count += 1
+    if check_off_count == 0:
+        write_file.write("No check-offs were found within that range of dates.\n")
+    return check_off_count
+
+
+def _streak_unit(periodicity: str, streak: int):
+    """This function returns the unit of a streak (" day(s)" or " week(s)") for a periodicity and streak length."""
+    unit = " week" if periodicity == "weekly" else " day"
+    return unit if streak == 1 else unit + "s"
+
+
+def _format_names(habit_names: list):
+    """This function formats a list of names (or check-offs) as one bullet point per line."""
+    return "\n".join("- " + habit_name for habit_name in habit_names)
+
+
+def _format_habit_list(result: HabitListResult):
+    """This function formats the habits found by "show_all_habits()", "get_habits_with_same_periodicity()" or "get_archived_habits()"."""
+    if result.periodicity is not None:
+        if not result.habit_names:
+            return "No habits were found with that periodicity. Please create a new habit with that periodicity."
+        return "The following habits have the periodicity of \"" + result.periodicity + "\":\n" + _format_names(result.habit_names)
+
+    if result.archived:
+        if not result.habit_names:
+            return "No archived habits found."
+        return "The following habits are archived:\n" + _format_names(result.habit_names)
+
+    return _format_names(result.habit_names)
+
+
+def _format_longest_streak(result: LongestStreakResult):
+    """This function formats the longest streak of a single habit or across all habits."""
+    if result.all_habits:
+        if result.habit_name is None:
+            return "No streaks were found across any habits. Either no streak has been made yet or no check-off history was found."
+        if result.periodicity not in ("daily", "weekly"):
+            return "There is an error regarding the periodicities. Please check that the habit has a periodicity within the habit file."
+        return "The longest streak across all habits is made by \"" + result.habit_name + "\" with " + str(result.longest_streak) + _streak_unit(result.periodicity, result.longest_streak) + ".\n"
+
+    if result.periodicity not in ("daily", "weekly"):
+        return "Unforseen error occurred. Please check the periodicity of the habit."
+    return "The longest streak for the habit \"" + result.habit_name + "\" is " + str(result.longest_streak) + _streak_unit(result.periodicity, result.longest_streak) + "."
+
+
+def _format_checkoff_count(result: CheckoffCountResult):
+    """This function formats the habits with the most or the least check-offs."""
+    if not result.habit_names:
+        return "No habits were found. Please create a new habit."
+    return "The habit(s) with the " + result.ranking + " check-offs (" + str(result.check_off_count) + ") are:\n" + _format_names(result.habit_names)
+
+
+def _format_checkoff_range(result: CheckoffRangeResult):
+    """This function formats the check-offs of a habit within a range of dates, or only their number."""
+    if (result.start_date is not None) and (result.end_date is not None):
+        date_range = "between " + result.start_date + " and " + result.end_date
+    elif result.start_date is not None:
+        date_range = "since " + result.start_date
+    elif result.end_date is not None:
+        date_range = "until " + result.end_date
+    else:
+        date_range = "in total"
+
+    if result.checkoffs is None:
+        return "The habit \"" + result.habit_name + "\" was checked-off " + str(result.check_off_count) + " time(s) " + date_range + "."
+    if not result.checkoffs:
+        return "\nNo check-offs were found " + date_range + ". Please try again with a different date range or check the habit off."
+    checkoffs = [format_checkoff(checkoff, "%Y-%m-%d %H:%M:%S") for checkoff in result.checkoffs]
+    return "\nAll check-offs " + date_range + " are:\n" + _format_names(checkoffs)
+
+
+def _format_statistics(habit_statistics: list):
+    """This function formats the statistics of all habits, one line per habit."""
+    if not habit_statistics:
+        return "No habits were found. Please create a new habit."
+
+    lines = []
+    for statistics in habit_statistics:
+        lines.append("- " + statistics.name + (" (archived)" if statistics.archived else "") + ": "
+                     + str(statistics.total_count) + (" check-off" if statistics.total_count == 1 else " check-offs") + ", current streak " + str(statistics.current_streak)
+                     + _streak_unit(statistics.periodicity, statistics.current_streak)
+                     + ", longest streak " + str(statistics.longest_streak) + _streak_unit(statistics.periodicity, statistics.longest_streak) + ".")
+    return "\n".join(lines)
+
+
+def _format_full_report(report: FullReport):
+    """This function formats a full report on a single screen."""
+    def names(habit_list: HabitListResult):
+        return ", ".join(habit_list.habit_names) if habit_list.habit_names else "None"
+
+    lines = ["Habits (" + str(len(report.habits.habit_names)) + "): " + names(report.habits)]
+    for periodicity, habit_list in report.habits_by_periodicity.items():
+        lines.append(str(periodicity).capitalize() + " habits: " + names(habit_list))
+    lines.append("Archived habits: " + names(report.archived_habits))
+
+    if report.longest_streak.habit_name is not None:
+        lines.append("Longest streak: \"" + report.longest_streak.habit_name + "\" with " + str(report.longest_streak.longest_streak)
+                     + _streak_unit(report.longest_streak.periodicity, report.longest_streak.longest_streak) + ".")
+    else:
+        lines.append("Longest streak: No streaks were found.")
+
+    for ranking in (report.most_checkoffs, report.least_checkoffs):
+        label = ranking.ranking.capitalize() + " check-offs"
+        if ranking.habit_names:
+            lines.append(label + " (" + str(ranking.check_off_count) + "): " + ", ".join(ranking.habit_names))
+        else:
+            lines.append(label + ": No habits were found.")
+    return "\n".join(lines)
+
+
+# The formatter used for every type of result.
+_FORMATTERS = {
+    HabitListResult: _format_habit_list,
+    LongestStreakResult: _format_longest_streak,
+    CheckoffCountResult: _format_checkoff_count,
+    CheckoffRangeResult: _format_checkoff_range,
+    FullReport: _format_full_report,
+}
@@ -0,0 +1,192 @@
+import atexit
+import os
+import threading
+import time
+
+
+# The durability modes of the files written by the application:
+# - none: Files are replaced atomically, so a crash of the application never leaves a half-written
+#   file behind, but the operating system decides when the files reach the disk.
+# - fsync: Every file (and its directory) is flushed to the disk before the write returns, so no
+#   write is lost to a power failure, at the cost of waiting on the disk for every write.
+# - group: Writes are flushed to the disk in groups, with every directory flushed only once per
+#   group, which costs far less than flushing every write while losing at most the writes of the
+#   latest group to a power failure.
+# The mode can be selected via the "HABIT_TRACKER_DURABILITY" environment variable.
+DURABILITY_MODES = ("none", "fsync", "group")
+DURABILITY = os.environ.get("HABIT_TRACKER_DURABILITY", "none")
+
+# The number of writes after which a group is flushed, which can be changed via the
+# "HABIT_TRACKER_GROUP_COMMIT_SIZE" environment variable.
+GROUP_COMMIT_SIZE = int(os.environ.get("HABIT_TRACKER_GROUP_COMMIT_SIZE", "64"))
+
+# The number of seconds a write may wait within a group before the next write flushes the group.
+# Any remaining writes are flushed when the application exits.
+GROUP_COMMIT_INTERVAL = 1.0
+
+
+def write_atomically(path_of_file: str, contents: bytes, durability: str = None):
+    """This function replaces the contents of a file without ever leaving a partially written
+    file behind. The contents are written to a temporary file within the same directory, which
+    then takes the place of the file via "os.replace()", so the file holds either its previous
+    or its new contents, even if the application crashes while writing.
+
+    Args:
+        path_of_file (str): The path of the file.
+        contents (bytes): The new contents of the file.
+        durability (str, optional): The durability mode ("none", "fsync" or "group"). Defaults to None ("DURABILITY").
+    """
+    durability = DURABILITY if durability is None else durability
+    directory = os.path.dirname(path_of_file) or "."
+
+    # The temporary file is named after the file, the process and the thread, so that concurrent
+    # writers never share a temporary file. Its name does not end with ".json", so scans of the
+    # habit files never mistake it for a habit file.
+    temporary_path = os.path.join(directory, "." + os.path.basename(path_of_file) + "." + str(os.getpid()) + "-" + str(threading.get_ident()) + ".tmp")
+    try:
+        with open(temporary_path, mode="wb") as write_file:
+            write_file.write(contents)
+            if durability == "fsync":
+                write_file.flush()
+                _fsync(write_file.fileno())
+        os.replace(temporary_path, path_of_file)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+    if durability == "fsync":
+        _fsync_directory(directory)
+    elif durability == "group":
+        _group_commit.add(path_of_file)
+
+
+def sync_appended(write_file, path_of_file: str, created: bool = False, durability: str = None):
+    """This function applies the durability mode to a file that was appended to in place (such as
+    a check-off log), rather than replaced via "write_atomically()". The file is flushed to the disk
+    right away in the "fsync" mode, or added to the current group in the "group" mode.
+
+    Args:
+        write_file (file): The file that was appended to, which is still open.
+        path_of_file (str): The path of the file.
+        created (bool, optional): Whether the file was created by this write, in which case its
+        directory is flushed as well. Defaults to False.
+        durability (str, optional): The durability mode ("none", "fsync" or "group"). Defaults to None ("DURABILITY").
+    """
+    durability = DURABILITY if durability is None else durability
+    if durability == "none":
+        return
+
+    # The buffered contents are handed to the operating system first, as a group may be flushed
+    # through another file descriptor before this file is closed.
+    write_file.flush()
+    if durability == "fsync":
+        _fsync(write_file.fileno())
+        if created:
+            _fsync_directory(os.path.dirname(path_of_file) or ".")
+    elif durability == "group":
+        _group_commit.add(path_of_file)
+
+
+class GroupCommit:
+
+    def __init__(self, size: int = GROUP_COMMIT_SIZE, interval: float = GROUP_COMMIT_INTERVAL):
+        """This is the constructor for the GroupCommit class. It collects the files written in
+        the "group" durability mode and flushes them to the disk together, once enough files
+        were written or the oldest file has waited long enough. Every file is flushed once per
+        group, however often it was written, and every directory is flushed once per group.
+
+        Args:
+            size (int, optional): The number of files after which a group is flushed. Defaults to "GROUP_COMMIT_SIZE".
+            interval (float, optional): The number of seconds after which a group is flushed. Defaults to "GROUP_COMMIT_INTERVAL".
+        """
+        self.size = size
+        self.interval = interval
+        self.pending = set()
+        self.started_at = None
+        self.lock = threading.Lock()
+
+
+    def add(self, path_of_file: str):
+        """This method adds a written file to the current group, flushing the group if it is full.
+
+        Args:
+            path_of_file (str): The path of the written file.
+        """
+        with self.lock:
+            if not self.pending:
+                self.started_at = time.monotonic()
+            self.pending.add(path_of_file)
+            is_full = (len(self.pending) >= self.size) or (time.monotonic() - self.started_at >= self.interval)
+        if is_full:
+            self.flush()
+
+
+    def flush(self):
+        """This method flushes every file of the current group, followed by their directories, to the disk.
+
+        Returns:
+            flushed_files (int): The number of files that were flushed.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, set()
+        directories = set()
+
+        for path_of_file in pending:
+            # Files that were removed or moved since they were written no longer need flushing,
+            # while their directory still does.
+            directories.add(os.path.dirname(path_of_file) or ".")
+            try:
+                file_descriptor = os.open(path_of_file, _FLUSH_FLAGS)
+            except FileNotFoundError:
+                continue
+            try:
+                _fsync(file_descriptor)
+            finally:
+                os.close(file_descriptor)
+
+        for directory in directories:
+            _fsync_directory(directory)
+        return len(pending)
+
+
+def flush_writes():
+    """This function flushes the writes of the current group to the disk, which is done
+    automatically once the group is full and when the application exits.
+
+    Returns:
+        flushed_files (int): The number of files that were flushed.
+    """
+    return _group_commit.flush()
+
+
+# Windows only flushes files that were opened for writing.
+_FLUSH_FLAGS = os.O_RDWR if os.name == "nt" else os.O_RDONLY
+
+
+def _fsync(file_descriptor: int):
+    """This function flushes a file to the disk, counting the flush."""
+    # The import is deferred, as the instrumentation writes its files through this module.
+    from instrumentation import count
+    os.fsync(file_descriptor)
+    count("fsyncs")
+
+
+def _fsync_directory(directory: str):
+    """This function flushes a directory to the disk, so that the files replaced within it
+    remain replaced after a power failure. Windows cannot open directories, and flushes
+    them as part of the files themselves, so nothing is done there.
+    """
+    try:
+        file_descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+# A single group is shared by the whole program, and any writes left within it are flushed when the program exits.
+_group_commit = GroupCommit()
+atexit.register(flush_writes)
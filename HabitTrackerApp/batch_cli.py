@@ -0,0 +1,231 @@
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from habits import Habits
+from instrumentation import OperationStats
+
+
+# The batch command line is meant for scripts and shortcuts, so it never prompts the user and
+# never imports "questionary" (or "prompt_toolkit"). The "analytics" module is only imported by
+# the commands that need it, which keeps the start-up time of a check-off as low as possible.
+
+
+def create_parser():
+    """This function creates the argument parser of the batch command line, with one
+    sub-command for every action that can be performed without user interaction.
+
+    Returns:
+        parser (argparse.ArgumentParser): The parser of the batch command line.
+    """
+    parser = argparse.ArgumentParser(prog="habits", description="Non-interactive commands of the habit tracker. Run without any arguments to open the interactive menu instead.")
+    parser.add_argument("--stats", action="store_true", help="Print the number of files opened, JSON documents parsed and written, bytes read and written, check-offs parsed and the time taken by every method to standard error.")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    create_command = commands.add_parser("create", help="Create a new habit.")
+    create_command.add_argument("name", help="The name of the habit.")
+    create_command.add_argument("--periodicity", choices=["daily", "weekly"], default="daily", help="How often the habit is performed. Defaults to \"daily\".")
+    create_command.add_argument("--description", default="", help="A description of the habit.")
+
+    checkoff_command = commands.add_parser("checkoff", help="Check-off a habit without asking for confirmation.")
+    checkoff_command.add_argument("name", help="The name of the habit.")
+
+    show_command = commands.add_parser("show", help="Show a habit as JSON.")
+    show_command.add_argument("name", help="The name of the habit.")
+
+    # Every analytic can be outputted as JSON instead of the messages shown within the menu.
+    json_option = argparse.ArgumentParser(add_help=False)
+    json_option.add_argument("--json", action="store_true", help="Output the result as JSON.")
+
+    list_command = commands.add_parser("list", parents=[json_option], help="List the names of all unarchived habits.")
+    list_filters = list_command.add_mutually_exclusive_group()
+    list_filters.add_argument("--archived", action="store_true", help="List the archived habits instead.")
+    list_filters.add_argument("--periodicity", choices=["daily", "weekly"], help="Only list the habits with this periodicity.")
+
+    streak_command = commands.add_parser("streak", parents=[json_option], help="Show the longest streak of a habit, or across all habits if no habit is given.")
+    streak_command.add_argument("name", nargs="?", help="The name of the habit.")
+
+    commands.add_parser("most", parents=[json_option], help="Show the habit(s) with the most check-offs.")
+    commands.add_parser("least", parents=[json_option], help="Show the habit(s) with the least check-offs.")
+
+    range_command = commands.add_parser("range", parents=[json_option], help="Show the check-offs of a habit within a range of dates.")
+    range_command.add_argument("name", help="The name of the habit.")
+    range_command.add_argument("--start", help="The first date of the range (YYYY-MM-DD). Defaults to the first check-off.")
+    range_command.add_argument("--end", help="The last date of the range (YYYY-MM-DD). Defaults to the last check-off.")
+    range_command.add_argument("--count", action="store_true", help="Only show the number of check-offs within the range.")
+
+    timeline_command = commands.add_parser("timeline", help="Show the check-offs of all habits within a range of dates in chronological order.")
+    timeline_command.add_argument("--start", help="The first date of the range (YYYY-MM-DD). Defaults to the first check-off.")
+    timeline_command.add_argument("--end", help="The last date of the range (YYYY-MM-DD). Defaults to the last check-off.")
+    timeline_command.add_argument("--periodicity", choices=["daily", "weekly"], help="Only include the habits with this periodicity.")
+    timeline_command.add_argument("--archived", action="store_true", help="Include the archived habits.")
+    timeline_command.add_argument("--csv", action="store_true", help="Output the check-offs as CSV.")
+    timeline_command.add_argument("--output", help="Write the check-offs as CSV to this file instead of the terminal.")
+
+    commands.add_parser("stats", parents=[json_option], help="Show the check-off counts and streaks of all habits.")
+    commands.add_parser("report", parents=[json_option], help="Show all analytics covering every habit on a single screen.")
+
+    for command_name, command_help in [("archive", "Archive a habit."), ("unarchive", "Unarchive a habit."), ("delete", "Delete a habit.")]:
+        commands.add_parser(command_name, help=command_help).add_argument("name", help="The name of the habit.")
+
+    commands.add_parser("seed", help="Create the predefined habits again.")
+    commands.add_parser("rebuild-summaries", help="Recalculate the summary record of every habit from its check-off history.")
+    reshard_command = commands.add_parser("reshard", help="Move every habit file into the flat or the sharded layout.")
+    reshard_command.add_argument("--layout", choices=["flat", "sharded"], default="sharded", help="The layout to move the habit files into (default: sharded).")
+
+    return parser
+
+
+def main(arguments: list = None):
+    """This function runs a single command of the batch command line. With the "--stats"
+    option, the I/O and parse counters of the command are printed to standard error, which
+    keeps the standard output (for example, of "stats --json") unchanged.
+
+    Args:
+        arguments (list, optional): The command-line arguments without the program name.
+        Defaults to None, in which case "sys.argv" is used.
+
+    Returns:
+        exit_code (int): 0 if the command succeeded, otherwise 1.
+    """
+    parsed_arguments = create_parser().parse_args(arguments)
+    if not parsed_arguments.stats:
+        return run_command(parsed_arguments)
+
+    with OperationStats() as stats:
+        exit_code = run_command(parsed_arguments)
+    print(stats.report(), file=sys.stderr)
+    return exit_code
+
+
+def run_command(parsed_arguments: argparse.Namespace):
+    """This function runs the command selected on the command line.
+
+    Args:
+        parsed_arguments (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        exit_code (int): 0 if the command succeeded, otherwise 1.
+    """
+    command = parsed_arguments.command
+
+    if command == "create":
+        habit_data = {
+            "name": parsed_arguments.name,
+            "description": parsed_arguments.description,
+            "periodicity": parsed_arguments.periodicity,
+            "archived": False,
+            "has_checked_off_today": False,
+            "creation_date_time": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+            "check_off_history": []
+        }
+        if Habits(habit_data = habit_data, habit_name = parsed_arguments.name).create_habit_file() == True:
+            print("The habit \"" + parsed_arguments.name + "\" has been created successfully!")
+            return 0
+        print("There was an error creating the habit. This is likely because a habit with that name already exists.")
+        return 1
+
+    if command == "checkoff":
+        return 0 if Habits(habit_name = parsed_arguments.name).checkoff_habit(confirmed = True) == True else 1
+
+    if command == "show":
+        from timestamp_codec import iso_history
+        habit_data = Habits(habit_name = parsed_arguments.name).load_habit_file()
+        if not habit_data:
+            return 1
+        habit_data["check_off_history"] = iso_history(habit_data.get("check_off_history", []))
+        print(json.dumps(habit_data, indent=4))
+        return 0
+
+    if command == "archive":
+        return 0 if Habits(habit_name = parsed_arguments.name).archive_habit() == True else 1
+
+    if command == "unarchive":
+        return 0 if Habits(habit_name = parsed_arguments.name).unarchive_habit() == True else 1
+
+    if command == "delete":
+        return 0 if Habits(habit_name = parsed_arguments.name).delete_habit_file() == True else 1
+
+    if command == "seed":
+        Habits().seed_predefined_habits(force = True)
+        print("The predefined habits have been created.")
+        return 0
+
+    if command == "rebuild-summaries":
+        return 0 if Habits().rebuild_summaries() is not None else 1
+
+    if command == "reshard":
+        return 0 if Habits().reshard_store(parsed_arguments.layout) is not None else 1
+
+    # The remaining commands are analytics, so the "analytics" module and its presentation
+    # layer are only imported here.
+    from analytics import Analytics
+    import analytics_output
+
+    if command == "list":
+        if parsed_arguments.archived:
+            result = Analytics().get_archived_habits()
+        elif parsed_arguments.periodicity:
+            result = Analytics().get_habits_with_same_periodicity(parsed_arguments.periodicity)
+        else:
+            result = Analytics().show_all_habits()
+
+    elif command == "streak":
+        if parsed_arguments.name:
+            result = Analytics(habit_name = parsed_arguments.name).get_longest_streak_single_habit()
+        else:
+            result = Analytics().get_longest_streak_all_habits()
+
+    elif command == "most":
+        result = Analytics().get_most_checkoff_history()
+
+    elif command == "least":
+        result = Analytics().get_least_checkoff_history()
+
+    elif command == "range":
+        try:
+            result = Analytics(habit_name = parsed_arguments.name).get_checkoffs_in_range(parsed_arguments.start, parsed_arguments.end, parsed_arguments.count)
+        except ValueError:
+            print("Please enter the dates in the format YYYY-MM-DD, with the start date not later than the end date.")
+            return 1
+
+    elif command == "timeline":
+        try:
+            checkoffs = Analytics().get_checkoffs_across_habits(parsed_arguments.start, parsed_arguments.end, parsed_arguments.periodicity,
+                                                                None if parsed_arguments.archived else False)
+        except ValueError:
+            print("Please enter the dates in the format YYYY-MM-DD, with the start date not later than the end date.")
+            return 1
+        if checkoffs is None:
+            return 1
+
+        # The check-offs are written while they are merged, rather than returned as a single result.
+        if parsed_arguments.output:
+            with open(parsed_arguments.output, mode="w", encoding="utf-8", newline="") as write_file:
+                check_off_count = analytics_output.write_checkoffs(checkoffs, write_file, as_csv=True)
+            print(str(check_off_count) + " check-off(s) were written to \"" + parsed_arguments.output + "\".")
+        else:
+            analytics_output.write_checkoffs(checkoffs, sys.stdout, parsed_arguments.csv)
+        return 0
+
+    elif command == "stats":
+        result = Analytics().get_habit_statistics()
+
+    elif command == "report":
+        result = Analytics().full_report()
+
+    else:
+        return 1
+
+    # The result is either printed as within the menu or converted into JSON.
+    if result is None:
+        return 1
+    if parsed_arguments.json:
+        print(analytics_output.to_json(result))
+    else:
+        analytics_output.print_result(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from habits import Habits
+from instrumentation import OperationStats
+
+
+def _never_checked_off(habits, loaded_habit):
+    """This function replaces "Habits._refresh_checked_off()" within the writer processes, so that
+    the habit is never treated as checked-off within the current period and every call records a check-off.
+    """
+    loaded_habit["has_checked_off_today"] = False
+    return False
+
+
+def run_writer(directory: str, habit_name: str, concurrency: str, checkoff_count: int, start_barrier, results):
+    """This function checks-off the same habit over and over within a writer process, once all
+    writers are ready, and reports how many check-offs were recorded, how many failed and how
+    many version conflicts were retried.
+
+    Args:
+        directory (str): The directory containing the "Habits" directory.
+        habit_name (str): The name of the habit to check-off.
+        concurrency (str): The concurrency mode ("locking" or "optimistic").
+        checkoff_count (int): The number of check-offs attempted by the writer.
+        start_barrier (multiprocessing.Barrier): The barrier all writers wait on before starting.
+        results (multiprocessing.Queue): The queue the results of the writer are put into.
+    """
+    os.chdir(directory)
+    Habits._refresh_checked_off = _never_checked_off
+    Habits.concurrency = concurrency
+    recorded_checkoffs = 0
+
+    start_barrier.wait()
+    start_time = time.time()
+    with OperationStats() as stats, contextlib.redirect_stdout(io.StringIO()):
+        for checkoff in range(checkoff_count):
+            if Habits(habit_name = habit_name).checkoff_habit(confirmed = True) == True:
+                recorded_checkoffs += 1
+    results.put((start_time, time.time(), recorded_checkoffs, checkoff_count - recorded_checkoffs, stats.counters["version_conflicts"]))
+
+
+def measure_contention(concurrency: str, writer_count: int, checkoff_count: int):
+    """This function measures how many check-offs of a single habit are recorded per second while
+    "writer_count" processes check it off at the same time, within a temporary directory.
+
+    Args:
+        concurrency (str): The concurrency mode ("locking" or "optimistic").
+        writer_count (int): The number of writer processes.
+        checkoff_count (int): The number of check-offs attempted by every writer.
+
+    Returns:
+        result (dict): The number of check-offs recorded per second, the number of retries per check-off, and the number of failed check-offs.
+    """
+    with tempfile.TemporaryDirectory() as store_directory:
+        previous_directory = os.getcwd()
+        os.chdir(store_directory)
+        try:
+            Habits(habit_data = {"name": "Contended habit", "description": "Checked-off by many writers at once.", "periodicity": "daily", "archived": False,
+                                 "has_checked_off_today": False, "creation_date_time": "2024-01-01T08:00:00Z", "check_off_history": []}).create_habit_file()
+        finally:
+            os.chdir(previous_directory)
+
+        start_barrier = multiprocessing.Barrier(writer_count)
+        results = multiprocessing.Queue()
+        writers = [multiprocessing.Process(target=run_writer, args=(store_directory, "Contended habit", concurrency, checkoff_count, start_barrier, results))
+                   for writer in range(writer_count)]
+        for writer in writers:
+            writer.start()
+        writer_results = [results.get() for writer in writers]
+        for writer in writers:
+            writer.join()
+
+    recorded_checkoffs = sum(result[2] for result in writer_results)
+    seconds = max(result[1] for result in writer_results) - min(result[0] for result in writer_results)
+    return {
+        "checkoffs_per_second": recorded_checkoffs / seconds,
+        "retries_per_checkoff": sum(result[4] for result in writer_results) / max(recorded_checkoffs, 1),
+        "failed_checkoffs": sum(result[3] for result in writer_results),
+    }
+
+
+def benchmark_contention(writer_counts: list = (1, 2, 4, 8, 16, 32, 64), checkoff_count: int = 20, modes: list = ("locking", "optimistic")):
+    """This function compares the concurrency modes while a growing number of processes check-off
+    the same habit at once, which is the worst case for both modes.
+
+    Args:
+        writer_counts (list, optional): The numbers of writer processes. Defaults to 1 to 64.
+        checkoff_count (int, optional): The number of check-offs attempted by every writer. Defaults to 20.
+        modes (list, optional): The concurrency modes to compare. Defaults to "locking" and "optimistic".
+
+    Returns:
+        results (list): The results of every concurrency mode, per number of writers.
+    """
+    return [{"writers": writer_count, **{mode: measure_contention(mode, writer_count, checkoff_count) for mode in modes}} for writer_count in writer_counts]
+
+
+def main(arguments: list = None):
+    """This function runs the contention benchmark from the command line and prints the results
+    as JSON, e.g. "py -m benchmarks.contention_benchmark --writers 1 8 64".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Compare the concurrency modes while many processes check-off the same habit.")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64], help="numbers of writer processes")
+    parser.add_argument("--checkoffs", type=int, default=20, help="number of check-offs attempted by every writer")
+    parser.add_argument("--modes", nargs="+", default=["locking", "optimistic"], choices=["locking", "optimistic"])
+    parsed = parser.parse_args(arguments)
+
+    print(json.dumps(benchmark_contention(parsed.writers, parsed.checkoffs, parsed.modes), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import atomic_write
+from habit_loader import habit_file_paths, load_habit
+from habit_history import split_habit
+from instrumentation import write_json
+from benchmarks.store_generator import generate_store
+
+
+def time_writes(documents: list, durability: str, repeats: int = 3):
+    """This function times rewriting every habit file of the "Habits" directory within the
+    current working directory in a durability mode, including the flush of any writes still
+    waiting within a group at the end.
+
+    Args:
+        documents (list): The path and the metadata of every habit file.
+        durability (str): The durability mode ("none", "fsync" or "group"), or "in place" to
+        overwrite the files without replacing them atomically, as before.
+        repeats (int, optional): The number of rounds of writes. Defaults to 3.
+
+    Returns:
+        writes_per_second (float): The number of files written per second within the fastest round.
+    """
+    previous_durability = atomic_write.DURABILITY
+    atomic_write.DURABILITY = "none" if durability == "in place" else durability
+    durations = []
+    try:
+        for repeat in range(repeats):
+            start_time = time.perf_counter()
+            for path_of_file, metadata in documents:
+                write_json(path_of_file, metadata, indent=4, atomic=(durability != "in place"))
+            atomic_write.flush_writes()
+            durations.append(time.perf_counter() - start_time)
+    finally:
+        atomic_write.DURABILITY = previous_durability
+    return len(documents) / min(durations)
+
+
+def benchmark_durability(habit_count: int = 1000, modes: list = ("in place",) + atomic_write.DURABILITY_MODES, repeats: int = 3):
+    """This function measures how many habit files can be written per second in every durability
+    mode, against a synthetic store generated within a temporary directory. As the temporary
+    directory usually lies on the same disk as the store would, the flushes to the disk cost
+    about as much as they would for the application itself.
+
+    Args:
+        habit_count (int, optional): The number of habit files. Defaults to 1,000.
+        modes (list, optional): The durability modes to compare. Defaults to every mode and writing in place.
+        repeats (int, optional): The number of rounds of writes per mode. Defaults to 3.
+
+    Returns:
+        results (dict): The number of writes per second and the time of a single write in milliseconds, per mode.
+    """
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as store_directory:
+        os.chdir(store_directory)
+        try:
+            generate_store(habit_count, history_length=30, archived_ratio=0)
+            documents = [(path_of_file, split_habit(load_habit(path_of_file, include_history=False)[1])[0]) for path_of_file in habit_file_paths()]
+            writes_per_second = {mode: time_writes(documents, mode, repeats) for mode in modes}
+        finally:
+            os.chdir(previous_directory)
+
+    return {mode: {"writes_per_second": rate, "milliseconds_per_write": 1000 / rate} for mode, rate in writes_per_second.items()}
+
+
+def main(arguments: list = None):
+    """This function runs the durability benchmark from the command line and prints the results
+    as JSON, e.g. "py -m benchmarks.durability_benchmark --habits 1000".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Time writing habit files in every durability mode.")
+    parser.add_argument("--habits", type=int, default=1000, help="number of habit files")
+    parser.add_argument("--modes", nargs="+", default=["in place"] + list(atomic_write.DURABILITY_MODES), choices=["in place"] + list(atomic_write.DURABILITY_MODES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parsed = parser.parse_args(arguments)
+
+    print(json.dumps(benchmark_durability(parsed.habits, parsed.modes, parsed.repeats), indent=4))
+
+
+if __name__ == "__main__":
+    main()
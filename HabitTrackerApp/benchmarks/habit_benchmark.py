@@ -0,0 +1,192 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from unittest import mock
+from habits import Habits
+from analytics import Analytics
+from benchmarks.store_generator import generate_store
+
+
+def time_calls(calls: list, answers: list = ()):
+    """This function times a list of calls, one after the other. Anything the calls print
+    is discarded, and any prompts for user input are answered with the given answers.
+
+    Args:
+        calls (list): The calls to time, each without any arguments.
+        answers (list, optional): The answers given to the prompts of every call. Defaults to none.
+
+    Returns:
+        timing (dict): The fastest and the mean duration of the calls in seconds, and the number of calls.
+    """
+    durations = []
+    for call in calls:
+        with mock.patch("builtins.input", side_effect=list(answers)), contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            call()
+            durations.append(time.perf_counter() - start_time)
+
+    return {
+        "best_seconds": min(durations),
+        "mean_seconds": sum(durations) / len(durations),
+        "calls": len(durations),
+    }
+
+
+def benchmark_methods(repeats: int = 5):
+    """This function times every public method of the Habits and Analytics classes against
+    the synthetic store within the current working directory, followed by the start-up of
+    the application. Read-only methods are timed first. Methods that change a habit are
+    called on a different habit for every repeat, so that every call does the same work.
+
+    Args:
+        repeats (int, optional): The number of calls per method. Defaults to 5.
+
+    Returns:
+        timings (dict): The timing of every method, keyed by "Class.method".
+    """
+    active_names = [habit_data.get("name") for habit_data in Habits()._storage().iter_habits(archived=False, include_history=False)]
+    active_names.sort()
+    if len(active_names) < 3 * repeats:
+        raise ValueError("The synthetic store needs at least " + str(3 * repeats) + " unarchived habits for " + str(repeats) + " repeats.")
+
+    # Every method that changes a habit receives its own slice of unarchived habits.
+    read_names = active_names[:repeats]
+    checkoff_names = active_names[repeats:2 * repeats]
+    archive_names = active_names[2 * repeats:3 * repeats]
+    new_habit_data = [{
+        "name": "Benchmark habit " + str(repeat),
+        "description": "A habit created while benchmarking.",
+        "periodicity": "daily",
+        "archived": False,
+        "has_checked_off_today": False,
+        "creation_date_time": "2025-01-01T00:00:00Z",
+        "check_off_history": []
+    } for repeat in range(repeats)]
+
+    timings = {}
+    for method_name in ["show_all_habits", "get_longest_streak_all_habits", "get_most_checkoff_history",
+                        "get_least_checkoff_history", "get_archived_habits", "get_habit_statistics", "full_report"]:
+        timings["Analytics." + method_name] = time_calls([getattr(Analytics(), method_name) for repeat in range(repeats)])
+
+    timings["Analytics.get_habits_with_same_periodicity"] = time_calls(
+        [lambda: Analytics().get_habits_with_same_periodicity("weekly") for repeat in range(repeats)])
+    timings["Analytics.get_longest_streak_single_habit"] = time_calls(
+        [Analytics(habit_name = habit_name).get_longest_streak_single_habit for habit_name in read_names])
+    timings["Analytics.get_history_of_checkoffs_time_range"] = time_calls(
+        [Analytics(habit_name = habit_name).get_history_of_checkoffs_time_range for habit_name in read_names],
+        answers=["2000-01-01", "2100-01-01"])
+    timings["Habits.load_habit_file"] = time_calls([Habits(habit_name = habit_name).load_habit_file for habit_name in read_names])
+
+    timings["Habits.checkoff_habit"] = time_calls([Habits(habit_name = habit_name).checkoff_habit for habit_name in checkoff_names], answers=["yes"])
+    timings["Habits.edit_habit_file"] = time_calls(
+        [Habits(habit_name = habit_name).edit_habit_file for habit_name in checkoff_names], answers=["", "An edited description.", "", "yes"])
+    timings["Habits.archive_habit"] = time_calls([Habits(habit_name = habit_name).archive_habit for habit_name in archive_names])
+    timings["Habits.unarchive_habit"] = time_calls([Habits(habit_name = habit_name).unarchive_habit for habit_name in archive_names])
+    timings["Habits.create_habit_file"] = time_calls([Habits(habit_data = habit_data).create_habit_file for habit_data in new_habit_data])
+    timings["Habits.delete_habit_file"] = time_calls([Habits(habit_name = habit_data["name"]).delete_habit_file for habit_data in new_habit_data])
+    timings["Habits.rebuild_summaries"] = time_calls([Habits().rebuild_summaries for repeat in range(repeats)])
+    timings["Habits.setcheckoff_to_false"] = time_calls([Habits().setcheckoff_to_false for repeat in range(repeats)])
+
+    # The start-up is timed both as it used to be (creating the predefined habits and resetting
+    # every checked-off status) and as it is now (checking whether the store was already seeded).
+    def legacy_startup():
+        startup_habits = Habits()
+        startup_habits.create_predefined_habits()
+        startup_habits.setcheckoff_to_false()
+
+    timings["startup.legacy"] = time_calls([legacy_startup for repeat in range(repeats)])
+    timings["Habits.create_predefined_habits"] = time_calls([Habits().create_predefined_habits for repeat in range(repeats)])
+    timings["Habits.seed_predefined_habits"] = time_calls([Habits().seed_predefined_habits for repeat in range(repeats)])
+    return timings
+
+
+def current_commit():
+    """This function returns the git commit of the working tree, so that results can be
+    compared between commits.
+
+    Returns:
+        commit (str): The hash of the current commit, or None outside of a git repository.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(habit_count: int = 1000, history_length: int = 365, weekly_ratio: float = 0.3, archived_ratio: float = 0.1, repeats: int = 5, seed: int = 0):
+    """This function generates a synthetic store within a temporary directory and times
+    every public method against it. The working directory is restored afterwards.
+
+    Args:
+        habit_count (int, optional): The number of synthetic habits. Defaults to 1000.
+        history_length (int, optional): The number of check-offs of every habit. Defaults to 365.
+        weekly_ratio (float, optional): The share of weekly habits. Defaults to 0.3.
+        archived_ratio (float, optional): The share of archived habits. Defaults to 0.1.
+        repeats (int, optional): The number of calls per method. Defaults to 5.
+        seed (int, optional): The seed of the random number generator. Defaults to 0.
+
+    Returns:
+        results (dict): The parameters, the environment and the timing of every method.
+    """
+    results = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "storage_mode": Habits.storage_mode,
+        "history_encoding": Habits.history_encoding,
+        "parameters": {
+            "habit_count": habit_count,
+            "history_length": history_length,
+            "weekly_ratio": weekly_ratio,
+            "archived_ratio": archived_ratio,
+            "repeats": repeats,
+            "seed": seed,
+        },
+    }
+
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as store_directory:
+        os.chdir(store_directory)
+        try:
+            start_time = time.perf_counter()
+            generate_store(habit_count, history_length, weekly_ratio, archived_ratio, seed)
+            results["generation_seconds"] = time.perf_counter() - start_time
+            results["timings"] = benchmark_methods(repeats)
+        finally:
+            os.chdir(previous_directory)
+
+    return results
+
+
+def main(arguments: list = None):
+    """This function runs the benchmark suite from the command line and prints the results
+    as JSON, e.g. "py -m benchmarks.habit_benchmark --habits 1000 --output results.json".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Time every public method of the habit tracker against a synthetic store.")
+    parser.add_argument("--habits", type=int, default=1000, help="number of synthetic habits")
+    parser.add_argument("--length", type=int, default=365, help="number of check-offs of every habit")
+    parser.add_argument("--weekly-ratio", type=float, default=0.3, help="share of weekly habits")
+    parser.add_argument("--archived-ratio", type=float, default=0.1, help="share of archived habits")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the results to, in addition to printing them")
+    parsed = parser.parse_args(arguments)
+
+    results = run_benchmark(parsed.habits, parsed.length, parsed.weekly_ratio, parsed.archived_ratio, parsed.repeats, parsed.seed)
+    if parsed.output:
+        with open(parsed.output, mode="w", encoding="utf-8") as write_file:
+            json.dump(results, write_file, indent=4)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from habit_loader import iter_habits
+from benchmarks.store_generator import generate_store
+
+
+def time_scan(workers: int, repeats: int = 3):
+    """This function times a full scan of the "Habits" directory within the current working
+    directory, loading every habit file with the given number of threads.
+
+    Args:
+        workers (int): The number of threads, where 1 loads the files one after the other.
+        repeats (int, optional): The number of scans. Defaults to 3.
+
+    Returns:
+        best_seconds (float): The duration of the fastest scan in seconds.
+    """
+    durations = []
+    for repeat in range(repeats):
+        start_time = time.perf_counter()
+        for habit in iter_habits(workers=workers):
+            pass
+        durations.append(time.perf_counter() - start_time)
+    return min(durations)
+
+
+def benchmark_loader(sizes: list = (1000, 10000, 100000), history_length: int = 30, workers: list = (1, 4, 8), repeats: int = 3):
+    """This function measures how long a full scan of synthetic stores of different sizes
+    takes, both one file after the other and with pools of threads. Every store is generated
+    within a temporary directory, which is removed afterwards. As the operating system caches
+    the files after they were written, the scans show the speedup on a warm cache; on network
+    or slow disks the speedup is larger, as the threads then wait on the disk in parallel.
+
+    Args:
+        sizes (list, optional): The numbers of habit files. Defaults to 1,000, 10,000 and 100,000.
+        history_length (int, optional): The number of check-offs of every habit. Defaults to 30.
+        workers (list, optional): The numbers of threads to compare. Defaults to 1, 4 and 8.
+        repeats (int, optional): The number of scans per measurement. Defaults to 3.
+
+    Returns:
+        results (list): The best duration of every number of threads, and the speedup over a single thread, per store size.
+    """
+    results = []
+    previous_directory = os.getcwd()
+    for habit_count in sizes:
+        with tempfile.TemporaryDirectory() as store_directory:
+            os.chdir(store_directory)
+            try:
+                generate_store(habit_count, history_length)
+                timings = {str(worker_count): time_scan(worker_count, repeats) for worker_count in sorted(set(workers))}
+            finally:
+                os.chdir(previous_directory)
+
+        serial_seconds = timings.get("1")
+        results.append({
+            "habit_count": habit_count,
+            "best_seconds": timings,
+            "speedup": {worker_count: serial_seconds / seconds for worker_count, seconds in timings.items()} if serial_seconds else None,
+        })
+    return results
+
+
+def main(arguments: list = None):
+    """This function runs the loader benchmark from the command line and prints the results
+    as JSON, e.g. "py -m benchmarks.loader_benchmark --sizes 1000 10000 100000".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Time full scans of the \"Habits\" directory with different numbers of threads.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="numbers of habit files")
+    parser.add_argument("--length", type=int, default=30, help="number of check-offs of every habit")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="numbers of threads to compare")
+    parser.add_argument("--repeats", type=int, default=3)
+    parsed = parser.parse_args(arguments)
+
+    print(json.dumps(benchmark_loader(parsed.sizes, parsed.length, parsed.workers, parsed.repeats), indent=4))
+
+
+if __name__ == "__main__":
+    main()
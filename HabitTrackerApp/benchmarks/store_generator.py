@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import random
+from habits import Habits, ARCHIVE_DIRECTORY
+from habit_layout import habit_file_name, layout_path
+from habit_index import get_index
+from habit_history import HistoryFile, split_habit
+from streaks import summarise_history
+from timestamp_codec import encode_history, today_day_number, SECONDS_PER_DAY
+from benchmarks.streak_benchmark import make_check_off_days
+
+
+def make_habit(number: int, history_length: int, periodicity: str, archived: bool, generator: random.Random):
+    """This function creates the data of a single synthetic habit in the same format as the
+    habits created by the application. The check-off history ends yesterday, so the habit
+    can still be checked-off today, and every check-off happens at a random time of day.
+
+    Args:
+        number (int): The number of the habit, which is used within its name.
+        history_length (int): The number of check-offs within the history.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+        archived (bool): Whether the habit is archived.
+        generator (random.Random): The random number generator to use.
+
+    Returns:
+        habit_data (dict): The data of the habit.
+    """
+    check_off_days = make_check_off_days(history_length, periodicity, generator.randrange(2 ** 32))
+    day_offset = (today_day_number() - 1 - check_off_days[-1]) if check_off_days else 0
+    check_off_history = [(day + day_offset) * SECONDS_PER_DAY + generator.randrange(6 * 3600, 22 * 3600) for day in check_off_days]
+    creation_time = (check_off_history[0] if check_off_history else today_day_number() * SECONDS_PER_DAY) - 3600
+
+    return {
+        "name": "Synthetic habit " + str(number).zfill(5),
+        "description": "A synthetic " + periodicity + " habit created for benchmarking.",
+        "periodicity": periodicity,
+        "archived": archived,
+        "has_checked_off_today": False,
+        "creation_date_time": encode_history([creation_time], "iso")[0],
+        "check_off_history": encode_history(check_off_history, "iso"),
+    }
+
+
+def generate_store(habit_count: int = 100, history_length: int = 365, weekly_ratio: float = 0.3, archived_ratio: float = 0.1, seed: int = 0):
+    """This function fills the "Habits" directory of the current working directory with
+    synthetic habits. In the JSON storage mode, the habit and history files are written directly
+    (archived habits into the archive directory, in the layout of "Habits.layout") and the habit indexes are built once at the end, as creating thousands of habits one by one
+    would rewrite the index after every habit. In the other storage modes, the habits are
+    created one by one (inserted into the database in the SQLite storage mode).
+
+    Args:
+        habit_count (int, optional): The number of habits to create. Defaults to 100.
+        history_length (int, optional): The number of check-offs of every habit. Defaults to 365.
+        weekly_ratio (float, optional): The share of habits that are weekly. Defaults to 0.3.
+        archived_ratio (float, optional): The share of habits that are archived. Defaults to 0.1.
+        seed (int, optional): The seed of the random number generator. Defaults to 0.
+
+    Returns:
+        habit_names (list): The names of all created habits.
+    """
+    generator = random.Random(seed)
+    os.makedirs("Habits", exist_ok=True)
+    os.makedirs(ARCHIVE_DIRECTORY, exist_ok=True)
+    habit_names = []
+
+    for number in range(habit_count):
+        periodicity = "weekly" if generator.random() < weekly_ratio else "daily"
+        habit_data = make_habit(number, history_length, periodicity, generator.random() < archived_ratio, generator)
+        habit_names.append(habit_data["name"])
+
+        if Habits.storage_mode != "json":
+            Habits(habit_data = habit_data).create_habit_file()
+            continue
+
+        habit_data["summary"] = summarise_history(habit_data["check_off_history"], periodicity)
+        habit_data["check_off_history"] = encode_history(habit_data["check_off_history"], Habits.history_encoding)
+        directory = ARCHIVE_DIRECTORY if habit_data["archived"] else "Habits"
+        path_of_file = layout_path(directory, habit_file_name(habit_data["name"]), Habits.layout)
+        os.makedirs(os.path.dirname(path_of_file), exist_ok=True)
+        metadata, check_off_history = split_habit(habit_data)
+        HistoryFile(path_of_file).write(check_off_history)
+        with open(path_of_file, mode="w", encoding="utf-8") as write_file:
+            json.dump(metadata, write_file, indent=4)
+
+    if Habits.storage_mode == "json":
+        get_index().rebuild()
+        get_index(ARCHIVE_DIRECTORY).rebuild()
+    return habit_names
+
+
+def main(arguments: list = None):
+    """This function creates a synthetic store from the command line, e.g.
+    "py -m benchmarks.store_generator --habits 10000 --length 365 --directory store".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Create a synthetic \"Habits\" store for benchmarking.")
+    parser.add_argument("--habits", type=int, default=100, help="number of habits to create")
+    parser.add_argument("--length", type=int, default=365, help="number of check-offs of every habit")
+    parser.add_argument("--weekly-ratio", type=float, default=0.3, help="share of weekly habits")
+    parser.add_argument("--archived-ratio", type=float, default=0.1, help="share of archived habits")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--directory", default=".", help="directory in which the \"Habits\" folder is created")
+    parsed = parser.parse_args(arguments)
+
+    os.makedirs(parsed.directory, exist_ok=True)
+    os.chdir(parsed.directory)
+    habit_names = generate_store(parsed.habits, parsed.length, parsed.weekly_ratio, parsed.archived_ratio, parsed.seed)
+    print(str(len(habit_names)) + " synthetic habits were created in \"" + os.path.abspath("Habits") + "\".")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import random
+import time
+from array import array
+from streaks import calculate_streaks, calculate_history_streaks
+from timestamp_codec import SECONDS_PER_DAY
+
+
+def make_check_off_days(history_length: int, periodicity: str = "daily", seed: int = 0):
+    """This function creates a synthetic, chronologically ordered list of check-off day numbers.
+    Most check-offs continue the streak, while roughly one in ten skips ahead and breaks it.
+
+    Args:
+        history_length (int): The number of check-offs to create.
+        periodicity (str, optional): The periodicity of the synthetic habit. Defaults to "daily".
+        seed (int, optional): The seed of the random number generator. Defaults to 0.
+
+    Returns:
+        check_off_days (array): The day numbers of the check-offs.
+    """
+    generator = random.Random(seed)
+    usual_gap = 1 if periodicity == "daily" else 7
+    check_off_days = array("q")
+    day = 18000
+
+    for i in range(history_length):
+        check_off_days.append(day)
+        day += usual_gap if generator.random() < 0.9 else usual_gap * generator.randint(2, 4)
+    return check_off_days
+
+
+def benchmark_streaks(history_length: int = 1_000_000, periodicity: str = "daily", repeats: int = 5):
+    """This function measures the throughput of the streak engine in check-offs per second,
+    both directly on day numbers and on a history stored as epoch seconds (including the
+    conversion into day numbers). The best of several repeats is reported.
+
+    Args:
+        history_length (int, optional): The number of check-offs within the history. Defaults to 1,000,000.
+        periodicity (str, optional): The periodicity of the synthetic habit. Defaults to "daily".
+        repeats (int, optional): The number of times each measurement is repeated. Defaults to 5.
+
+    Returns:
+        results (dict): The measured timings and throughputs.
+    """
+    check_off_days = make_check_off_days(history_length, periodicity)
+    check_off_history = [day * SECONDS_PER_DAY + 43200 for day in check_off_days]
+
+    results = {"history_length": history_length, "periodicity": periodicity}
+    for measurement, function, argument in (("day_numbers", calculate_streaks, check_off_days),
+                                            ("epoch_history", calculate_history_streaks, check_off_history)):
+        best_seconds = float("inf")
+        for repeat in range(repeats):
+            start_time = time.perf_counter()
+            streaks = function(argument, periodicity)
+            best_seconds = min(best_seconds, time.perf_counter() - start_time)
+
+        results[measurement] = {
+            "best_seconds": best_seconds,
+            "checkoffs_per_second": history_length / best_seconds,
+            "longest_streak": streaks.longest_streak,
+            "streak_count": streaks.streak_count,
+        }
+    return results
+
+
+def main(arguments: list = None):
+    """This function runs the streak micro-benchmark from the command line and prints
+    the results as JSON, e.g. "py -m benchmarks.streak_benchmark --length 1000000".
+
+    Args:
+        arguments (list, optional): The command-line arguments. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Measure the throughput of the streak engine.")
+    parser.add_argument("--length", type=int, default=1_000_000, help="number of check-offs in the history")
+    parser.add_argument("--periodicity", choices=["daily", "weekly"], default="daily")
+    parser.add_argument("--repeats", type=int, default=5)
+    parsed = parser.parse_args(arguments)
+
+    print(json.dumps(benchmark_streaks(parsed.length, parsed.periodicity, parsed.repeats), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import json
+import os
+from atomic_write import sync_appended
+from instrumentation import count
+
+
+# Once this many check-offs are waiting in a log, they are compacted into the
+# snapshot stored within the habit's JSON file and the log is cleared.
+COMPACTION_THRESHOLD = 64
+
+
+class CheckoffLog:
+
+    def __init__(self, path_of_file: str):
+        """This is the constructor for the CheckoffLog class. Every habit file has
+        its own append-only log stored next to it, in which new check-offs are
+        recorded as one JSON line each instead of rewriting the entire habit file.
+
+        Args:
+            path_of_file (str): The path of the JSON file of the habit.
+        """
+        self.log_path = os.path.splitext(path_of_file)[0] + ".checkoffs.jsonl"
+
+
+    def append(self, position: int, checkoff: str, summary: dict = None):
+        """This method appends a single check-off to the log. The position of the check-off
+        within the check-off history is stored alongside it, which allows check-offs that
+        were already compacted into the habit file to be recognised and skipped. The summary
+        record of the habit after the check-off is stored as well, so that the latest summary
+        is always found within the last entry of the log. The log is flushed to the disk
+        according to the durability mode (see "atomic_write").
+
+        Args:
+            position (int): The number of check-offs in the history before this one.
+            checkoff (str): The date and time of the check-off in ISO 8601 format.
+            summary (dict, optional): The summary record of the habit including this check-off. Defaults to None.
+        """
+        with open(self.log_path, mode="ab+") as log_file:
+            created = log_file.tell() == 0
+
+            # Should the last line have been cut off (for example, by a crash mid-write),
+            # a line break is written first so that the new entry stays readable.
+            if not created:
+                log_file.seek(-1, os.SEEK_END)
+                if log_file.read(1) != b"\n":
+                    log_file.write(b"\n")
+
+            entry = {"position": position, "checkoff": checkoff}
+            if summary is not None:
+                entry["summary"] = summary
+            encoded_entry = (json.dumps(entry) + "\n").encode("utf-8")
+            log_file.write(encoded_entry)
+            sync_appended(log_file, self.log_path, created)
+
+        count("files_opened")
+        count("json_dumps")
+        count("bytes_written", len(encoded_entry))
+
+
+    def read(self):
+        """This method reads all check-offs within the log. Lines that cannot be parsed,
+        such as a line that was cut off by a crash mid-write, are skipped.
+
+        Returns:
+            entries (list): The entries of the log, each containing a "position" and a "checkoff".
+        """
+        if not os.path.exists(self.log_path):
+            return []
+
+        entries = []
+        with open(self.log_path, mode="rb") as log_file:
+            for line in log_file:
+                count("bytes_read", len(line))
+                count("json_loads")
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        count("files_opened")
+        return entries
+
+
+    def apply(self, loaded_habit: dict):
+        """This method adds all check-offs from the log that are not already part of the
+        snapshot within the habit file to the check-off history of the habit, and replaces
+        the summary record of the habit with the one stored alongside the latest check-off.
+
+        Args:
+            loaded_habit (dict): The habit data loaded from the JSON file.
+
+        Returns:
+            pending_checkoffs (int): The number of check-offs that are only stored within the log.
+        """
+        check_off_history = loaded_habit.setdefault("check_off_history", [])
+        pending_checkoffs = 0
+
+        for entry in self.read():
+            if entry["position"] >= len(check_off_history):
+                check_off_history.append(entry["checkoff"])
+                pending_checkoffs += 1
+                if "summary" in entry:
+                    loaded_habit["summary"] = entry["summary"]
+
+        return pending_checkoffs
+
+
+    def apply_summary(self, loaded_habit: dict):
+        """This method replaces the summary record of a habit with the one stored alongside the
+        latest check-off that is not already part of the snapshot within the habit file, without
+        needing the check-off history of the habit.
+
+        Args:
+            loaded_habit (dict): The habit data loaded from the JSON file, including its summary record.
+
+        Returns:
+            pending_checkoffs (int): The number of check-offs that are only stored within the log.
+        """
+        snapshot_count = loaded_habit["summary"]["total_count"]
+        pending_checkoffs = 0
+
+        for entry in self.read():
+            if entry["position"] >= snapshot_count:
+                pending_checkoffs += 1
+                if "summary" in entry:
+                    loaded_habit["summary"] = entry["summary"]
+
+        return pending_checkoffs
+
+
+    def remove(self):
+        """This method deletes the log, which is done once its check-offs have been
+        compacted into the habit file or when the habit is deleted.
+        """
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
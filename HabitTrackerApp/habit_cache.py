@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import OrderedDict
+from instrumentation import count, read_json
+from timestamp_codec import epoch_array
+
+
+# The number of parsed habit files kept in memory, which can be changed via the
+# "HABIT_TRACKER_CACHE_SIZE" environment variable. A value of 0 disables the cache.
+CACHE_SIZE = int(os.environ.get("HABIT_TRACKER_CACHE_SIZE", "1024"))
+
+
+class HabitCache:
+
+    def __init__(self, max_size: int = CACHE_SIZE):
+        """This is the constructor for the HabitCache class. It keeps the parsed contents of
+        recently loaded habit files in memory, so that a file that has not changed since it was
+        last loaded (for example, between two choices within the menu) is not parsed again.
+        Every file is stored alongside its modification time, size, inode and change time, which
+        are checked before the cached contents are used. The check-off history of a file is also
+        kept decoded into epoch seconds once it was requested (see "load_epochs()"). Once the cache is full, the least recently used file is removed.
+
+        Args:
+            max_size (int, optional): The maximum number of files kept in memory. Defaults to "CACHE_SIZE".
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+
+    def load(self, path_of_file: str):
+        """This method returns the contents of a habit file, parsing the file only if it is
+        not cached or if it has changed since it was cached. Callers receive their own copy of
+        the contents, so changing the returned habit never changes the cached one.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+
+        Returns:
+            loaded_habit (dict): The parsed contents of the file.
+        """
+        if self.max_size <= 0:
+            return read_json(path_of_file)
+        return copy_habit(self._entry(path_of_file)[1])
+
+
+    def load_epochs(self, path_of_file: str):
+        """This method returns the check-off history of a habit file decoded into epoch seconds
+        (see "timestamp_codec.epoch_array()"). The decoded history is kept alongside the cached
+        contents of the file, so a history is only decoded once for as long as its file is
+        unchanged. Callers receive their own copy of the decoded history.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+
+        Returns:
+            epoch_seconds (array): The check-offs of the file as epoch seconds.
+        """
+        if self.max_size <= 0:
+            return epoch_array(read_json(path_of_file).get("check_off_history", []))
+
+        # Two threads decoding the same history at once both store the same result, so no lock is needed.
+        entry = self._entry(path_of_file)
+        if entry[2] is None:
+            entry[2] = epoch_array(entry[1].get("check_off_history", []))
+        return entry[2][:]
+
+
+    def _entry(self, path_of_file: str):
+        """This method returns the cache entry of a habit file, which holds the validator of the
+        file, its parsed contents and its decoded check-off history (or None until it is first
+        requested). The file is only parsed if it is not cached or if it has changed since it was cached.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+
+        Returns:
+            entry (list): The validator, the parsed contents and the decoded check-off history of the file.
+        """
+        # Files are cached by their absolute path, as the working directory may change.
+        cache_key = os.path.abspath(path_of_file)
+        # The inode and change time reveal a file that was replaced (or whose modification time was
+        # set back, for example by a restore) even if its modification time and size are unchanged.
+        file_stat = os.stat(path_of_file)
+        validator = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino, file_stat.st_ctime_ns)
+
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if (entry is not None) and (entry[0] == validator):
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                count("cache_hits")
+                return entry
+
+        # The file is parsed outside of the lock, so that several threads can parse files at once.
+        # It was checked before being read, so a file that changes in between is parsed again next time.
+        entry = [validator, read_json(path_of_file), None]
+        with self.lock:
+            self.misses += 1
+            count("cache_misses")
+            self.entries[cache_key] = entry
+            self.entries.move_to_end(cache_key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return entry
+
+
+    def discard(self, path_of_file: str):
+        """This method removes a habit file from the cache, for example after it was deleted.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+        """
+        with self.lock:
+            self.entries.pop(os.path.abspath(path_of_file), None)
+
+
+    def clear(self):
+        """This method removes every file from the cache and resets its counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def copy_habit(loaded_habit: dict, include_history: bool = True):
+    """This function copies habit data deeply enough that changing the copy, including appending
+    to its check-off history or replacing its summary record, never changes the original.
+
+    Args:
+        loaded_habit (dict): The habit data.
+        include_history (bool, optional): Whether the check-off history is copied, rather than left out. Defaults to True.
+
+    Returns:
+        copied_habit (dict): The copy of the habit data.
+    """
+    return {key: (value.copy() if isinstance(value, (list, dict)) else value) for key, value in loaded_habit.items()
+            if include_history or (key != "check_off_history")}
+
+
+# A single cache is shared by the whole program, so that every part of it benefits from files loaded by another.
+_shared_cache = HabitCache()
+
+
+def get_cache():
+    """This function returns the habit cache shared by the whole program.
+
+    Returns:
+        cache (HabitCache): The shared habit cache.
+    """
+    return _shared_cache
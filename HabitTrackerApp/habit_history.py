@@ -0,0 +1,90 @@
+import os
+from array import array
+from habit_cache import get_cache
+from instrumentation import write_json
+
+
+# The extension of the history files stored next to the habit files. It deliberately does
+# not end with ".json" so that directory scans never mistake a history file for a habit file.
+HISTORY_EXTENSION = ".history"
+
+
+class HistoryFile:
+
+    def __init__(self, path_of_file: str):
+        """This is the constructor for the HistoryFile class. The check-off history of a habit
+        is stored in its own file next to the habit file, so that the habit file only holds the
+        small metadata of the habit (its name, description, periodicity, archived status and
+        summary record). Listing and filtering habits therefore never reads any check-offs,
+        however long the histories grow.
+
+        Args:
+            path_of_file (str): The path of the JSON file of the habit.
+        """
+        self.history_path = os.path.splitext(path_of_file)[0] + HISTORY_EXTENSION
+
+
+    def read(self):
+        """This method reads the check-off history of the habit.
+
+        Returns:
+            check_off_history (list): The check-offs of the habit, or an empty list if no history file exists.
+        """
+        if not os.path.exists(self.history_path):
+            return []
+        return get_cache().load(self.history_path).get("check_off_history", [])
+
+
+    def read_epochs(self):
+        """This method reads the check-off history of the habit decoded into epoch seconds, which
+        the habit cache keeps for as long as the history file is unchanged (see "HabitCache.load_epochs()").
+
+        Returns:
+            epoch_seconds (array): The check-offs of the habit as epoch seconds, or an empty array if no history file exists.
+        """
+        if not os.path.exists(self.history_path):
+            return array("q")
+        return get_cache().load_epochs(self.history_path)
+
+
+    def attach(self, loaded_habit: dict):
+        """This method adds the check-off history to habit data loaded from a habit file. Habit
+        files written before the history was split from the metadata still contain their history,
+        which is then kept as it is.
+
+        Args:
+            loaded_habit (dict): The habit data loaded from the habit file.
+        """
+        if "check_off_history" not in loaded_habit:
+            loaded_habit["check_off_history"] = self.read()
+
+
+    def write(self, check_off_history: list):
+        """This method overwrites the check-off history of the habit.
+
+        Args:
+            check_off_history (list): The encoded check-offs of the habit.
+        """
+        write_json(self.history_path, {"check_off_history": check_off_history})
+        get_cache().discard(self.history_path)
+
+
+    def remove(self):
+        """This method deletes the history file, which is done when the habit is deleted."""
+        if os.path.exists(self.history_path):
+            os.remove(self.history_path)
+        get_cache().discard(self.history_path)
+
+
+def split_habit(habit_document: dict):
+    """This function splits the data of a habit into the metadata written to the habit file and
+    the check-off history written to the history file.
+
+    Args:
+        habit_document (dict): The habit data, including its check-off history.
+
+    Returns:
+        split_document (tuple): A copy of the habit data without its check-off history, and the check-off history.
+    """
+    metadata = dict(habit_document)
+    return metadata, metadata.pop("check_off_history", [])
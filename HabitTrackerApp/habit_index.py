@@ -0,0 +1,363 @@
+import os
+import threading
+from contextlib import contextmanager
+from instrumentation import read_json, write_json
+from habit_loader import iter_habits
+
+# The index is locked via "fcntl", which is only available on Unix-like systems (see "habit_lock").
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# The name of the index file stored inside the "Habits" directory. It deliberately
+# does not end with ".json" so that directory scans never mistake it for a habit file.
+INDEX_FILENAME = ".habit_index"
+
+# The name of the lock file of the index, stored next to it. Every process holds an exclusive lock
+# on this file while it changes the index, and a shared lock while it reads the index. The lock file
+# also records the modification time of the directory as of the latest save of the index.
+INDEX_LOCK_FILENAME = ".habit_index.lock"
+
+
+class HabitIndex:
+
+    def __init__(self, directory: str = "Habits"):
+        """This is the constructor for the HabitIndex class.
+
+        Args:
+            directory (str, optional): The directory in which the habit files and the
+            index file are stored. Defaults to "Habits".
+        """
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.lock_path = os.path.join(directory, INDEX_LOCK_FILENAME)
+        self.entries = None
+        self.directory_mtime_ns = None
+        self.index_signature = None
+
+        # The lock file is kept open while the index is locked, which the threads of a process take turns at.
+        self.thread_lock = threading.RLock()
+        self.lock_file = None
+        self.lock_depth = 0
+
+
+    @staticmethod
+    def normalise_name(habit_name: str):
+        """This method converts a habit name into the key used within the index.
+        The key matches the comparison the Habits class has always used, namely
+        a lowercase name where underscores are treated as spaces.
+
+        Args:
+            habit_name (str): The name of the habit to normalise.
+
+        Returns:
+            normalised_name (str): The normalised name of the habit.
+        """
+        return habit_name.lower().replace("_", " ")
+
+
+    def lookup(self, habit_name: str):
+        """This method returns the path of the JSON file that stores the habit
+        called "habit_name" without opening any habit files. Should the index
+        point to a file that no longer exists, or should the habit be missing while
+        the "Habits" directory has changed since the index was written, the index
+        is rebuilt once before giving up.
+
+        Args:
+            habit_name (str): The name of the habit to search for.
+
+        Returns:
+            path_of_file (str): The path of the habit file, or None if the habit was not found.
+        """
+
+        if not os.path.isdir(self.directory):
+            return None
+
+        self._ensure_loaded()
+        entry = self.entries.get(self.normalise_name(habit_name))
+
+        # The entry is only trusted if its file still exists. Otherwise, or if the habit
+        # is unknown while the directory was modified by something other than this class,
+        # the index is rebuilt and the lookup is attempted a second time.
+        if entry is not None:
+            path_of_file = os.path.join(self.directory, entry["file"])
+            if os.path.exists(path_of_file):
+                return path_of_file
+
+        if (entry is not None) or self.is_stale():
+            self.rebuild()
+            entry = self.entries.get(self.normalise_name(habit_name))
+            if entry is not None:
+                return os.path.join(self.directory, entry["file"])
+
+        return None
+
+
+    def get_entry(self, habit_name: str):
+        """This method returns the metadata stored within the index for a habit.
+
+        Args:
+            habit_name (str): The name of the habit to search for.
+
+        Returns:
+            entry (dict): The file name, name, periodicity and archived status of the habit,
+            or None if the habit is not indexed.
+        """
+        if self.lookup(habit_name) is None:
+            return None
+        return self.entries.get(self.normalise_name(habit_name))
+
+
+    def list_entries(self):
+        """This method returns the metadata of every indexed habit without opening any habit
+        files, unless the directory was modified by something other than this class, in
+        which case the index is rebuilt first.
+
+        Returns:
+            entries (list): The file name, name, periodicity and archived status of every habit,
+            in the order of their file names.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        self._ensure_loaded()
+        if self.is_stale():
+            self.rebuild()
+        return sorted(self.entries.values(), key=lambda entry: entry["file"])
+
+
+    def add(self, habit_data: dict, path_of_file: str):
+        """This method adds (or replaces) the entry of a habit and saves the index.
+
+        Args:
+            habit_data (dict): The JSON data of the habit.
+            path_of_file (str): The path of the file that the habit is stored in.
+        """
+        with self.locked():
+            self._ensure_loaded()
+            self.entries[self.normalise_name(habit_data["name"])] = self._make_entry(habit_data, path_of_file)
+            self.save()
+
+
+    def update(self, previous_name: str, habit_data: dict, path_of_file: str):
+        """This method updates the entry of a habit after it was edited, archived or
+        unarchived. Should the habit have been renamed, the entry is moved to the new name.
+
+        Args:
+            previous_name (str): The name the habit was indexed under before the change.
+            habit_data (dict): The updated JSON data of the habit.
+            path_of_file (str): The path of the file that the habit is stored in.
+        """
+        with self.locked():
+            self._ensure_loaded()
+            new_entry = self._make_entry(habit_data, path_of_file)
+
+            # The index is only written if the entry actually changed, as most updates
+            # (such as check-offs) do not touch any of the indexed fields.
+            if (self.normalise_name(previous_name) == self.normalise_name(habit_data["name"])) and (self.entries.get(self.normalise_name(previous_name)) == new_entry):
+                return None
+
+            self.entries.pop(self.normalise_name(previous_name), None)
+            self.entries[self.normalise_name(habit_data["name"])] = new_entry
+            self.save()
+
+
+    def remove(self, habit_name: str):
+        """This method removes the entry of a deleted habit and saves the index.
+
+        Args:
+            habit_name (str): The name of the habit that was deleted.
+        """
+        with self.locked():
+            self._ensure_loaded()
+            self.entries.pop(self.normalise_name(habit_name), None)
+            self.save()
+
+
+    def is_stale(self):
+        """This method checks whether the "Habits" directory was modified since the
+        index was last saved, for example because a habit file was added or removed by hand.
+
+        Returns:
+            is_stale (bool): True if the index may no longer match the directory.
+        """
+        return os.stat(self.directory).st_mtime_ns != self.directory_mtime_ns
+
+
+    def rebuild(self):
+        """This method rebuilds the index from scratch by loading every JSON file
+        within the "Habits" directory once. It is only needed when the index is
+        missing or stale, after which lookups no longer open any habit files.
+        """
+        with self.locked():
+            entries = {}
+            for path_of_file, loaded_habit in iter_habits(self.directory, include_history=False):
+                if "name" in loaded_habit:
+                    entries[self.normalise_name(loaded_habit["name"])] = self._make_entry(loaded_habit, path_of_file)
+            self.entries = entries
+            self.save()
+
+
+    def save(self):
+        """This method writes the index to the "Habits" directory, followed by the modification
+        time of the directory, which is later used to detect staleness. The index file is replaced
+        atomically, which modifies the directory, so the modification time is only recorded
+        afterwards, within the lock file of the index.
+        """
+        with self.locked():
+            self._write()
+            self.directory_mtime_ns = os.stat(self.directory).st_mtime_ns
+            self._write_stamp()
+
+
+    @contextmanager
+    def tracking_writes(self):
+        """This context manager keeps the index from becoming stale because of files written within
+        the "with" block. Habit files are replaced atomically, which modifies the directory just
+        like adding a file by hand would. Should the index match the directory before the block,
+        the new modification time of the directory is saved afterwards. The index is loaded first,
+        so that writes made before the first lookup of a session do not make the index stale either.
+        """
+        if os.path.isdir(self.directory):
+            self._ensure_loaded()
+        # The index stays locked throughout, so that no other process changes the directory in
+        # the meantime, whose changes would otherwise be mistaken for the writes of the block.
+        if not os.path.isdir(self.directory):
+            yield
+            return
+
+        with self.locked():
+            self._ensure_loaded()
+            was_current = (self.entries is not None) and (not self.is_stale())
+            yield
+            if was_current and self.is_stale():
+                self.save()
+
+
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """This context manager locks the index against other processes (and threads) for the
+        duration of a "with" block, so that loading, changing and saving the index happens as
+        one step and no process drops the changes of another. Locks can be nested within the
+        same thread, where an exclusive lock also covers any shared lock taken within it. A
+        shared lock is never converted into an exclusive one, as "flock()" would release it in between.
+
+        Args:
+            shared (bool, optional): Whether the lock is shared (for reading) rather than exclusive
+            (for writing). Defaults to False.
+        """
+        with self.thread_lock:
+            if self.lock_depth == 0:
+                os.makedirs(self.directory, exist_ok=True)
+                self.lock_file = open(self.lock_path, mode="a+b")
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                    except BaseException:
+                        self.lock_file.close()
+                        raise
+            self.lock_depth += 1
+            try:
+                yield self
+            finally:
+                self.lock_depth -= 1
+                if self.lock_depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+                    self.lock_file.close()
+                    self.lock_file = None
+
+
+    def _write(self):
+        """This method replaces the index file with the current entries atomically (see "atomic_write"),
+        so that a crash or a concurrent reader never finds a half-written index. Must be called while
+        the index is locked.
+        """
+        write_json(self.index_path, {"habits": self.entries})
+        self.index_signature = self._signature()
+
+
+    def _write_stamp(self):
+        """This method records the modification time of the directory within the lock file of the
+        index. The lock file is overwritten in place, which does not modify the directory, and is
+        only read while the index is locked. Must be called while the index is locked.
+        """
+        self.lock_file.seek(0)
+        self.lock_file.truncate()
+        self.lock_file.write(str(self.directory_mtime_ns).encode("utf-8"))
+        self.lock_file.flush()
+
+
+    def _signature(self):
+        """This method returns the modification time and inode of the index file, which change
+        whenever the index file is replaced, even within the same tick of the clock.
+
+        Returns:
+            signature (tuple): The modification time and inode of the index file.
+        """
+        index_stat = os.stat(self.index_path)
+        return index_stat.st_mtime_ns, index_stat.st_ino
+
+
+    def _ensure_loaded(self):
+        """This method loads the index file if it has not been loaded yet or if it was
+        changed by another process since it was loaded. Should the index file not exist
+        or be unreadable, it is rebuilt.
+        """
+        # The index is read under a shared lock, so that the index file and the recorded modification
+        # time always belong to the same save. Should the index need rebuilding, it is rebuilt only
+        # once the shared lock was released (unless an exclusive lock is held already).
+        with self.locked(shared=True):
+            try:
+                index_signature = self._signature()
+                if (self.entries is not None) and (index_signature == self.index_signature):
+                    return
+
+                loaded_index = read_json(self.index_path)
+                self.lock_file.seek(0)
+                self.directory_mtime_ns = int(self.lock_file.read())
+                self.entries = loaded_index["habits"]
+                self.index_signature = index_signature
+                return
+            except (OSError, ValueError, KeyError):
+                pass
+
+        self.rebuild()
+
+
+    def _make_entry(self, habit_data: dict, path_of_file: str):
+        """This method creates the metadata stored for a single habit.
+
+        Args:
+            habit_data (dict): The JSON data of the habit.
+            path_of_file (str): The path of the file that the habit is stored in.
+
+        Returns:
+            entry (dict): The entry to store within the index.
+        """
+        return {
+            "file": os.path.relpath(path_of_file, self.directory),
+            "name": habit_data.get("name"),
+            "periodicity": habit_data.get("periodicity"),
+            "archived": habit_data.get("archived", False),
+        }
+
+
+# Indexes are shared per directory so that a running program only loads each index once.
+_shared_indexes = {}
+
+
+def get_index(directory: str = "Habits"):
+    """This function returns the shared HabitIndex for a directory, creating it if necessary.
+
+    Args:
+        directory (str, optional): The directory in which the habit files are stored. Defaults to "Habits".
+
+    Returns:
+        index (HabitIndex): The index of the directory.
+    """
+    if directory not in _shared_indexes:
+        _shared_indexes[directory] = HabitIndex(directory)
+    return _shared_indexes[directory]
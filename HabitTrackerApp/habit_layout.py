@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+
+
+# The layouts in which habit files can be stored within the "Habits" directory (and the archive directory):
+# - flat: Every habit file is stored directly within the directory, e.g. "Habits/go_to_the_gym.json".
+# - sharded: Every habit file is stored within two levels of subdirectories named after a hash of its
+#   file name, e.g. "Habits/3f/a2/go_to_the_gym.json", so that no directory holds more than a few files
+#   even for millions of habits.
+# Habit files are always found in both layouts, so a store can be resharded while it is in use.
+LAYOUTS = ("flat", "sharded")
+
+# The number of habit files moved at once while resharding a store.
+RESHARD_BATCH_SIZE = 1000
+
+
+def habit_file_name(habit_name: str):
+    """This function sanitises the name of a habit into the file name of its habit file by
+    replacing any spaces with underscores and converting the name to lowercase. Any invalid
+    characters for a file name are additionally replaced by spaces.
+
+    Args:
+        habit_name (str): The name of the habit, e.g. "Go to the gym".
+
+    Returns:
+        file_name (str): The file name of the habit, e.g. "go_to_the_gym.json".
+    """
+    cleaned_name = habit_name.lower().replace(" ", "_")
+    cleaned_name = re.sub(r'[<>:"/\\|?*]', " ", cleaned_name)
+    return cleaned_name + ".json"
+
+
+def layout_path(directory: str, file_name: str, layout: str = "flat"):
+    """This function returns the path at which a habit file is stored within a layout.
+
+    Args:
+        directory (str): The directory of the habit files, e.g. "Habits".
+        file_name (str): The file name of the habit, e.g. "go_to_the_gym.json".
+        layout (str, optional): The layout of the directory ("flat" or "sharded"). Defaults to "flat".
+
+    Returns:
+        path_of_file (str): The path of the habit file.
+    """
+    if layout != "sharded":
+        return os.path.join(directory, file_name)
+
+    # The shards are taken from a hash of the file name (the normalised name of the habit without
+    # its extension), which spreads the habits evenly over 65,536 subdirectories.
+    digest = hashlib.sha1(os.path.splitext(file_name)[0].encode("utf-8")).hexdigest()
+    return os.path.join(directory, digest[0:2], digest[2:4], file_name)
+
+
+def iter_habit_file_paths(directory: str = "Habits", ordered: bool = False):
+    """This generator finds the habit files within a directory in either layout. Subdirectories
+    are only entered once they are reached, so a sharded store is listed one shard at a time.
+    When ordered, the files are yielded in the order of their file names regardless of their
+    shard, so that the order of habits (and of the analytics) does not depend on the layout,
+    which means that all paths are listed before the first one is yielded.
+
+    Args:
+        directory (str, optional): The directory of the habit files. Defaults to "Habits".
+        ordered (bool, optional): Whether the files are yielded in the order of their file names.
+        Defaults to False (directory order, one shard at a time).
+
+    Yields:
+        path_of_file (str): The path of the next habit file.
+    """
+    if ordered:
+        yield from sorted(_iter_directory(directory, 0), key=os.path.basename)
+    else:
+        yield from _iter_directory(directory, 0)
+
+
+def _iter_directory(directory: str, depth: int):
+    """This generator finds the habit files within a directory and its shards."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.path
+            elif (depth < 2) and _is_shard_name(entry.name) and entry.is_dir():
+                yield from _iter_directory(entry.path, depth + 1)
+
+
+def _is_shard_name(name: str):
+    """This function checks whether the name of a subdirectory is that of a shard (two hexadecimal digits)."""
+    return (len(name) == 2) and all(character in "0123456789abcdef" for character in name)
+
+
+def reshard(directory: str, layout: str, companion_paths):
+    """This function moves every habit file within a directory into the given layout, alongside
+    the files stored next to it (such as its history file and check-off log). The files are moved
+    in batches, and only one batch of paths is held in memory at a time, so even very large
+    stores can be resharded. Empty shards are removed afterwards.
+
+    Args:
+        directory (str): The directory of the habit files, e.g. "Habits".
+        layout (str): The layout to move the files into ("flat" or "sharded").
+        companion_paths (function): A function returning the paths of the files stored next to a habit file.
+
+    Returns:
+        moved_habits (int): The number of habits that were moved.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError("Unknown layout \"" + layout + "\". Please choose one of: " + ", ".join(LAYOUTS) + ".")
+    if not os.path.isdir(directory):
+        return 0
+
+    moved_habits = 0
+    if layout == "sharded":
+        # Only files stored directly within the directory need to be moved. As every batch leaves
+        # the directory, each new scan starts with the files that have not been moved yet.
+        while True:
+            with os.scandir(directory) as entries:
+                batch = []
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        batch.append(entry.path)
+                        if len(batch) == RESHARD_BATCH_SIZE:
+                            break
+            if not batch:
+                break
+            for path_of_file in batch:
+                _move_habit_files(path_of_file, layout_path(directory, os.path.basename(path_of_file), layout), companion_paths)
+            moved_habits += len(batch)
+        return moved_habits
+
+    # Moving into the flat layout empties one shard after the other.
+    for first_level in sorted(name for name in os.listdir(directory) if _is_shard_name(name)):
+        first_level_path = os.path.join(directory, first_level)
+        if not os.path.isdir(first_level_path):
+            continue
+        for second_level in sorted(name for name in os.listdir(first_level_path) if _is_shard_name(name)):
+            shard_path = os.path.join(first_level_path, second_level)
+            for path_of_file in list(iter_habit_file_paths(shard_path)):
+                _move_habit_files(path_of_file, layout_path(directory, os.path.basename(path_of_file), layout), companion_paths)
+                moved_habits += 1
+            _remove_if_empty(shard_path)
+        _remove_if_empty(first_level_path)
+    return moved_habits
+
+
+def _move_habit_files(path_of_file: str, target_path: str, companion_paths):
+    """This function moves a habit file and the files stored next to it to a new path."""
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    os.replace(path_of_file, target_path)
+    for source_path, destination_path in zip(companion_paths(path_of_file), companion_paths(target_path)):
+        if os.path.exists(source_path):
+            os.replace(source_path, destination_path)
+
+
+def _remove_if_empty(directory: str):
+    """This function removes a directory if it is empty."""
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
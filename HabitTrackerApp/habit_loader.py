@@ -0,0 +1,201 @@
+import os
+from collections import deque
+from itertools import chain, repeat
+from habit_cache import get_cache
+from checkoff_log import CheckoffLog
+from habit_history import HistoryFile
+from streaks import habit_summary
+from habit_layout import iter_habit_file_paths
+
+
+# The number of threads used to load habit files, which can be changed via the
+# "HABIT_TRACKER_LOAD_WORKERS" environment variable. A value of 1 (the default) loads
+# every file one after the other within the calling thread. Threads pay off when every
+# read waits on the disk, such as on a network drive, whereas files that are already
+# cached by the operating system are parsed faster by a single thread (see
+# "benchmarks.loader_benchmark").
+LOAD_WORKERS = int(os.environ.get("HABIT_TRACKER_LOAD_WORKERS", "1"))
+
+# Directories with fewer habit files than this are always loaded one after the other,
+# as starting the threads would take longer than reading the files.
+PARALLEL_THRESHOLD = 32
+
+# The number of habit files loaded by a thread at once.
+CHUNK_SIZE = 16
+
+# The number of processes used to summarise habit files for the analytics covering every
+# habit, which can be changed via the "HABIT_TRACKER_PROCESS_WORKERS" environment variable.
+# A value of 0 (the default) keeps all work within the application's own process.
+PROCESS_WORKERS = int(os.environ.get("HABIT_TRACKER_PROCESS_WORKERS", "0"))
+
+# Directories with fewer habit files than this are always summarised within the application's
+# own process, as starting the processes would take longer than summarising the habits.
+PROCESS_THRESHOLD = 2000
+
+
+def habit_file_paths(directory: str = "Habits", ordered: bool = False):
+    """This function lists the habit files within a directory, in either layout (see "habit_layout").
+    "os.scandir()" is used, so the type of every entry is known without a further system call on most platforms.
+
+    Args:
+        directory (str, optional): The directory of the habit files. Defaults to "Habits".
+        ordered (bool, optional): Whether the paths are sorted by file name. Defaults to False (directory order).
+
+    Returns:
+        paths_of_files (list): The paths of all habit files.
+    """
+    return list(iter_habit_file_paths(directory, ordered))
+
+
+def load_habit(path_of_file: str, include_history: bool = True):
+    """This function loads a single habit file (from the habit cache, unless the file changed),
+    alongside any check-offs within its check-off log. The check-off history is stored within
+    its own file, which is only read when the history is needed. Without it, only the summary
+    record of the habit is brought up to date with the check-off log.
+
+    Args:
+        path_of_file (str): The path of the habit file.
+        include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+    Returns:
+        habit (tuple): The path of the habit file and the habit data.
+    """
+    loaded_habit = get_cache().load(path_of_file)
+
+    # Habit files without a summary record (or written before the history was split from
+    # the metadata) are always loaded with their history.
+    if include_history or ("check_off_history" in loaded_habit) or ("summary" not in loaded_habit):
+        HistoryFile(path_of_file).attach(loaded_habit)
+        pending_checkoffs = CheckoffLog(path_of_file).apply(loaded_habit)
+    else:
+        pending_checkoffs = CheckoffLog(path_of_file).apply_summary(loaded_habit)
+
+    # Every check-off waiting in the check-off log counts towards the version of the habit (see "Habits._update_habit()").
+    loaded_habit["version"] = loaded_habit.get("version", 0) + pending_checkoffs
+    return path_of_file, loaded_habit
+
+
+def iter_habits(directory: str = "Habits", ordered: bool = True, workers: int = None, include_history: bool = True):
+    """This generator loads every habit file within a directory. As loading a file mostly
+    waits on the disk, the files are read by a pool of threads, with at most a few chunks
+    of files per thread being loaded ahead of the caller so that memory stays bounded. When ordered,
+    the habits are yielded in the order of their file names, and otherwise as soon as they
+    were loaded.
+
+    Args:
+        directory (str, optional): The directory of the habit files. Defaults to "Habits".
+        ordered (bool, optional): Whether the habits are yielded in the order of their file names. Defaults to True.
+        workers (int, optional): The number of threads. Defaults to None ("LOAD_WORKERS").
+        include_history (bool, optional): Whether the check-off histories are loaded. Defaults to True.
+
+    Yields:
+        path_of_file (str): The path of the habit file.
+        loaded_habit (dict): The habit data.
+    """
+    # Unless ordered, the habit files are found while they are loaded, so a sharded store is listed one shard at a time.
+    paths_of_files = iter_habit_file_paths(directory, ordered)
+    workers = LOAD_WORKERS if workers is None else workers
+    first_paths = [] if workers <= 1 else list(_take(paths_of_files, PARALLEL_THRESHOLD))
+
+    if (workers <= 1) or (len(first_paths) < PARALLEL_THRESHOLD):
+        for path_of_file in first_paths:
+            yield load_habit(path_of_file, include_history)
+        for path_of_file in paths_of_files:
+            yield load_habit(path_of_file, include_history)
+        return
+    paths_of_files = chain(first_paths, paths_of_files)
+
+    # The thread pool is only imported here, so commands that load habits one after the other
+    # never pay for importing "concurrent.futures".
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # The files are loaded in chunks, which keeps the cost of handing work to the threads low.
+    # Only a limited number of chunks are loaded ahead, and a new chunk is only submitted once
+    # a loaded chunk has been taken by the caller.
+    remaining_chunks = _chunks(paths_of_files, CHUNK_SIZE)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(_load_chunk, chunk, include_history) for chunk in _take(remaining_chunks, workers * 2))
+        while pending:
+            if ordered:
+                finished = pending.popleft()
+            else:
+                finished = next(as_completed(pending))
+                pending.remove(finished)
+
+            for chunk in _take(remaining_chunks, 1):
+                pending.append(executor.submit(_load_chunk, chunk, include_history))
+            yield from finished.result()
+
+
+def summarise_habits(directory: str = "Habits", archived: bool = None, workers: int = None):
+    """This function loads every habit file within a directory and returns the summary record
+    of every habit, for the analytics that only need the summaries. Recalculating summaries
+    and parsing large files is work for the processor, so the files can be split between a
+    pool of processes, each of which summarises its own share of the files. The summaries are
+    returned in the order of the file names, exactly as if they were made by a single process.
+
+    Args:
+        directory (str or list, optional): The directory of the habit files, or a list of directories whose
+        habit files are summarised one directory after the other. Defaults to "Habits".
+        archived (bool, optional): Only includes habits with this archived status. Defaults to None (all habits).
+        workers (int, optional): The number of processes. Defaults to None ("PROCESS_WORKERS", but no
+        more than the number of processors).
+
+    Returns:
+        summaries (list): The name, periodicity, archived status and summary record of every habit,
+        or None if the store is too small for processes or the processes could not be started, in
+        which case the caller summarises the habits itself.
+    """
+    # More processes than processors would only compete for the same processors.
+    workers = min(PROCESS_WORKERS, os.cpu_count() or 1) if workers is None else workers
+    directories = [directory] if isinstance(directory, str) else directory
+    paths_of_files = [path_of_file for directory in directories for path_of_file in habit_file_paths(directory, ordered=True)]
+    if (workers <= 1) or (len(paths_of_files) < PROCESS_THRESHOLD):
+        return None
+
+    # The process pool is only imported here, as importing "multiprocessing" would slow down
+    # the startup of every command, including those that never summarise habits.
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    # Every process receives a few chunks, so that a process that finished early can take on more work.
+    chunk_size = -(-len(paths_of_files) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summarised_chunks = executor.map(_summarise_chunk, _chunks(paths_of_files, chunk_size), repeat(archived))
+            return [summary for summarised_chunk in summarised_chunks for summary in summarised_chunk]
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return None
+
+
+def _summarise_chunk(paths_of_files: list, archived: bool):
+    """This function summarises several habit files within a worker process."""
+    summaries = []
+    for path_of_file, loaded_habit in _load_chunk(paths_of_files, include_history=False):
+        if (archived is None) or (loaded_habit.get("archived", False) == archived):
+            summaries.append((loaded_habit.get("name"), loaded_habit.get("periodicity"), loaded_habit.get("archived", False), habit_summary(loaded_habit)))
+    return summaries
+
+
+def _load_chunk(paths_of_files: list, include_history: bool):
+    """This function loads several habit files within a single thread."""
+    return [load_habit(path_of_file, include_history) for path_of_file in paths_of_files]
+
+
+def _chunks(paths_of_files, chunk_size: int):
+    """This function splits a list (or iterator) of paths into chunks of up to "chunk_size" paths."""
+    remaining_paths = iter(paths_of_files)
+    while True:
+        chunk = list(_take(remaining_paths, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _take(iterator, amount: int):
+    """This function takes up to "amount" items from an iterator."""
+    for item in iterator:
+        yield item
+        amount -= 1
+        if amount == 0:
+            return
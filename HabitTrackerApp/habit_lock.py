@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from habit_index import get_index, HabitIndex
+
+# Habits are locked via "fcntl", which is only available on Unix-like systems. On Windows,
+# habits are not locked between processes, and every lock is granted immediately.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# The directory of the lock files, one per habit. Lock files are never deleted, as deleting
+# a lock file while another process waits on it would let two processes hold the "same" lock.
+LOCK_DIRECTORY = os.path.join("Habits", ".locks")
+
+# The locks held by the current thread, keyed by the path of their lock file, so that a habit
+# that is already locked by the thread (for example, while it is loaded during a check-off)
+# is not locked a second time, which would wait on itself.
+_held_locks = threading.local()
+
+
+class HabitLock:
+
+    def __init__(self, habit_name: str, shared: bool = False, blocking: bool = True, directory: str = LOCK_DIRECTORY):
+        """This is the constructor for the HabitLock class. It is used as a context manager
+        that locks a single habit against other processes (and threads) for the duration of
+        the "with" block, so that reading, changing and writing a habit happens as one step:
+
+            with HabitLock("Go to the gym"):
+                loaded_habit = Habits(habit_name = "Go to the gym")._find_habit()
+                ...
+
+        Every habit has its own lock, so habits that are not the same never wait on each other.
+        Shared locks are held by readers, any number of which can hold the lock at once, while
+        an exclusive lock is only held by a single writer at a time.
+
+        Args:
+            habit_name (str): The name of the habit to lock.
+            shared (bool, optional): Whether the lock is shared (for reading) rather than exclusive (for writing). Defaults to False.
+            blocking (bool, optional): Whether to wait for the lock, rather than raising "BlockingIOError"
+            should another process hold it. Defaults to True.
+            directory (str, optional): The directory of the lock files. Defaults to "LOCK_DIRECTORY".
+        """
+        # Lock files are named after a hash of the normalised name of the habit, so any name results
+        # in a valid file name, and the lock is kept when the habit moves between tiers or shards.
+        normalised_name = HabitIndex.normalise_name(habit_name)
+        self.directory = directory
+        self.lock_path = os.path.join(directory, hashlib.sha1(normalised_name.encode("utf-8")).hexdigest() + ".lock")
+        self.shared = shared
+        self.blocking = blocking
+
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+
+        held_locks = _thread_locks()
+        held_lock = held_locks.get(self.lock_path)
+
+        # A lock that is already held by this thread is only counted. A shared lock is never converted
+        # into an exclusive one, as "flock()" releases the shared lock before waiting for the exclusive
+        # one, so another session could change the habit in between. Paths that load, change and save
+        # a habit therefore take the exclusive lock from the start (see "Habits._update_habit()").
+        if held_lock is not None:
+            if held_lock["shared"] and not self.shared:
+                raise RuntimeError("The habit is locked for reading by this thread and cannot be locked for writing until it is unlocked.")
+            held_lock["depth"] += 1
+            return self
+
+        # Creating the lock directory modifies the directory of the habits, so its index is told about it.
+        if not os.path.isdir(self.directory):
+            with get_index(os.path.dirname(self.directory) or ".").tracking_writes():
+                os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(self.lock_path, mode="ab")
+        try:
+            fcntl.flock(lock_file.fileno(), (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | (0 if self.blocking else fcntl.LOCK_NB))
+        except BaseException:
+            lock_file.close()
+            raise
+        held_locks[self.lock_path] = {"file": lock_file, "shared": self.shared, "depth": 1}
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        if fcntl is None:
+            return False
+
+        held_locks = _thread_locks()
+        held_lock = held_locks[self.lock_path]
+        held_lock["depth"] -= 1
+        if held_lock["depth"] == 0:
+            del held_locks[self.lock_path]
+            fcntl.flock(held_lock["file"].fileno(), fcntl.LOCK_UN)
+            held_lock["file"].close()
+        return False
+
+
+def _thread_locks():
+    """This function returns the locks held by the current thread."""
+    if not hasattr(_held_locks, "locks"):
+        _held_locks.locks = {}
+    return _held_locks.locks
@@ -0,0 +1,409 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from habit_cache import copy_habit
+from habit_index import HabitIndex
+from habit_layout import habit_file_name
+from habit_lock import HabitLock
+from streaks import habit_summary
+from timestamp_codec import checkoff_range_bounds, checkoffs_in_range, count_checkoffs_in_range, epoch_array
+
+
+# The marker file that records that the predefined habits have been created within the
+# "Habits" directory, so that later startups do not need to touch any habit files.
+SEED_MARKER = os.path.join("Habits", ".seeded")
+
+
+class HabitStorage(ABC):
+    """This is the storage interface the Habits and Analytics classes depend on. Every storage
+    keeps habits in the same format as the JSON habit files, keyed by their name (compared
+    case-insensitively, with underscores treated as spaces), and implements the abstract
+    methods below. The remaining methods have defaults built on those, which a storage can
+    replace with something faster. The storages are:
+    - "json_storage.JSONStorage": Every habit is stored as its own JSON file within the "Habits" directory.
+    - "sqlite_storage.SQLiteStorage": Habits are stored within a SQLite database.
+    - "habit_storage.MemoryStorage": Habits are only kept in memory, for tests and benchmarks.
+    """
+
+    # Whether every habit carries a version that grows with every change, which the "optimistic"
+    # concurrency mode relies on (see "Habits._update_habit()"). Storages without versions are
+    # always changed while the habit is locked.
+    has_versions = False
+
+    # The path of the habit file loaded last, for storages that keep every habit within its own file.
+    habit_file_path = None
+
+
+    def exists(self):
+        """This method checks whether the storage exists, which for storages on the disk is
+        the case once the "Habits" directory was created.
+
+        Returns:
+            exists (bool): True if the storage exists.
+        """
+        return os.path.exists("Habits")
+
+
+    def lock(self, habit_name: str, shared: bool = False, blocking: bool = True):
+        """This method returns a context manager that locks a single habit for the duration of a
+        "with" block (see "habit_lock.HabitLock"), so that loading, changing and saving it happens as one step.
+
+        Args:
+            habit_name (str): The name of the habit to lock.
+            shared (bool, optional): Whether the lock is shared (for reading) rather than exclusive (for writing). Defaults to False.
+            blocking (bool, optional): Whether to wait for the lock, rather than raising "BlockingIOError". Defaults to True.
+
+        Returns:
+            lock (HabitLock): The lock of the habit.
+        """
+        return HabitLock(habit_name, shared, blocking)
+
+
+    @abstractmethod
+    def create_habit(self, habit_data: dict):
+        """This method stores a new habit.
+
+        Args:
+            habit_data (dict): The habit data, including its summary record.
+
+        Returns:
+            is_created (bool): True if the habit was created, or None if a habit with the same name already exists.
+        """
+
+
+    @abstractmethod
+    def load_habit(self, habit_name: str, include_history: bool = True):
+        """This method loads a habit by name.
+
+        Args:
+            habit_name (str): The name of the habit to load.
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Returns:
+            loaded_habit (dict): The habit data, or None if the habit was not found.
+        """
+
+
+    def load_version(self, habit_name: str):
+        """This method loads the current version of a habit, for storages with versions.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            version (int): The current version of the habit, or None if the habit no longer exists.
+        """
+        loaded_habit = self.load_habit(habit_name, include_history=False)
+        return None if loaded_habit is None else loaded_habit.get("version", 0)
+
+
+    @abstractmethod
+    def update_habit(self, previous_name: str, habit_data: dict):
+        """This method saves the changed data of a habit. Should the data contain the check-off
+        history, it replaces the stored history, and otherwise the stored history is kept.
+        Renaming a habit to the name of another habit is refused, just like creating it, and changes nothing.
+
+        Args:
+            previous_name (str): The name the habit was stored under before the change.
+            habit_data (dict): The updated habit data.
+
+        Returns:
+            is_updated (bool): True if the habit was saved, False if another habit already has its new name,
+            or None if the habit was not found.
+        """
+
+
+    @abstractmethod
+    def add_checkoff(self, habit_data: dict, checkoff: str):
+        """This method saves a new check-off of a habit, which was already appended to the
+        check-off history of the habit data alongside its new summary record and checked-off status.
+
+        Args:
+            habit_data (dict): The updated habit data.
+            checkoff (str): The date and time of the check-off in ISO 8601 format.
+        """
+
+
+    @abstractmethod
+    def delete_habit(self, habit_name: str):
+        """This method deletes a habit alongside its check-off history.
+
+        Args:
+            habit_name (str): The name of the habit to delete.
+        """
+
+
+    @abstractmethod
+    def iter_habits(self, archived: bool = None, periodicity: str = None, include_history: bool = True):
+        """This method yields every habit matching the given filters.
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+            periodicity (str, optional): Only yields habits with this periodicity. Defaults to None (all habits).
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Yields:
+            loaded_habit (dict): The habit data.
+        """
+
+
+    def checkoffs_in_range(self, loaded_habit: dict, start_epoch: int = None, end_epoch: int = None):
+        """This method returns the check-offs of a loaded habit within a range of time, as they are stored.
+        By default, the range is found within the loaded check-off history by binary search.
+
+        Args:
+            loaded_habit (dict): The habit data.
+            start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+            end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+        Returns:
+            checkoffs (list): The check-offs within the range.
+        """
+        return checkoffs_in_range(loaded_habit.get("check_off_history", []), start_epoch, end_epoch)
+
+
+    def count_checkoffs_in_range(self, loaded_habit: dict, start_epoch: int = None, end_epoch: int = None):
+        """This method counts the check-offs of a loaded habit within a range of time.
+
+        Args:
+            loaded_habit (dict): The habit data.
+            start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+            end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+        Returns:
+            check_off_count (int): The number of check-offs within the range.
+        """
+        return count_checkoffs_in_range(loaded_habit.get("check_off_history", []), start_epoch, end_epoch)
+
+
+    def load_epoch_history(self, habit_name: str):
+        """This method loads the check-off history of a habit decoded into epoch seconds (see
+        "timestamp_codec.epoch_array()"), which the streak engine works on. By default, the
+        habit is loaded and its history is decoded every time.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            epoch_seconds (array): The check-offs of the habit as epoch seconds, or None if the habit was not found.
+        """
+        loaded_habit = self.load_habit(habit_name)
+        return None if loaded_habit is None else epoch_array(loaded_habit.get("check_off_history", []))
+
+
+    def iter_checkoff_range(self, habit_name: str, start_epoch: int = None, end_epoch: int = None):
+        """This generator yields the check-offs of a habit within a range of time in chronological order,
+        as they are stored. By default, the habit is loaded once, the range is found within its check-off
+        history by binary search, and only the check-offs within the range are visited.
+
+        Args:
+            habit_name (str): The name of the habit.
+            start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+            end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+        Yields:
+            checkoff (str | int): The next check-off within the range.
+        """
+        loaded_habit = self.load_habit(habit_name)
+        if loaded_habit is None:
+            return
+        check_off_history = loaded_habit.get("check_off_history", [])
+        first, stop = checkoff_range_bounds(check_off_history, start_epoch, end_epoch)
+        for position in range(first, stop):
+            yield check_off_history[position]
+
+
+    def iter_summaries(self, archived: bool = None):
+        """This method yields the summary record of every habit, for the analytics that need nothing else.
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+
+        Yields:
+            habit_name (str): The name of the habit.
+            periodicity (str): The periodicity of the habit.
+            archived (bool): Whether the habit is archived.
+            summary (dict): The summary record of the habit.
+        """
+        for loaded_habit in self.iter_habits(archived=archived, include_history=False):
+            yield loaded_habit.get("name"), loaded_habit.get("periodicity"), loaded_habit.get("archived", False), habit_summary(loaded_habit)
+
+
+    def archived_habit_names(self):
+        """This method lists the names of all archived habits.
+
+        Returns:
+            habit_names (list): The names of all archived habits.
+        """
+        return [loaded_habit.get("name") for loaded_habit in self.iter_habits(archived=True, include_history=False)]
+
+
+    def reshard(self, layout: str):
+        """This method moves the habit files of the storage into a layout (see "habit_layout").
+
+        Args:
+            layout (str): The layout to move the habit files into ("flat" or "sharded").
+
+        Returns:
+            moved_habits (int): The number of habits that were moved, or None if the storage has no habit files.
+        """
+        return None
+
+
+    def is_seeded(self):
+        """This method checks whether the predefined habits were already created within the storage.
+
+        Returns:
+            is_seeded (bool): True if the storage was seeded.
+        """
+        return os.path.exists(SEED_MARKER)
+
+
+    def mark_seeded(self):
+        """This method records that the predefined habits were created within the storage."""
+        os.makedirs(os.path.dirname(SEED_MARKER), exist_ok=True)
+        with open(SEED_MARKER, mode="w", encoding="utf-8") as write_file:
+            write_file.write(datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"))
+
+
+class MemoryStorage(HabitStorage):
+
+    has_versions = True
+
+    def __init__(self):
+        """This is the constructor for the MemoryStorage class. Habits are only kept within a
+        dictionary keyed by their normalised name and are lost once the program exits, so nothing
+        is ever read from or written to the disk. This makes it possible to test and benchmark the
+        logic of the Habits and Analytics classes on its own:
+
+            storage = MemoryStorage()
+            Habits(storage = storage).create_predefined_habits()
+            Analytics(storage = storage).full_report()
+
+        Habits are copied whenever they are stored or loaded, so changing loaded habit data never
+        changes the stored habit until it is saved, exactly as with the other storages.
+        """
+        self.habits = {}
+        self.seeded = False
+        self.habits_lock = threading.RLock()
+
+
+    def exists(self):
+        """This method checks whether the storage exists, which an in-memory storage always does."""
+        return True
+
+
+    @contextmanager
+    def lock(self, habit_name: str, shared: bool = False, blocking: bool = True):
+        """This method locks a habit for the duration of a "with" block (see "HabitStorage.lock()")."""
+        # A single lock is shared by all habits, as the storage can only be used by the threads
+        # of a single process. Shared locks are exclusive as well.
+        if not self.habits_lock.acquire(blocking):
+            raise BlockingIOError("The habit \"" + habit_name + "\" is locked.")
+        try:
+            yield self
+        finally:
+            self.habits_lock.release()
+
+
+    def create_habit(self, habit_data: dict):
+        """This method stores a copy of a new habit (see "HabitStorage.create_habit()")."""
+        with self.habits_lock:
+            normalised_name = HabitIndex.normalise_name(habit_data["name"])
+            if normalised_name in self.habits:
+                return None
+            self.habits[normalised_name] = copy_habit(habit_data)
+            self.habits[normalised_name].setdefault("check_off_history", [])
+            self.habits[normalised_name].setdefault("version", 0)
+            return True
+
+
+    def load_habit(self, habit_name: str, include_history: bool = True):
+        """This method loads a copy of a habit (see "HabitStorage.load_habit()")."""
+        with self.habits_lock:
+            stored_habit = self.habits.get(HabitIndex.normalise_name(habit_name))
+            return None if stored_habit is None else copy_habit(stored_habit, include_history)
+
+
+    def update_habit(self, previous_name: str, habit_data: dict):
+        """This method replaces a habit with a copy of its changed data (see "HabitStorage.update_habit()")."""
+        previous_key = HabitIndex.normalise_name(previous_name)
+        updated_key = HabitIndex.normalise_name(habit_data["name"])
+        with self.habits_lock:
+            if previous_key not in self.habits:
+                return None
+            if (updated_key != previous_key) and (updated_key in self.habits):
+                return False
+            stored_habit = self.habits.pop(previous_key)
+
+            # Every change of the habit increases its version (see "Habits._update_habit()").
+            habit_data["version"] = habit_data.get("version", 0) + 1
+            updated_habit = copy_habit(habit_data)
+            if "check_off_history" not in habit_data:
+                updated_habit["check_off_history"] = stored_habit.get("check_off_history", [])
+            self.habits[updated_key] = updated_habit
+            return True
+
+
+    def add_checkoff(self, habit_data: dict, checkoff: str):
+        """This method saves a new check-off of a habit (see "HabitStorage.add_checkoff()")."""
+        # Only the new check-off is appended to the stored history, rather than the history being copied again.
+        with self.habits_lock:
+            stored_habit = self.habits.get(HabitIndex.normalise_name(habit_data["name"]))
+            if stored_habit is None:
+                return None
+
+            habit_data["version"] = habit_data.get("version", 0) + 1
+            stored_habit["check_off_history"].append(checkoff)
+            stored_habit["summary"] = dict(habit_data["summary"])
+            stored_habit["has_checked_off_today"] = habit_data.get("has_checked_off_today", True)
+            stored_habit["version"] = habit_data["version"]
+            return None
+
+
+    def delete_habit(self, habit_name: str):
+        """This method deletes a habit (see "HabitStorage.delete_habit()")."""
+        with self.habits_lock:
+            self.habits.pop(HabitIndex.normalise_name(habit_name), None)
+
+
+    def iter_habits(self, archived: bool = None, periodicity: str = None, include_history: bool = True):
+        """This method yields a copy of every matching habit (see "HabitStorage.iter_habits()")."""
+        # Habits are yielded in the order of their file names, as in the JSON storage mode, so that the
+        # order of habits (and of the analytics) is the same. The matching habits are copied first, so
+        # that habits can be changed while the iteration is still running.
+        with self.habits_lock:
+            matching_habits = [copy_habit(stored_habit, include_history) for stored_habit in self.habits.values()
+                               if ((archived is None) or (stored_habit.get("archived", False) == archived))
+                               and ((periodicity is None) or (stored_habit.get("periodicity") == periodicity))]
+
+        matching_habits.sort(key=lambda loaded_habit: habit_file_name(loaded_habit["name"]))
+        yield from matching_habits
+
+
+    def is_seeded(self):
+        """This method checks whether the predefined habits were already created within the storage."""
+        return self.seeded
+
+
+    def mark_seeded(self):
+        """This method records that the predefined habits were created within the storage."""
+        self.seeded = True
+
+
+# A single in-memory storage is shared by the whole program in the "memory" storage mode (see "Habits.storage_mode").
+_shared_storage = None
+
+
+def get_memory_storage():
+    """This function returns the in-memory storage shared by the whole program, creating it if necessary.
+
+    Returns:
+        storage (MemoryStorage): The shared in-memory storage.
+    """
+    global _shared_storage
+    if _shared_storage is None:
+        _shared_storage = MemoryStorage()
+    return _shared_storage
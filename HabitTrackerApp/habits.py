@@ -1,20 +1,83 @@
-import json
 import os
-import re
-from datetime import datetime, timezone, date, time, timedelta
-
-
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from instrumentation import count, instrument_methods
+from timestamp_codec import parse_checkoff, today_day_number, SECONDS_PER_DAY
+from streaks import summarise_history, extend_summary, habit_summary, period_key
+# The storage modules (and the habit index, loader, layout and lock modules they depend on) are only
+# imported once a storage is first needed (see "Habits._storage()"), so importing this module stays fast.
+
+
+# The number of times a change is attempted in the "optimistic" concurrency mode before giving up, and
+# the longest time (in seconds, growing with every attempt) waited between two attempts, which keeps
+# sessions that conflicted once from conflicting again straight away.
+OPTIMISTIC_RETRIES = 32
+OPTIMISTIC_BACKOFF = 0.002
+
+
+def __getattr__(name: str):
+    """This function imports "SEED_MARKER" and "ARCHIVE_DIRECTORY" from the storage modules once they are
+    first accessed, so that they can still be imported from this module without slowing down its import.
+
+    Args:
+        name (str): The name of the attribute.
+
+    Returns:
+        value (str): The value of the attribute.
+    """
+    if name == "SEED_MARKER":
+        from habit_storage import SEED_MARKER
+        return SEED_MARKER
+    if name == "ARCHIVE_DIRECTORY":
+        from json_storage import ARCHIVE_DIRECTORY
+        return ARCHIVE_DIRECTORY
+    raise AttributeError("module \"" + __name__ + "\" has no attribute \"" + name + "\"")
+
+
+@instrument_methods
 class Habits:
 
-    def __init__(self, habit_data: dict = None, habit_name: str = None):
+    # The storage mode decides whether habits are stored as JSON files within the "Habits"
+    # directory ("json"), within a SQLite database inside the same directory ("sqlite"), or
+    # only in memory until the program exits ("memory"), which suits benchmarks and tests.
+    # It can be selected via the "HABIT_TRACKER_STORAGE" environment variable, and any
+    # storage (see "habit_storage.HabitStorage") can also be passed to the constructor.
+    storage_mode = os.environ.get("HABIT_TRACKER_STORAGE", "json")
+
+    # The history encoding decides how check-offs are written to JSON habit files, either as
+    # ISO 8601 strings ("iso") or as integer epoch seconds ("epoch"), which makes the files
+    # considerably smaller. Both encodings can always be read, even when mixed within one file.
+    # It can be selected via the "HABIT_TRACKER_HISTORY_ENCODING" environment variable.
+    history_encoding = os.environ.get("HABIT_TRACKER_HISTORY_ENCODING", "iso")
+
+    # The layout decides whether new habit files are stored directly within the "Habits" directory
+    # ("flat") or within subdirectories named after a hash of their file name ("sharded"), which
+    # keeps directories small for very large numbers of habits. Habit files are found in either
+    # layout. It can be selected via the "HABIT_TRACKER_LAYOUT" environment variable, and an existing
+    # store can be moved into a layout via "reshard_store()".
+    layout = os.environ.get("HABIT_TRACKER_LAYOUT", "flat")
+
+    # The concurrency mode decides how changes made by several sessions to the same habit at once
+    # are kept apart. In the "locking" mode, a habit is locked while it is loaded, changed and saved,
+    # so other sessions wait for it. In the "optimistic" mode, habits are loaded without locks, and
+    # every habit carries a version that grows with every change. A change is only saved if the
+    # version is unchanged since the habit was loaded, and otherwise attempted again with the
+    # latest data. It can be selected via the "HABIT_TRACKER_CONCURRENCY" environment variable.
+    concurrency = os.environ.get("HABIT_TRACKER_CONCURRENCY", "locking")
+
+    def __init__(self, habit_data: dict = None, habit_name: str = None, storage = None):
         """This is the constructor for the Habits class.
 
         Args:
             habit_data (dict, optional): This parameter is used to parse JSON for processing. Defaults to None.
             habit_name (str, optional): This is the name of the habit that the user wishes to interact with. Defaults to None.
+            storage (HabitStorage, optional): The storage the habits are kept in. Defaults to None (the storage of "storage_mode").
         """
         self.habit_data = habit_data
         self.habit_name = habit_name
+        self.storage = storage
+        self.habit_file_path = None
 
 
     def create_habit_file(self):
@@ -24,68 +87,49 @@ class Habits:
         called "Habits" is created (if it doesn't exist), and
         all JSON files are stored within it. Additionally, the
         name of the habit is sanitised in order to use it for the file name.
+        When another storage mode is selected, the habit is stored there
+        instead (for example, inserted into the SQLite database).
         """
 
-        # Sanitises the habit name to create a valid filename by replacing any spaces with underscores
-        # and converting the name to lowercase.
-        # Any invalid characters for a file name are additionallly removed implicitly.
-        cleaned_name = self.habit_data["name"].lower().replace(" ", "_")
-        cleaned_name = re.sub(r'[<>:"/\\|?*]', " ", cleaned_name)
-        
-        # Creates the "Habits" directory if it doesn't exist
-        # and sets the cleansed habit name to be saved in that directory
-        # as its file name, as well as enforcing the file to have the ".json" extension
-        os.makedirs("Habits", exist_ok=True)
-        filename = os.path.join("Habits", (cleaned_name + ".json"))
-
-        # If the file does not already exist, create it and write the habit data to it
-        if not os.path.exists(filename):
-            with open(filename, mode="w", encoding="utf-8") as write_file:
-                json.dump(self.habit_data, write_file, indent=4)
-            return True
-
-        else:
-            return None
+        # The summary record of the habit is created from its check-off history.
+        # Every storage rejects habits with a name that already exists.
+        habit_data = dict(self.habit_data)
+        habit_data["summary"] = summarise_history(habit_data.get("check_off_history", []), habit_data.get("periodicity"))
+        
+        return self._storage().create_habit(habit_data)
 
 
     def load_habit_file(self):
         """This method loads a JSON file from the folder
         called "Habits" where all habits are stored. The method
         verifies whether the folder exists, and if so, proceeds
-        to loop through all the files in the folder. If a JSON file
+        to look up the file of the habit within the habit index. If a JSON file
         is found, the path of the file is saved to access the file.
         The JSON attribute "name" is used to verify whether the user-inputted
         "habit_name" from the class constructor matches the name of the
         habit in the JSON file. If so, the contents of the JSON file are displayed.
-        It should be noted that "habit_name" is used to search for in all JSON files. The
-        attribute is also sanitised to match the format of the JSON file.
+        It should be noted that "habit_name" is used as the key of the index. The
+        attribute is also sanitised to match the format of the JSON file, meaning that
+        only the matching JSON file is opened.
         
         Returns:
             loaded_habit (dict): The contents of the JSON file that matches habit_name.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
-        # Loops through all the files in the "Habits" directory and checks
-        # if a file is a JSON file. If so, it loads the file and checks if the "name" attribute
-        # within the JSON data matches the "habit_name" parameter from the class constructor.
-        # If so, the contents of the JSON file are returned.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json") == True:
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-            
-                    if loaded_habit.get("name", "").lower().replace("_", " ") == self.habit_name.lower().replace("_", " "):
-                        return loaded_habit
+        # The path of the habit file is looked up in the index, meaning that only the file of the
+        # matching habit is opened. If found, the path is remembered so that the habit can later be
+        # saved back to the same file, and the contents of the JSON file are returned. In the "locking" mode, the
+        # habit is locked for reading, so that it is never loaded halfway through being written by another session.
+        with (self._storage().lock(self.habit_name, shared = True) if self.concurrency == "locking" else nullcontext()):
+            loaded_habit = self._find_habit()
+        if loaded_habit is not None:
+            return loaded_habit
 
-            # If the file is not a JSON file, the file is skipped from the loop
-            else:
-                continue
-        
         # If no matching habit is found, print an error message and exits the method.
         print("The habit \"" + self.habit_name + "\" was not found. Try searching for another habit or check possible typos.")
             
@@ -103,7 +147,7 @@ class Habits:
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
 
@@ -146,20 +190,29 @@ class Habits:
                 isAccepted = True
             
             # If isAccepted is True, the new data overwrites the pre-existing data in the JSON file.
+            # The new data is applied to the latest data of the habit (see "_update_habit()"), so that
+            # any check-offs made by another session while the user was entering the new data are kept.
             if (isAccepted == True):
-            
-                if new_name:
-                    loaded_habit["name"] = new_name
-                if new_description:
-                    loaded_habit["description"] = new_description
-                if new_periodicity:
-                    loaded_habit["periodicity"] = new_periodicity
-
-
-                # The JSON file is then saved with the new data, and a success message is printed.
-                with open(os.path.join("Habits", (self.habit_name.lower().replace(" ", "_") + ".json")), mode="w", encoding="utf-8") as write_file:
-                    json.dump(loaded_habit, write_file, indent=4)
                 
+                def apply_new_data(loaded_habit):
+                    if new_name:
+                        loaded_habit["name"] = new_name
+                    if new_description:
+                        loaded_habit["description"] = new_description
+                    if new_periodicity:
+                        loaded_habit["periodicity"] = new_periodicity
+
+                    # The JSON file is then saved with the new data, the index is updated in case the
+                    # name or periodicity changed, and a success message is printed. Every storage refuses
+                    # to rename the habit to the name of another habit, which would otherwise be overwritten.
+                    return self._save_habit(loaded_habit)
+                
+                is_edited = self._update_habit(apply_new_data)
+                if is_edited is None:
+                    return None
+                elif (is_edited == False):
+                    print("A habit called \"" + new_name + "\" already exists. The habit \"" + self.habit_name + "\" was not edited.")
+                    return None
                 print("The habit \"" + self.habit_name + "\" was successfully edited and saved.")
                 return None
             
@@ -172,25 +225,24 @@ class Habits:
     def delete_habit_file(self):
         """This method deletes a JSON file from the "Habits" directory.
         It receives the "habit_name" parameter from the user via the
-        class constructor, then loops through all the contents of all JSON
-        files in the directory. If the "name" property within a JSON file
-        matches "habit_name," that file is deleted.
+        class constructor, then looks up the matching JSON file in the
+        habit index. If the "name" property within that JSON file
+        matches "habit_name," the file is deleted and removed from the index.
+
+        Returns:
+            is_deleted (bool): True if the habit was deleted, otherwise None.
         """
         
-        # All files within the "Habits" directory are looped through.
-        # Should the file be a JSON file, the path of the file is saved,
-        # then opened. The JSON data is loaded and the "name" attribute is checked to see if
-        # it matches the "habit_name" parameter from the class constructor (after being
-        # sanitised to match JSON formatting). If so, the file is deleted.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json") == True:
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-                if loaded_habit.get("name", "").lower().replace("_", " ") == self.habit_name.lower().replace("_", " "):
-                    os.remove(path_of_file)
-                    print("The habit \"" + self.habit_name + "\" was successfully deleted.")
-                    return None
+        # The file of the habit is looked up in the index and its "name" attribute is checked
+        # to see if it matches the "habit_name" parameter from the class constructor (after being
+        # sanitised to match JSON formatting). If so, the file is deleted and removed from the index.
+        with self._storage().lock(self.habit_name):
+            loaded_habit = self._find_habit()
+            if loaded_habit is not None:
+                self._storage().delete_habit(loaded_habit["name"])
+        if loaded_habit is not None:
+            print("The habit \"" + self.habit_name + "\" was successfully deleted.")
+            return True
         
         # If the habit was not found, an error message is printed and the method ends.
         print("The habit \"" + self.habit_name + "\" was not found. Try searching for another habit or check possible typos.")
@@ -386,27 +438,61 @@ class Habits:
         # Here, several instances of the "Habits" class are created
         # to parse the habit data and to create JSON files for each
         # respective habit.
-        Habits(habit_data=habit1).create_habit_file()
-        Habits(habit_data=habit2).create_habit_file()
-        Habits(habit_data=habit3).create_habit_file()
-        Habits(habit_data=habit4).create_habit_file()
-        Habits(habit_data=habit5).create_habit_file()
+        Habits(habit_data=habit1, storage=self.storage).create_habit_file()
+        Habits(habit_data=habit2, storage=self.storage).create_habit_file()
+        Habits(habit_data=habit3, storage=self.storage).create_habit_file()
+        Habits(habit_data=habit4, storage=self.storage).create_habit_file()
+        Habits(habit_data=habit5, storage=self.storage).create_habit_file()
 
     
-    def checkoff_habit(self):
+    def seed_predefined_habits(self, force: bool = False):
+        """This method creates the predefined habits once per "Habits" directory. A marker
+        file is written alongside the habits, and as long as it exists, later calls return
+        immediately without touching any habit files. The seeding can be repeated on
+        request via the "force" parameter, e.g. after the predefined habits were deleted.
+
+        Args:
+            force (bool, optional): Whether to create the predefined habits even if the
+            directory was already seeded. Defaults to False.
+
+        Returns:
+            is_seeded (bool): True if the predefined habits were created, or False if the
+            directory had already been seeded.
+        """
+        
+        if (force == False) and self._storage().is_seeded():
+            return False
+        
+        # The marker is written before the habits are created, so that the "Habits" directory
+        # is not modified after the habit index was saved.
+        self._storage().mark_seeded()
+        
+        self.create_predefined_habits()
+        return True
+    
+    
+    def checkoff_habit(self, confirmed: bool = False):
         """This method checks off a habit by loading the JSON file
         using the "load_habit_file()" method. If the file is found,
         the user is prompted to confirm whether they want to check-off
-        the habit. Should the user accept, the current date and time are
+        the habit, unless the check-off was already confirmed (for example,
+        by the batch command line). Should the user accept, the current date and time are
         fetched and then formatted to match the format within the JSON file
         (namely, ISO 8601) without any microseconds. The habit is then checked-off
         for today and the current formatted date and time is appended to the
-        "check_off_history" attribute within the JSON file. The file is then saved
-        and the user is informed thereof. If the user does not accept, no changes are made
+        check-off log of the habit, rather than rewriting the whole JSON file. The
+        log is periodically compacted into the "check_off_history" attribute within
+        the JSON file, and the user is informed of the check-off. If the user does not accept, no changes are made
         and the method ends with a notification message.
+
+        Args:
+            confirmed (bool, optional): Whether the check-off is accepted without asking the user. Defaults to False.
+
+        Returns:
+            is_checked_off (bool): True if a new check-off was recorded, otherwise None.
         """
         # Checks whether the "Habits" directory exists and exits the method if it doesn't
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
 
@@ -427,10 +513,11 @@ class Habits:
             
             # If the habit file was found, the user is asked whether they would like
             # to check-off the habit for today.
-            isCheckedOff = False 
-            confirmation = input("Would you like to check-off the habit \"" + self.habit_name + "\" (yes/no)? ")
-            if ((confirmation == "yes") or (confirmation == "y")):
-                isCheckedOff = True
+            isCheckedOff = confirmed
+            if (isCheckedOff == False):
+                confirmation = input("Would you like to check-off the habit \"" + self.habit_name + "\" (yes/no)? ")
+                if ((confirmation == "yes") or (confirmation == "y")):
+                    isCheckedOff = True
             
             # The current date and time are fetched and formatted to show the time within
             # the UTC timezone by setting it to "Z". The microseconds are removed and the
@@ -440,22 +527,32 @@ class Habits:
             json_datetime_format = current_datetime.isoformat().replace("+00:00", "Z")
             
             # If the user wishes to check-off the habit, the current date and time
-            # are appended to the "check_off_history" attribute within the JSON file.
-            # If the habit was not checked-off today, the "has_checked-off_today" attribute
-            # is set to True and the file is saved. The user is informed with a message
+            # are appended to the check-off history of the habit if it was not checked-off today,
+            # and the "has_checked-off_today" attribute is set to True. The user is informed with a message
             # that the habit was successfully checked-off. If the habit was already
             # checked-off today, the user is informed accordingly and the method ends.
             if (isCheckedOff == True):
-
-                loaded_habit["check_off_history"].append(json_datetime_format)
-                if (loaded_habit["has_checked_off_today"] == False):
-                    loaded_habit["has_checked_off_today"] = True
-
-                    with open(os.path.join("Habits", (self.habit_name.lower().replace(" ", "_") + ".json")), mode="w", encoding="utf-8") as write_file:
-                        json.dump(loaded_habit, write_file, indent=4)
                 
-                    print("The habit \"" + self.habit_name + "\" was successfully checked-off!")
+                # The check-off is recorded on the latest data of the habit (see "_update_habit()"), as another
+                # session may have checked it off (or compacted its check-off log) since it was loaded, for
+                # example while the user was asked.
+                def record_checkoff(loaded_habit):
+                    if (loaded_habit.get("archived") == True):
+                        return "archived"
+                    if (loaded_habit["has_checked_off_today"] == True):
+                        return "already checked-off"
+                    self._record_checkoff(loaded_habit, json_datetime_format)
+                    return "checked-off"
+                
+                checkoff_status = self._update_habit(record_checkoff)
+                if (checkoff_status is None):
+                    return None
+                elif (checkoff_status == "archived"):
+                    print("The habit \"" + self.habit_name + "\" is archived and cannot be checked-off. Please unarchive the habit first.")
                     return None
+                elif (checkoff_status == "checked-off"):
+                    print("The habit \"" + self.habit_name + "\" was successfully checked-off!")
+                    return True
                 else:
                     print("You already checked-off the habit \"" + self.habit_name + "\" recently. Please check again tomorrow.")
                     return None
@@ -468,61 +565,29 @@ class Habits:
         
        
     def setcheckoff_to_false(self):
-        """This method loops through all the JSON files in the "Habits" directory
-        and checks whether the "has_checked_off_today" attribute is set to "true"
-        within all JSON files. If so, the method checks the periodicity of the habit
-        and calculates whether the last check-off date is before today for daily habits
-        and this week for weekly habits. If the last check-off date is before today or this week,
-        the "has_checked_off_today" attribute is set to "false" and the file is saved.
+        """This method loops through all the habits in storage and brings the cached
+        "has_checked_off_today" attribute up to date. Whether a habit has been checked-off
+        is derived by comparing the period of its last check-off (the day for daily habits
+        and the week for weekly habits) with the current period, which is also done whenever
+        a single habit is loaded. This method is therefore no longer needed at startup and
+        only rewrites habits whose cached attribute is out of date.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
-
-        # Gets the current date and time in UTC and sets the time to midnight for the given timezone (UTC).
-        # This is done to ensure that the last habit check-off date is compared to the start of the day.
-        today_midnight = datetime.combine(date.today(), time.min).replace(tzinfo=timezone.utc)
-        
-        # Gets the start of the week by subtracting the number of days since the last Monday from today.
-        start_of_week = today_midnight - timedelta(days=today_midnight.weekday())
-        
-        # Loops through all the files in the "Habits" directory and checks
-        # if a file is a JSON file. If so, it loads the file and grabs the
-        # last value in the "check_off_history" list, then formats the value
-        # into a datetime object.
-        for file_in_folder in os.listdir("Habits"):
-            if file_in_folder.endswith(".json") == True:
-                path_of_file = os.path.join("Habits", file_in_folder)
-                with open(path_of_file, mode="r", encoding="utf-8") as read_file:
-                    loaded_habit = json.load(read_file)
-                    all_checkoffs = loaded_habit.get("check_off_history", [])
-                    if all_checkoffs:
-                        last_checkoff = all_checkoffs[-1]
-                        last_checkoff = datetime.strptime(last_checkoff, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                        
-                        # If the periodicity of the habit is "daily," the method
-                        # compares the last check-off date to today via the "today_midnight" variable.
-                        # If the last check-off date is before today, the "has_checked_off_today" attribute
-                        # is set to "False" and the file is saved.
-                        if loaded_habit.get("periodicity").lower() == "daily":
-                            
-                            if last_checkoff < today_midnight:
-                                loaded_habit["has_checked_off_today"] = False
-                                with open(path_of_file, mode="w", encoding="utf-8") as write_file:
-                                    json.dump(loaded_habit, write_file, indent=4)
-                        
-                        # If the periodicity of the habit is "weekly," the method
-                        # compares the last check-off date to today via the "start_of_week" variable.
-                        # If the last check-off date is before the previous week, the "has_checked_off_today" attribute
-                        # is set to "False" and the file is saved.
-                        else:
-                            
-                            if last_checkoff < start_of_week:
-                                loaded_habit["has_checked_off_today"] = False
-                                with open(path_of_file, mode="w", encoding="utf-8") as write_file:
-                                    json.dump(loaded_habit, write_file, indent=4)
+        
+        # Loops through all the habits in storage. Should the cached "has_checked_off_today" attribute
+        # not match whether the habit was checked-off within the current period, the habit is saved.
+        # Habits that need saving are locked and loaded again first, in case another session changed them in the meantime.
+        storage = self._storage()
+        for loaded_habit in storage.iter_habits(include_history=False):
+            if self._refresh_checked_off(loaded_habit):
+                with storage.lock(loaded_habit["name"]):
+                    loaded_habit = storage.load_habit(loaded_habit["name"], include_history=False)
+                    if (loaded_habit is not None) and self._refresh_checked_off(loaded_habit):
+                        self._write_habit(loaded_habit["name"], loaded_habit)
         return None
     
     
@@ -532,33 +597,40 @@ class Habits:
         the "archived" attribute within the JSON file is set to "true" and the file is saved.
         The user is informed that the habit was successfully archived. In the event that
         the habit is already archived, an error message is printed and the method ends.
+
+        Returns:
+            is_archived (bool): True if the habit was archived, otherwise None.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
 
-        # Loads the habit file using the "load_habit_file()" method and checks whether the file
-        # was found. If not, an error message is printed and the method ends.
-        loaded_habit = self.load_habit_file()
-        if (loaded_habit == False):
-            return None
+        # The habit is loaded, changed and saved via "_update_habit()", so that no changes made by another
+        # session in between are lost. If the habit is not found, an error message is printed and the method ends.
+        def archive(loaded_habit):
         
-        # If the habit is already archived, an error message is printed and the method ends.
-        elif (loaded_habit.get("archived") == True):
-            print("The habit \"" + self.habit_name + "\" is already archived. No changes were made.")
-            return None
+            # If the habit is already archived, no changes are made.
+            if (loaded_habit.get("archived") == True):
+                return False
         
-        else:
-            # If the user wishes to archive the habit, the "archived" attribute within
-            # the JSON file is set to True and the file is saved. The user is informed with a message
-            # that the habit was successfully archived.
+            # Otherwise, the "archived" attribute within the JSON file is set to True and the file is saved.
             loaded_habit["archived"] = True
-            with open(os.path.join("Habits", (self.habit_name.lower().replace(" ", "_") + ".json")), mode="w", encoding="utf-8") as write_file:
-                json.dump(loaded_habit, write_file, indent=4)
+            self._save_habit(loaded_habit)
+            return True
+        
+        is_archived = self._update_habit(archive)
+        
+        # If the habit was already archived, an error message is printed and the method ends.
+        if (is_archived == False):
+            print("The habit \"" + self.habit_name + "\" is already archived. No changes were made.")
+        
+        # The user is informed with a message that the habit was successfully archived.
+        elif (is_archived == True):
             print("The habit \"" + self.habit_name + "\" was successfully archived.")
-            return None
+            return True
+        return None
             
     
     def unarchive_habit(self):
@@ -568,32 +640,291 @@ class Habits:
         and the file is saved. The user is informed that the habit was
         successfully unarchived. In the event that the habit is already unarchived,
         an error message is printed and the method ends.
+
+        Returns:
+            is_unarchived (bool): True if the habit was unarchived, otherwise None.
         """
         
         # Checks whether the "Habits" directory exists and exits the method if it doesn't.
-        if not os.path.exists("Habits"):
+        if not self._storage().exists():
             print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
 
-        # Loads the habit file using the "load_habit_file()" method and checks whether the file
-        # was found. If not, an error message is printed and the method ends.
-        loaded_habit = self.load_habit_file()
-        if (loaded_habit == False):
-            return None
+        # The habit is loaded, changed and saved via "_update_habit()", so that no changes made by another
+        # session in between are lost. If the habit is not found, an error message is printed and the method ends.
+        def unarchive(loaded_habit):
+        
+            # If the habit is not archived, no changes are made.
+            if (loaded_habit.get("archived") == False):
+                return False
         
-        # If the habit is not archived, an error message is printed and the method ends.
-        elif (loaded_habit.get("archived") == False):
+            # Otherwise, the "archived" attribute within the JSON file is set to False and the file is saved.
+            loaded_habit["archived"] = False
+            self._save_habit(loaded_habit)
+            return True
+        
+        is_unarchived = self._update_habit(unarchive)
+        
+        # If the habit was not archived, an error message is printed and the method ends.
+        if (is_unarchived == False):
             print("The habit \"" + self.habit_name + "\" is not archived. No changes were made.")
+        
+        # The user is informed with a message that the habit was successfully unarchived.
+        elif (is_unarchived == True):
+            print("The habit \"" + self.habit_name + "\" was successfully unarchived.")
+            return True
+        return None
+
+
+    def rebuild_summaries(self):
+        """This method recalculates the summary record of every habit from its full
+        check-off history and saves every habit whose stored summary differs. This
+        repairs summaries that drifted, for example after habit files were edited by hand.
+        
+        Returns:
+            rebuilt_summaries (int): The number of habits whose summary was rebuilt.
+        """
+        
+        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
+        if not self._storage().exists():
+            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
         
-        else:
-            # If the user wishes to unarchive the habit, the "archived" attribute within
-            # the JSON file is set to False and the file is saved. The user is informed with a message
-            # that the habit was successfully unarchived.
+        # Loops through all habits and compares the stored summary to one calculated from the
+        # check-off history. Should they differ, the habit is saved, which stores the new summary.
+        storage = self._storage()
+        rebuilt_summaries = 0
+        for loaded_habit in storage.iter_habits():
+            rebuilt_summary = summarise_history(loaded_habit.get("check_off_history", []), loaded_habit.get("periodicity"))
+            if loaded_habit.get("summary") != rebuilt_summary:
+                with storage.lock(loaded_habit["name"]):
+                    loaded_habit = storage.load_habit(loaded_habit["name"])
+                    if loaded_habit is not None:
+                        self._write_habit(loaded_habit["name"], loaded_habit)
+                        rebuilt_summaries += 1
+        
+        print(str(rebuilt_summaries) + " habit summaries were rebuilt.")
+        return rebuilt_summaries
+    
+    
+    def reshard_store(self, layout: str = "sharded"):
+        """This method moves every habit file (alongside its history file and check-off log) within
+        the "Habits" directory and the archive directory into the given layout, one batch of files
+        at a time (see "JSONStorage.reshard()"). Storage modes without habit files (such as the
+        SQLite storage mode) have nothing to move.
 
-            loaded_habit["archived"] = False
-            with open(os.path.join("Habits", (self.habit_name.lower().replace(" ", "_") + ".json")), mode="w", encoding="utf-8") as write_file:
-                json.dump(loaded_habit, write_file, indent=4)        
-            print("The habit \"" + self.habit_name + "\" was successfully unarchived.")
+        Args:
+            layout (str, optional): The layout to move the habit files into ("flat" or "sharded"). Defaults to "sharded".
+
+        Returns:
+            moved_habits (int): The number of habits that were moved, or None if nothing could be moved.
+        """
+        
+        # Checks whether the "Habits" directory exists and exits the method if it doesn't.
+        if not self._storage().exists():
+            print("No \"Habits\" folder found. Please create a habit first or check the file path.")
             return None
-                
+        
+        from habit_layout import LAYOUTS
+        if layout not in LAYOUTS:
+            print("Unknown layout \"" + layout + "\". Please choose one of: " + ", ".join(LAYOUTS) + ".")
+            return None
+        
+        moved_habits = self._storage().reshard(layout)
+        if moved_habits is None:
+            print("Habits stored within the \"" + self.storage_mode + "\" storage mode have no habit files to reshard.")
+            return None
+        
+        print(str(moved_habits) + " habits were moved into the " + layout + " layout.")
+        return moved_habits
+    
+    
+    def _storage(self):
+        """This method returns the storage the habits are kept in (see "habit_storage.HabitStorage"),
+        which is the storage passed to the constructor or otherwise the storage of the selected
+        storage mode. The module of the storage is only imported once it is first needed, so that
+        importing this module does not pay for loading it, and other storage modes never do.
+
+        Returns:
+            storage (HabitStorage): The storage of the habits.
+        """
+        if self.storage is None:
+            if self.storage_mode == "sqlite":
+                import sqlite_storage
+                self.storage = sqlite_storage.get_storage()
+            elif self.storage_mode == "memory":
+                from habit_storage import get_memory_storage
+                self.storage = get_memory_storage()
+            else:
+                from json_storage import JSONStorage
+                self.storage = JSONStorage(self.layout, self.history_encoding)
+        return self.storage
+    
+    
+    def _find_habit(self):
+        """This method finds and loads the habit called "habit_name" from storage (see
+        "HabitStorage.load_habit()"). In the JSON storage mode, the path of the habit file
+        is remembered, which is where the habit will be saved back to. In every storage mode,
+        the "has_checked_off_today" attribute is derived from the last check-off rather than
+        trusted from storage.
+
+        Returns:
+            loaded_habit (dict): The habit data, or None if the habit was not found.
+        """
+        
+        storage = self._storage()
+        loaded_habit = storage.load_habit(self.habit_name)
+        self.habit_file_path = storage.habit_file_path
+        if loaded_habit is not None:
+            self._refresh_checked_off(loaded_habit)
+        return loaded_habit
+    
+    
+    def _save_habit(self, loaded_habit: dict):
+        """This method saves a habit that was loaded via "_find_habit()" back to storage.
+
+        Args:
+            loaded_habit (dict): The updated habit data.
+
+        Returns:
+            is_updated (bool): True if the habit was saved, or False if another habit already has its new name.
+        """
+        return self._write_habit(self.habit_name, loaded_habit)
+    
+    
+    def _update_habit(self, change):
+        """This method loads the habit called "habit_name," changes it and saves it as a single step,
+        so that no changes made by other sessions at the same time are lost. In the "locking" mode
+        (and for storages without versions, such as the SQLite storage), the habit is locked for the whole
+        step. In the "optimistic" mode, the habit is loaded without a lock, and the changes are only saved
+        if the version of the habit is still the one that was loaded (compare-and-swap). Should another
+        session have changed the habit in the meantime, the step is attempted again with the latest data of the habit.
+
+        Args:
+            change (function): A function that changes the loaded habit, saves it (via "_save_habit()" or
+            "_record_checkoff()") if needed, and returns the result of the step.
+
+        Returns:
+            result: The result of "change", or None if the habit was not found or kept being changed by other sessions.
+        """
+        
+        storage = self._storage()
+        if (self.concurrency != "optimistic") or (storage.has_versions == False):
+            with storage.lock(self.habit_name):
+                loaded_habit = self._find_habit()
+                if loaded_habit is not None:
+                    return change(loaded_habit)
+            print("The habit \"" + self.habit_name + "\" was not found. Try searching for another habit or check possible typos.")
+            return None
+        
+        for attempt in range(OPTIMISTIC_RETRIES):
+            loaded_habit = self._find_habit()
+            if loaded_habit is None:
+                print("The habit \"" + self.habit_name + "\" was not found. Try searching for another habit or check possible typos.")
+                return None
+            
+            # The version is compared and the changes are saved while the habit is locked only briefly,
+            # without waiting for the lock. A session that is saving the habit at the same time counts as
+            # a conflict, just like a habit that was moved (archived or unarchived) in the meantime.
+            try:
+                with storage.lock(self.habit_name, blocking = False):
+                    if storage.load_version(self.habit_name) == loaded_habit["version"]:
+                        return change(loaded_habit)
+            except BlockingIOError:
+                pass
+            
+            # "random" is only imported once a conflict occurred, so it never slows down the startup.
+            import random
+            count("version_conflicts")
+            time.sleep(random.uniform(0, OPTIMISTIC_BACKOFF * (attempt + 1)))
+        
+        print("The habit \"" + self.habit_name + "\" was changed by another session too many times in a row. No changes were made, please try again.")
+        return None
+    
+    
+    def _write_habit(self, previous_name: str, loaded_habit: dict):
+        """This method writes the data of a habit to storage (see "HabitStorage.update_habit()").
+        In the JSON storage mode, the habit file is overwritten with the full check-off history,
+        which compacts the check-off log of the habit, and the index is updated in case the name,
+        periodicity or archived status changed. In the SQLite storage mode, the row of the habit
+        is updated. As the full check-off history is available, the summary record of the habit
+        is recalculated from it, which also repairs any drift.
+
+        Args:
+            previous_name (str): The name the habit was stored under before the change.
+            loaded_habit (dict): The updated habit data.
+
+        Returns:
+            is_updated (bool): The result of "HabitStorage.update_habit()".
+        """
+        
+        if "check_off_history" in loaded_habit:
+            loaded_habit["summary"] = summarise_history(loaded_habit["check_off_history"], loaded_habit.get("periodicity"))
+        
+        storage = self._storage()
+        is_updated = storage.update_habit(previous_name, loaded_habit)
+        self.habit_file_path = storage.habit_file_path
+        return is_updated
+    
+    
+    def _record_checkoff(self, loaded_habit: dict, checkoff: str):
+        """This method records a new check-off for a habit that was loaded via
+        "_find_habit()" and marks the habit as checked-off. Only the new check-off is
+        saved (see "HabitStorage.add_checkoff()"): in the JSON storage mode, it is appended
+        to the check-off log of the habit, so its cost does not grow with the length of the
+        history, and once enough check-offs have accumulated within the log, they are
+        compacted into the habit file. The summary record of the habit is extended by
+        the new check-off in constant time.
+
+        Args:
+            loaded_habit (dict): The habit data.
+            checkoff (str): The date and time of the check-off in ISO 8601 format.
+        """
+        
+        summary = self._habit_summary(loaded_habit)
+        loaded_habit["check_off_history"].append(checkoff)
+        loaded_habit["has_checked_off_today"] = True
+        loaded_habit["summary"] = extend_summary(summary, checkoff, loaded_habit.get("periodicity"))
+        
+        self._storage().add_checkoff(loaded_habit, checkoff)
+        return None
+    
+    
+    def _refresh_checked_off(self, loaded_habit: dict):
+        """This method derives whether a habit has been checked-off within the current period
+        by comparing the period of its last check-off with the period of today. For daily habits,
+        the period is the day, and for weekly habits, it is the week starting on Monday. The
+        result is stored within the "has_checked_off_today" attribute, which is only written
+        to storage the next time the habit is saved.
+
+        Args:
+            loaded_habit (dict): The habit data.
+
+        Returns:
+            has_changed (bool): True if the cached "has_checked_off_today" attribute was out of date.
+        """
+        last_checkoff = self._habit_summary(loaded_habit)["last_checkoff"]
+        has_checked_off = False
+        
+        if last_checkoff is not None:
+            periodicity = loaded_habit.get("periodicity", "daily").lower()
+            last_checkoff_day = parse_checkoff(last_checkoff) // SECONDS_PER_DAY
+            has_checked_off = period_key(last_checkoff_day, periodicity) >= period_key(today_day_number(), periodicity)
+        
+        has_changed = loaded_habit.get("has_checked_off_today") != has_checked_off
+        loaded_habit["has_checked_off_today"] = has_checked_off
+        return has_changed
+    
+    
+    def _habit_summary(self, loaded_habit: dict):
+        """This method returns the summary record of a habit. Should the summary be missing,
+        or should it not match the number of check-offs within the history (for example,
+        because the habit file was edited by hand), it is recalculated from the history.
+
+        Args:
+            loaded_habit (dict): The habit data.
+
+        Returns:
+            summary (dict): The summary record of the habit.
+        """
+        return habit_summary(loaded_habit)
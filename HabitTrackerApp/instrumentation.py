@@ -0,0 +1,184 @@
+import functools
+import json
+import threading
+import time
+import types
+
+
+# The counters kept by OperationStats, alongside the label used within reports:
+# - files_opened: The number of files opened for reading or writing.
+# - json_loads: The number of JSON documents parsed (habit files, the index and check-off log lines).
+# - json_dumps: The number of JSON documents written.
+# - bytes_read / bytes_written: The number of bytes read from or written to files.
+# - datetime_parses: The number of check-offs converted from ISO 8601 strings into epoch seconds.
+# - cache_hits / cache_misses: The number of habit files taken from the habit cache, or parsed as they were not cached.
+# - fsyncs: The number of files and directories flushed to the disk (see "atomic_write").
+# - version_conflicts: The number of writes retried because another session changed the habit first.
+COUNTERS = {
+    "files_opened": "Files opened",
+    "json_loads": "JSON documents parsed",
+    "json_dumps": "JSON documents written",
+    "bytes_read": "Bytes read",
+    "bytes_written": "Bytes written",
+    "datetime_parses": "Check-offs parsed",
+    "cache_hits": "Habit cache hits",
+    "cache_misses": "Habit cache misses",
+    "fsyncs": "Files and directories flushed to disk",
+    "version_conflicts": "Version conflicts",
+}
+
+# The statistics currently collecting counts. Nothing is counted while this list is empty,
+# so the instrumentation costs a single check when it is not in use.
+_active_stats = []
+
+# Habit files can be loaded by several threads at once, so counters are only changed while holding this lock.
+_counter_lock = threading.Lock()
+
+
+class OperationStats:
+
+    def __init__(self):
+        """This is the constructor for the OperationStats class. It is used as a context
+        manager, and all storage calls made by the Habits and Analytics classes within the
+        "with" block are counted, alongside the wall time of every public method:
+
+            with OperationStats() as stats:
+                Habits(habit_name = "Go to the gym").load_habit_file()
+            print(stats.report())
+        """
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.methods = {}
+
+
+    def __enter__(self):
+        _active_stats.append(self)
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        _active_stats.remove(self)
+        return False
+
+
+    def as_dict(self):
+        """This method returns the collected statistics in a format that can be written as JSON.
+
+        Returns:
+            statistics (dict): The counters and the number of calls and the wall time of every method.
+        """
+        return {"counters": dict(self.counters), "methods": {method_name: dict(method) for method_name, method in self.methods.items()}}
+
+
+    def report(self):
+        """This method formats the collected statistics in a readable format.
+
+        Returns:
+            report (str): One line per counter, followed by one line per method that was called.
+        """
+        lines = [COUNTERS[counter_name] + ": " + str(value) for counter_name, value in self.counters.items()]
+        for method_name, method in self.methods.items():
+            lines.append(method_name + ": " + str(method["calls"]) + " call(s), " + format(method["seconds"] * 1000, ".2f") + " ms")
+        return "\n".join(lines)
+
+
+def count(counter_name: str, amount: int = 1):
+    """This function adds to a counter of every active OperationStats.
+
+    Args:
+        counter_name (str): The name of the counter, one of "COUNTERS".
+        amount (int, optional): The amount to add. Defaults to 1.
+    """
+    # The lock is only taken while statistics are collected, so counting costs a single check otherwise.
+    if not _active_stats:
+        return
+    with _counter_lock:
+        for stats in _active_stats:
+            stats.counters[counter_name] += amount
+
+
+def read_json(path_of_file: str):
+    """This function opens and parses a JSON file, counting the file, the document and its size.
+
+    Args:
+        path_of_file (str): The path of the JSON file.
+
+    Returns:
+        loaded_data: The parsed contents of the file.
+    """
+    with open(path_of_file, mode="rb") as read_file:
+        contents = read_file.read()
+    if _active_stats:
+        count("files_opened")
+        count("json_loads")
+        count("bytes_read", len(contents))
+    return json.loads(contents)
+
+
+def write_json(path_of_file: str, data, indent: int = None, atomic: bool = True):
+    """This function writes data to a JSON file, counting the file, the document and its size.
+    The file is replaced atomically (see "atomic_write"), so it is never left half-written.
+
+    Args:
+        path_of_file (str): The path of the JSON file.
+        data: The data to write.
+        indent (int, optional): The indentation of the JSON document. Defaults to None (a single line).
+        atomic (bool, optional): Whether the file is replaced atomically, rather than overwritten
+        in place. Defaults to True.
+    """
+    contents = json.dumps(data, indent=indent).encode("utf-8")
+    if atomic:
+        # "atomic_write" is only imported once a file is written, so that programs which only read never load it.
+        from atomic_write import write_atomically
+        write_atomically(path_of_file, contents)
+    else:
+        with open(path_of_file, mode="wb") as write_file:
+            write_file.write(contents)
+    if _active_stats:
+        count("files_opened")
+        count("json_dumps")
+        count("bytes_written", len(contents))
+
+
+def instrument_methods(instrumented_class):
+    """This class decorator records the number of calls and the wall time of every public
+    method defined by a class while an OperationStats is active. Methods that are inherited
+    are recorded under the class that defines them, while static methods are left unchanged.
+
+    Args:
+        instrumented_class (type): The class whose public methods are recorded.
+
+    Returns:
+        instrumented_class (type): The same class.
+    """
+    for method_name, method in list(vars(instrumented_class).items()):
+        if isinstance(method, types.FunctionType) and not method_name.startswith("_"):
+            setattr(instrumented_class, method_name, _instrument(instrumented_class.__name__ + "." + method_name, method))
+    return instrumented_class
+
+
+def _instrument(method_name: str, method):
+    """This function wraps a single method so that its calls and wall time are recorded.
+
+    Args:
+        method_name (str): The name the method is recorded under, e.g. "Habits.load_habit_file".
+        method (function): The method to wrap.
+
+    Returns:
+        wrapper (function): The wrapped method.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _active_stats:
+            return method(*args, **kwargs)
+
+        start_time = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed_seconds = time.perf_counter() - start_time
+            for stats in _active_stats:
+                recorded_method = stats.methods.setdefault(method_name, {"calls": 0, "seconds": 0.0})
+                recorded_method["calls"] += 1
+                recorded_method["seconds"] += elapsed_seconds
+
+    return wrapper
@@ -0,0 +1,487 @@
+import os
+from habit_index import get_index, HabitIndex
+from instrumentation import write_json
+from checkoff_log import CheckoffLog, COMPACTION_THRESHOLD
+from habit_loader import iter_habits, load_habit, summarise_habits
+from habit_cache import get_cache
+from habit_history import HistoryFile, split_habit
+from habit_layout import habit_file_name, layout_path, reshard, LAYOUTS
+from habit_storage import HabitStorage
+from timestamp_codec import encode_history, parse_checkoff
+
+
+# The directory of the cold tier, into which archived habits are moved. As almost every scan
+# only covers unarchived habits, those scans never open any archived habits. The index of
+# this directory serves as the manifest of all archived habits.
+ARCHIVE_DIRECTORY = os.path.join("Habits", "archive")
+
+
+class JSONStorage(HabitStorage):
+
+    has_versions = True
+
+    def __init__(self, layout: str = "flat", history_encoding: str = "iso"):
+        """This is the constructor for the JSONStorage class. Every habit is stored as its own
+        JSON file within the "Habits" directory (for unarchived habits) or the archive directory
+        (for archived habits), alongside a history file holding its check-off history and a
+        check-off log holding the check-offs that were not yet compacted into the history.
+        Habit files are found via the habit index of each directory, and parsed habit files
+        are kept within the habit cache.
+
+        A storage is created for every Habits instance, and remembers the habit file it loaded
+        last, so that a habit is saved back to the file it was loaded from without looking it
+        up again, and so that the check-offs waiting within its check-off log are counted.
+
+        Args:
+            layout (str, optional): The layout of new habit files ("flat" or "sharded"). Defaults to "flat".
+            history_encoding (str, optional): The encoding of written check-offs ("iso" or "epoch"). Defaults to "iso".
+        """
+        self.layout = layout
+        self.history_encoding = history_encoding
+        self.habit_file_path = None
+        self.loaded_name = None
+        self.pending_checkoffs = 0
+
+
+    def create_habit(self, habit_data: dict):
+        """This method creates the habit file of a new habit (if no habit of the same name exists
+        within either tier or layout) and adds the habit to the index. The name of the habit is
+        sanitised in order to use it for the file name (see "habit_layout.habit_file_name()").
+
+        Args:
+            habit_data (dict): The habit data, including its summary record.
+
+        Returns:
+            is_created (bool): True if the habit was created, or None if a habit with the same name already exists.
+        """
+
+        # Creates the "Habits" directory (and the shard of the habit, in the sharded layout) if it doesn't exist.
+        file_name = habit_file_name(habit_data["name"])
+        filename = layout_path("Habits", file_name, self.layout)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        # The habit is locked while it is created, so that two sessions creating a habit of the same name never both succeed.
+        with self.lock(habit_data["name"]):
+
+            # If a habit with the same name is already indexed (for example, because an existing
+            # habit was renamed to this name), no new file is created.
+            if (get_index().lookup(habit_data["name"]) is not None) or (get_index(ARCHIVE_DIRECTORY).lookup(habit_data["name"]) is not None):
+                return None
+
+            # If the file does not already exist, create it and write the habit data to it.
+            # The new habit is then added to the index so that it can be found without a directory scan.
+            # Files of the same name are searched for within both tiers and both layouts.
+            possible_paths = [layout_path(directory, file_name, layout) for directory in ("Habits", ARCHIVE_DIRECTORY) for layout in LAYOUTS]
+            if any(os.path.exists(possible_path) for possible_path in possible_paths):
+                return None
+
+            self._write_habit_files(filename, habit_data)
+            get_index().add(habit_data, filename)
+            return True
+
+
+    def load_habit(self, habit_name: str, include_history: bool = True):
+        """This method finds and loads a habit. The file of the habit is found via the habit index
+        (of the "Habits" directory, followed by the index of the archive directory) and the name
+        stored within the file is verified against "habit_name." Should the index be out of date
+        (for example, because a file was edited by hand), the index is rebuilt and the lookup is
+        repeated once. Any check-offs that are still waiting in the check-off log of the habit are
+        added to its history. Unless the file changed since it was last loaded, it is taken from
+        the habit cache. The path of the file is remembered so that the habit can later be saved
+        back to the same file.
+
+        Args:
+            habit_name (str): The name of the habit to load.
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Returns:
+            loaded_habit (dict): The habit data, or None if the habit was not found.
+        """
+
+        # Unarchived habits are searched for first, followed by the archived habits of the cold tier.
+        for index in (get_index(), get_index(ARCHIVE_DIRECTORY)):
+            for attempt in range(2):
+                path_of_file = index.lookup(habit_name)
+                if path_of_file is None:
+                    break
+
+                loaded_habit = get_cache().load(path_of_file)
+
+                if index.normalise_name(loaded_habit.get("name", "")) == index.normalise_name(habit_name):
+                    # Without the history, only the summary record is brought up to date with the check-off
+                    # log, unless the habit file has no summary record (see "habit_loader.load_habit()").
+                    if include_history or ("check_off_history" in loaded_habit) or ("summary" not in loaded_habit):
+                        HistoryFile(path_of_file).attach(loaded_habit)
+                        self.pending_checkoffs = CheckoffLog(path_of_file).apply(loaded_habit)
+                    else:
+                        self.pending_checkoffs = CheckoffLog(path_of_file).apply_summary(loaded_habit)
+                    loaded_habit["version"] = loaded_habit.get("version", 0) + self.pending_checkoffs
+                    self.habit_file_path = path_of_file
+                    self.loaded_name = loaded_habit["name"]
+                    return loaded_habit
+
+                index.rebuild()
+
+        return None
+
+
+    def load_epoch_history(self, habit_name: str):
+        """This method loads the check-off history of a habit decoded into epoch seconds. The
+        history file is decoded once and kept decoded within the habit cache for as long as it is
+        unchanged (see "HabitCache.load_epochs()"), so only the check-offs still waiting in the
+        check-off log of the habit are decoded again.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            epoch_seconds (array): The check-offs of the habit as epoch seconds, or None if the habit was not found.
+        """
+        # Habit files that were not found via the index as they are, or that still contain their
+        # history (as written before the history was split from the metadata), are loaded in full.
+        path_of_file = self._habit_path(habit_name)
+        if path_of_file is None:
+            return super().load_epoch_history(habit_name)
+        try:
+            metadata = get_cache().load(path_of_file)
+        except FileNotFoundError:
+            return super().load_epoch_history(habit_name)
+        if (HabitIndex.normalise_name(metadata.get("name", "")) != HabitIndex.normalise_name(habit_name)) or ("check_off_history" in metadata):
+            return super().load_epoch_history(habit_name)
+
+        epoch_seconds = HistoryFile(path_of_file).read_epochs()
+        for entry in CheckoffLog(path_of_file).read():
+            if entry["position"] >= len(epoch_seconds):
+                epoch_seconds.append(parse_checkoff(entry["checkoff"]))
+        return epoch_seconds
+
+
+    def load_version(self, habit_name: str):
+        """This method loads the current version of a habit, which is the version stored within its
+        habit file plus the number of check-offs waiting in its check-off log, as every check-off
+        recorded in the log also counts as a change. The habit file is read again, as the habit may
+        have been changed by another session since it was loaded.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            version (int): The current version of the habit, or None if the habit file no longer exists.
+        """
+        path_of_file = self._habit_path(habit_name)
+        if path_of_file is None:
+            return None
+        try:
+            return load_habit(path_of_file, include_history=False)[1]["version"]
+        except FileNotFoundError:
+            return None
+
+
+    def update_habit(self, previous_name: str, habit_data: dict):
+        """This method writes the data of a habit to its habit file. Should the data contain the full
+        check-off history, the history file is overwritten as well, which compacts the check-off log
+        of the habit. The index is updated in case the name, periodicity or archived status changed.
+        Renaming a habit to the name of another habit (within either tier) is refused and changes nothing,
+        as the index would otherwise lose the entry of the other habit, leaving its file unreachable.
+
+        Args:
+            previous_name (str): The name the habit was stored under before the change.
+            habit_data (dict): The updated habit data.
+
+        Returns:
+            is_updated (bool): True if the habit was saved, False if another habit already has its new name,
+            or None if the habit was not found.
+        """
+        path_of_file = self._habit_path(previous_name)
+        if path_of_file is None:
+            return None
+        if HabitIndex.normalise_name(habit_data["name"]) != HabitIndex.normalise_name(previous_name):
+            if (get_index().lookup(habit_data["name"]) is not None) or (get_index(ARCHIVE_DIRECTORY).lookup(habit_data["name"]) is not None):
+                return False
+
+        # Every change of the habit increases its version (see "Habits._update_habit()").
+        habit_data["version"] = habit_data.get("version", 0) + 1
+
+        # Should the archived status of the habit have changed, its files are first moved into the other tier.
+        target_path = self._tier_path(path_of_file, habit_data.get("archived", False))
+        if target_path != path_of_file:
+            self._move_habit(path_of_file, target_path, previous_name, habit_data)
+
+        # The check-off log is only compacted if the full check-off history was written. The files are
+        # replaced atomically, which modifies their directory, so the index is told about the writes.
+        index = get_index(self._tier_root(target_path))
+        with index.tracking_writes():
+            self._write_habit_files(target_path, habit_data)
+            if "check_off_history" in habit_data:
+                CheckoffLog(target_path).remove()
+        index.update(previous_name, habit_data, target_path)
+
+        if path_of_file == self.habit_file_path:
+            self.habit_file_path = target_path
+            self.loaded_name = habit_data["name"]
+            if "check_off_history" in habit_data:
+                self.pending_checkoffs = 0
+        return True
+
+
+    def add_checkoff(self, habit_data: dict, checkoff: str):
+        """This method appends a new check-off to the check-off log of a habit, so its cost does not
+        grow with the length of the history. Once enough check-offs have accumulated within the log,
+        they are compacted into the history file of the habit.
+
+        Args:
+            habit_data (dict): The updated habit data.
+            checkoff (str): The date and time of the check-off in ISO 8601 format.
+        """
+        path_of_file = self._habit_path(habit_data["name"])
+        if path_of_file is None:
+            return None
+        if path_of_file != self.habit_file_path:
+            self.habit_file_path = path_of_file
+            self.loaded_name = habit_data["name"]
+            self.pending_checkoffs = len(CheckoffLog(path_of_file).read())
+
+        position = len(habit_data["check_off_history"]) - 1
+        if self.history_encoding == "epoch":
+            checkoff = parse_checkoff(checkoff)
+            habit_data["check_off_history"][-1] = checkoff
+
+        # Creating the check-off log modifies the directory of the habit, so the index is told about the write.
+        with get_index(self._tier_root(path_of_file)).tracking_writes():
+            CheckoffLog(path_of_file).append(position, checkoff, habit_data["summary"])
+        self.pending_checkoffs += 1
+        habit_data["version"] = habit_data.get("version", 0) + 1
+
+        if self.pending_checkoffs >= COMPACTION_THRESHOLD:
+            self.update_habit(habit_data["name"], habit_data)
+        return None
+
+
+    def delete_habit(self, habit_name: str):
+        """This method deletes the habit file of a habit alongside its history file and check-off
+        log, and removes the habit from the index.
+
+        Args:
+            habit_name (str): The name of the habit to delete.
+        """
+        path_of_file = self._habit_path(habit_name)
+        if path_of_file is None:
+            return None
+
+        index = get_index(self._tier_root(path_of_file))
+        with index.tracking_writes():
+            os.remove(path_of_file)
+            get_cache().discard(path_of_file)
+            HistoryFile(path_of_file).remove()
+            CheckoffLog(path_of_file).remove()
+        index.remove(habit_name)
+        if path_of_file == self.habit_file_path:
+            self.habit_file_path = None
+            self.loaded_name = None
+        return None
+
+
+    def iter_habits(self, archived: bool = None, periodicity: str = None, include_history: bool = True):
+        """This method yields every habit that matches the given filters. Every JSON file within the
+        "Habits" directory (for unarchived habits) and the archive directory (for archived habits) is
+        loaded (alongside its check-off log) by "habit_loader.iter_habits()", in the order of their
+        file names, and filtered.
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+            periodicity (str, optional): Only yields habits with this periodicity. Defaults to None (all habits).
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Yields:
+            loaded_habit (dict): The habit data.
+        """
+
+        # Unarchived habits are stored within the "Habits" directory and archived habits within the
+        # archive directory, so only the directories that can contain matching habits are scanned.
+        # Habits found within the wrong directory (such as habits archived before the archive
+        # directory existed) are moved into the right one along the way.
+        moved_paths = set()
+        for directory, archived_tier in [("Habits", False), (ARCHIVE_DIRECTORY, True)]:
+            if ((archived is not None) and (archived != archived_tier)) or not os.path.isdir(directory):
+                continue
+
+            for path_of_file, loaded_habit in iter_habits(directory, include_history=include_history):
+                if path_of_file in moved_paths:
+                    continue
+
+                target_path = self._tier_path(path_of_file, loaded_habit.get("archived", False))
+                if target_path != path_of_file:
+                    self._move_habit(path_of_file, target_path, loaded_habit.get("name", ""), loaded_habit)
+                    moved_paths.add(target_path)
+
+                if (archived is not None) and (loaded_habit.get("archived", False) != archived):
+                    continue
+                if (periodicity is not None) and (loaded_habit.get("periodicity") != periodicity):
+                    continue
+
+                yield loaded_habit
+
+
+    def iter_summaries(self, archived: bool = None):
+        """This method yields the summary record of every habit. Should the process mode be enabled
+        (via "HABIT_TRACKER_PROCESS_WORKERS") and the store be large enough, the habit files are
+        summarised by a pool of processes (see "habit_loader.summarise_habits()"). Otherwise, the
+        habits are summarised one after the other.
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+
+        Yields:
+            habit_name (str): The name of the habit.
+            periodicity (str): The periodicity of the habit.
+            archived (bool): Whether the habit is archived.
+            summary (dict): The summary record of the habit.
+        """
+        # The same directories as within "iter_habits()" are summarised, so archived habits are included.
+        directories = [directory for directory, archived_tier in [("Habits", False), (ARCHIVE_DIRECTORY, True)]
+                       if ((archived is None) or (archived == archived_tier)) and os.path.isdir(directory)]
+        summaries = summarise_habits(directories, archived)
+        if summaries is not None:
+            yield from summaries
+            return
+        yield from super().iter_summaries(archived)
+
+
+    def archived_habit_names(self):
+        """This method lists the names of all archived habits from the index of the archive directory,
+        so no habit files are opened. Habits that were archived before the archive directory existed
+        are found via the archived status stored within the index of the "Habits" directory.
+
+        Returns:
+            habit_names (list): The names of all archived habits.
+        """
+        archived_entries = get_index(ARCHIVE_DIRECTORY).list_entries() + [entry for entry in get_index().list_entries() if entry.get("archived")]
+        return [entry["name"] for entry in archived_entries]
+
+
+    def reshard(self, layout: str):
+        """This method moves every habit file (alongside its history file and check-off log) within
+        the "Habits" directory and the archive directory into the given layout, one batch of files
+        at a time. The habit indexes are rebuilt afterwards, as the paths of the habit files changed.
+
+        Args:
+            layout (str): The layout to move the habit files into ("flat" or "sharded").
+
+        Returns:
+            moved_habits (int): The number of habits that were moved.
+        """
+
+        # The history file and check-off log of every habit are moved alongside its habit file.
+        def companion_paths(path_of_file):
+            return [HistoryFile(path_of_file).history_path, CheckoffLog(path_of_file).log_path]
+
+        moved_habits = 0
+        for directory in ("Habits", ARCHIVE_DIRECTORY):
+            moved_habits += reshard(directory, layout, companion_paths)
+            if os.path.isdir(directory):
+                get_index(directory).rebuild()
+        get_cache().clear()
+        self.habit_file_path = None
+        self.loaded_name = None
+        return moved_habits
+
+
+    def _habit_path(self, habit_name: str):
+        """This method returns the path of the habit file of a habit. The file loaded last is used
+        if it belongs to the habit, and otherwise the habit is looked up within the habit indexes.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            path_of_file (str): The path of the habit file, or None if the habit was not found.
+        """
+        if (self.habit_file_path is not None) and (HabitIndex.normalise_name(habit_name) == HabitIndex.normalise_name(self.loaded_name)):
+            return self.habit_file_path
+
+        for index in (get_index(), get_index(ARCHIVE_DIRECTORY)):
+            path_of_file = index.lookup(habit_name)
+            if path_of_file is not None:
+                return path_of_file
+        return None
+
+
+    def _tier_path(self, path_of_file: str, archived: bool):
+        """This method returns where the file of a habit belongs, which is the "Habits" directory
+        for unarchived habits and the archive directory (the cold tier) for archived habits.
+
+        Args:
+            path_of_file (str): The current path of the habit file.
+            archived (bool): Whether the habit is archived.
+
+        Returns:
+            target_path (str): The path the habit file belongs at.
+        """
+        return os.path.join(ARCHIVE_DIRECTORY if archived else "Habits", os.path.relpath(path_of_file, self._tier_root(path_of_file)))
+
+
+    def _tier_root(self, path_of_file: str):
+        """This method returns the directory of the tier a habit file is stored in, which is
+        the archive directory or the "Habits" directory, regardless of the layout.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+
+        Returns:
+            directory (str): The directory of the tier.
+        """
+        return ARCHIVE_DIRECTORY if path_of_file.startswith(ARCHIVE_DIRECTORY + os.sep) else "Habits"
+
+
+    def _move_habit(self, path_of_file: str, target_path: str, previous_name: str, loaded_habit: dict):
+        """This method moves the habit file of a habit, alongside its history file and check-off
+        log, into the other tier and moves its index entry into the index of that tier.
+
+        Args:
+            path_of_file (str): The current path of the habit file.
+            target_path (str): The path the habit file is moved to.
+            previous_name (str): The name the habit is indexed under.
+            loaded_habit (dict): The habit data.
+        """
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        for source_path, destination_path in [(path_of_file, target_path),
+                                              (HistoryFile(path_of_file).history_path, HistoryFile(target_path).history_path),
+                                              (CheckoffLog(path_of_file).log_path, CheckoffLog(target_path).log_path)]:
+            if os.path.exists(source_path):
+                os.replace(source_path, destination_path)
+            get_cache().discard(source_path)
+
+        get_index(self._tier_root(path_of_file)).remove(previous_name)
+        get_index(self._tier_root(target_path)).add(loaded_habit, target_path)
+
+
+    def _write_habit_files(self, path_of_file: str, loaded_habit: dict):
+        """This method writes a habit. The check-off history is written to the history file of the
+        habit, and everything else to the habit file itself. Should the habit data not contain a
+        check-off history (as it was loaded without one), only the habit file is written and the
+        history file is kept as it is.
+
+        Args:
+            path_of_file (str): The path of the habit file.
+            loaded_habit (dict): The habit data.
+        """
+        metadata, check_off_history = split_habit(self._encode_habit(loaded_habit))
+        if "check_off_history" in loaded_habit:
+            HistoryFile(path_of_file).write(check_off_history)
+        write_json(path_of_file, metadata, indent=4)
+        get_cache().discard(path_of_file)
+
+
+    def _encode_habit(self, loaded_habit: dict):
+        """This method prepares habit data for being written to a JSON habit file by
+        encoding its check-off history according to the selected history encoding.
+
+        Args:
+            loaded_habit (dict): The habit data.
+
+        Returns:
+            encoded_habit (dict): A copy of the habit data with the encoded check-off history.
+        """
+        encoded_habit = dict(loaded_habit)
+        encoded_habit["check_off_history"] = encode_history(loaded_habit.get("check_off_history", []), self.history_encoding)
+        return encoded_habit
@@ -1,8 +1,8 @@
-import questionary
 import json
+import sys
 from datetime import datetime, timezone
 from habits import Habits
-from analytics import Analytics
+from timestamp_codec import iso_history
 
 
 def cli():
@@ -12,6 +12,14 @@ def cli():
     the Habits class or the Analytics class.
     """
     
+    # The interactive menu is the only part of the program that needs "questionary", so it is
+    # imported here rather than at the top, which keeps the batch command line fast to start.
+    # The same applies to the "analytics" module and its presentation layer, which the batch
+    # command line only imports for the analytics commands.
+    import questionary
+    from analytics import Analytics
+    from analytics_output import print_result
+    
     exited_program = False
     while (exited_program == False):
         
@@ -110,10 +118,12 @@ def cli():
                 continue
             
             # Creates an instance of the Habits class with the habit name, then calls the load_habit_file method
-            # to load the habit data. If the habit data is found, it is printed in a formatted JSON style.
+            # to load the habit data. If the habit data is found, it is printed in a formatted JSON style,
+            # with the check-off history always shown as readable dates and times.
             view_habit = Habits(habit_name = habit_name)
             habit_data = view_habit.load_habit_file()
             if habit_data:
+                habit_data["check_off_history"] = iso_history(habit_data.get("check_off_history", []))
                 print("\nThe habit \"" + habit_name + "\" was found!\n\n"+ json.dumps(habit_data, indent=4))
                 print("\n")
             else:
@@ -233,7 +243,7 @@ def cli():
                                                                                                      "Show the longest streak across all habits", "Show the habit with the most check-offs",
                                                                                                      "Show the habit with the least check-offs", "Show the habits with the same periodicity",
                                                                                                      "Show all the check-offs of a habit within a range of time", "Show all archived habits",
-                                                                                                     "Exit habit selection"]).ask()
+                                                                                                     "Show a full report of all habits", "Exit habit selection"]).ask()
                 
                 if analytics_choice == "Show all habits":
                     
@@ -242,7 +252,7 @@ def cli():
                     # retrieves the names of the habits, and outputs them.
                     print("\nHere is a list of all your habits, both archived and unarchived:\n")
                     show_all_habits = Analytics()
-                    show_all_habits.show_all_habits()
+                    print_result(show_all_habits.show_all_habits())
                     print("\nAll habits shown!\n")
                     
                     
@@ -260,7 +270,7 @@ def cli():
                     # outputs the longest consecutive streak.
                     print("\n")
                     longest_streak_single_habit = Analytics(habit_name = habit_name)
-                    longest_streak_single_habit.get_longest_streak_single_habit()
+                    print_result(longest_streak_single_habit.get_longest_streak_single_habit())
                     print("\n")
                                             
                 
@@ -271,7 +281,7 @@ def cli():
                     # outputs the longest consecutive streak amongst all habits.
                     print("\nHere is all the longest streaks for all your habits:\n")
                     longest_streak_all_habits = Analytics()
-                    longest_streak_all_habits.get_longest_streak_all_habits()
+                    print_result(longest_streak_all_habits.get_longest_streak_all_habits())
                     
                     
                 elif analytics_choice == "Show the habit with the most check-offs":
@@ -281,7 +291,7 @@ def cli():
                     # the most entries for habit checkoffs. This is then displayed to the user.
                     print("\n")
                     most_checkoffs = Analytics()
-                    most_checkoffs.get_most_checkoff_history()
+                    print_result(most_checkoffs.get_most_checkoff_history())
                     print("\nHabit(s) shown!\n")
                     
                     
@@ -292,7 +302,7 @@ def cli():
                     # the least entries for habit checkoffs. This is then displayed to the user.
                     print("\n")
                     least_checkoffs = Analytics()
-                    least_checkoffs.get_least_checkoff_history()
+                    print_result(least_checkoffs.get_least_checkoff_history())
                     print("\nHabit(s) shown!\n")
                     
                     
@@ -310,7 +320,7 @@ def cli():
                     
                     print("\n")
                     same_periodicity = Analytics()
-                    same_periodicity.get_habits_with_same_periodicity(wanted_periodicity = habit_periodicity)
+                    print_result(same_periodicity.get_habits_with_same_periodicity(wanted_periodicity = habit_periodicity))
                     print("\n")
                     
                     
@@ -336,7 +346,7 @@ def cli():
                         
                     print("\n")
                     range_of_habit_checkoffs = Analytics(habit_name = habit_name)
-                    range_of_habit_checkoffs.get_history_of_checkoffs_time_range()
+                    print_result(range_of_habit_checkoffs.get_history_of_checkoffs_time_range())
                     print("\n")
                  
                     
@@ -348,7 +358,18 @@ def cli():
                     # to the user.
                     print("\n")
                     all_archived_habits = Analytics()
-                    all_archived_habits.get_archived_habits()
+                    print_result(all_archived_habits.get_archived_habits())
+                    print("\n")
+                    
+                    
+                elif analytics_choice == "Show a full report of all habits":
+                    
+                    # An instance of the Analytics class is created, from which the "full_report"
+                    # method originates. The function loads every habit only once and outputs the
+                    # results of all analytics covering every habit on a single screen.
+                    print("\n")
+                    report_of_all_habits = Analytics()
+                    print_result(report_of_all_habits.full_report())
                     print("\n")
                     
                     
@@ -405,7 +426,7 @@ def cli():
                                                                                                      "Show the longest streak across all habits", "Show the habit with the most check-offs",
                                                                                                      "Show the habit with the least check-offs", "Show the habits with the same periodicity",
                                                                                                      "Show all the check-offs of a habit within a range of time", "Show all archived habits",
-                                                                                                     "Exit analytics help"]).ask()
+                                                                                                     "Show a full report of all habits", "Exit analytics help"]).ask()
                     
                         if analytics_help_selection == "Show all habits":
                             questionary.press_any_key_to_continue("The option 'Show all habits' lists all the habits that you have created, including both archived and unarchived ones.").ask()
@@ -436,6 +457,10 @@ def cli():
                         elif analytics_help_selection == "Show all archived habits":
                             questionary.press_any_key_to_continue("The option 'Show all archived habits' lists all habits that are currently archived.").ask()
                             questionary.press_any_key_to_continue("It is the only way to view the names of archived habits, meaning that if you wish to unarchive a habit but forgot its name, you will need to use this functionality.")
+                        
+                        elif analytics_help_selection == "Show a full report of all habits":
+                            questionary.press_any_key_to_continue("The option 'Show a full report of all habits' shows all your habits, your daily and weekly habits, your archived habits, the longest streak across all habits and the habits with the most and least check-offs at once.").ask()
+                            questionary.press_any_key_to_continue("As every habit is only loaded once, this is the quickest way to view all of these analytics together.").ask()
                     
                         elif analytics_help_selection == "Exit analytics help":
                             analytics_help_exit = True
@@ -466,12 +491,30 @@ def cli():
         
 
 # This section runs on program startup. An instance of the
-# Habits class is made, predefined habits are created (if
-# they do not already exist), and all habits that have not
-# been checked-off within their periodicity are set to false.
+# Habits class is made and predefined habits are created the first
+# time the program runs. Afterwards, only the seeding marker is checked,
+# so no habit files are touched at startup. Running "py main.py seed"
+# creates the predefined habits again (if they do not already exist).
+# Whether a habit has been checked-off within its periodicity is derived
+# whenever it is loaded, so no habits need to be reset at startup either.
 if __name__ == "__main__":
-    bootup_habit_functions = Habits()
-    bootup_habit_functions.create_predefined_habits()
-    bootup_habit_functions.setcheckoff_to_false()
+    
+    # Any command-line arguments are handled by the non-interactive batch command line
+    # (for example, "py main.py checkoff reading"), which never opens the menu.
+    # The only exception is "--stats" on its own, which opens the menu and prints the
+    # I/O and parse counters of the whole session once the program is exited.
+    if sys.argv[1:] == ["--stats"]:
+        from instrumentation import OperationStats
+        with OperationStats() as stats:
+            Habits().seed_predefined_habits()
+            cli()
+        print(stats.report())
+        sys.exit(0)
+    
+    if sys.argv[1:]:
+        import batch_cli
+        sys.exit(batch_cli.main(sys.argv[1:]))
+    
+    Habits().seed_predefined_habits()
     
     cli()
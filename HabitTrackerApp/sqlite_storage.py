@@ -0,0 +1,287 @@
+import json
+import os
+import sqlite3
+from itertools import groupby
+from habit_storage import HabitStorage
+
+
+# The name of the SQLite database file, which is stored inside the "Habits" directory.
+DATABASE_FILENAME = "habits.sqlite3"
+
+
+class SQLiteStorage(HabitStorage):
+
+    def __init__(self, database_path: str = os.path.join("Habits", DATABASE_FILENAME)):
+        """This is the constructor for the SQLiteStorage class. The database
+        (and the folder it is stored in) is created if it does not already exist,
+        alongside the habits table, the check-offs table and their indexes.
+
+        Args:
+            database_path (str, optional): The path of the SQLite database file.
+            Defaults to "Habits/habits.sqlite3".
+        """
+        self.database_path = database_path
+
+        database_folder = os.path.dirname(database_path)
+        if database_folder:
+            os.makedirs(database_folder, exist_ok=True)
+
+        self.connection = sqlite3.connect(database_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.create_tables()
+
+
+    def create_tables(self):
+        """This method creates the habits and check-offs tables if they do not exist.
+        Habits are indexed on their normalised name, periodicity and archived status,
+        and check-offs are indexed on their timestamp, both per habit and overall.
+        The summary record of every habit is stored as JSON within the habits table.
+        """
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS habits (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    normalised_name TEXT NOT NULL UNIQUE,
+                    description TEXT,
+                    periodicity TEXT NOT NULL,
+                    archived INTEGER NOT NULL DEFAULT 0,
+                    has_checked_off_today INTEGER NOT NULL DEFAULT 0,
+                    creation_date_time TEXT,
+                    summary TEXT
+                );
+                CREATE TABLE IF NOT EXISTS checkoffs (
+                    id INTEGER PRIMARY KEY,
+                    habit_id INTEGER NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+                    checked_off_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS habits_periodicity ON habits(periodicity);
+                CREATE INDEX IF NOT EXISTS habits_archived ON habits(archived);
+                CREATE INDEX IF NOT EXISTS checkoffs_habit_time ON checkoffs(habit_id, checked_off_at);
+                CREATE INDEX IF NOT EXISTS checkoffs_time ON checkoffs(checked_off_at);
+            """)
+
+            # Databases created before habit summaries were introduced receive the new column.
+            columns = [column[1] for column in self.connection.execute("PRAGMA table_info(habits)")]
+            if "summary" not in columns:
+                self.connection.execute("ALTER TABLE habits ADD COLUMN summary TEXT")
+
+
+    @staticmethod
+    def normalise_name(habit_name: str):
+        """This method converts a habit name into the value stored within the
+        "normalised_name" column, which matches how the Habits class compares names.
+
+        Args:
+            habit_name (str): The name of the habit to normalise.
+
+        Returns:
+            normalised_name (str): The normalised name of the habit.
+        """
+        return habit_name.lower().replace("_", " ")
+
+
+    def create_habit(self, habit_data: dict):
+        """This method inserts a new habit and its check-off history.
+
+        Args:
+            habit_data (dict): The habit data in the same format as the JSON habit files.
+
+        Returns:
+            is_created (bool): True if the habit was created, or None if a habit with the same name already exists.
+        """
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    "INSERT INTO habits (name, normalised_name, description, periodicity, archived, "
+                    "has_checked_off_today, creation_date_time, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (habit_data["name"], self.normalise_name(habit_data["name"]), habit_data.get("description"),
+                     habit_data.get("periodicity"), int(habit_data.get("archived", False)),
+                     int(habit_data.get("has_checked_off_today", False)), habit_data.get("creation_date_time"),
+                     self._dump_summary(habit_data)))
+                self.connection.executemany(
+                    "INSERT INTO checkoffs (habit_id, checked_off_at) VALUES (?, ?)",
+                    [(cursor.lastrowid, checkoff) for checkoff in habit_data.get("check_off_history", [])])
+        except sqlite3.IntegrityError:
+            return None
+        return True
+
+
+    def load_habit(self, habit_name: str, include_history: bool = True):
+        """This method loads a habit by name, including its check-off history unless it is not needed.
+
+        Args:
+            habit_name (str): The name of the habit to load.
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Returns:
+            loaded_habit (dict): The habit data in the same format as the JSON habit files,
+            or None if the habit was not found.
+        """
+        row = self.connection.execute(
+            "SELECT id, name, description, periodicity, archived, has_checked_off_today, creation_date_time, summary "
+            "FROM habits WHERE normalised_name = ?", (self.normalise_name(habit_name),)).fetchone()
+        if row is None:
+            return None
+        if not include_history:
+            return self._row_to_habit(row, None)
+
+        checkoffs = self.connection.execute(
+            "SELECT checked_off_at FROM checkoffs WHERE habit_id = ? ORDER BY id", (row[0],)).fetchall()
+        return self._row_to_habit(row, [checkoff[0] for checkoff in checkoffs])
+
+
+    def update_habit(self, previous_name: str, habit_data: dict):
+        """This method updates the name, description, periodicity, archived status,
+        checked-off status and summary record of a habit. The check-off history is left
+        untouched, as new check-offs are recorded separately via "add_checkoff()". Renaming a habit
+        to the name of another habit violates the unique name of the habits and changes nothing.
+
+        Args:
+            previous_name (str): The name the habit was stored under before the change.
+            habit_data (dict): The updated habit data.
+
+        Returns:
+            is_updated (bool): True if the habit was saved, False if another habit already has its new name,
+            or None if the habit was not found.
+        """
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    "UPDATE habits SET name = ?, normalised_name = ?, description = ?, periodicity = ?, "
+                    "archived = ?, has_checked_off_today = ?, summary = COALESCE(?, summary) WHERE normalised_name = ?",
+                    (habit_data["name"], self.normalise_name(habit_data["name"]), habit_data.get("description"),
+                     habit_data.get("periodicity"), int(habit_data.get("archived", False)),
+                     int(habit_data.get("has_checked_off_today", False)), self._dump_summary(habit_data),
+                     self.normalise_name(previous_name)))
+        except sqlite3.IntegrityError:
+            return False
+        return True if cursor.rowcount > 0 else None
+
+
+    def add_checkoff(self, habit_data: dict, checkoff: str):
+        """This method records a single check-off for a habit without rewriting its history.
+        The summary record and checked-off status of the habit are taken from the habit data.
+
+        Args:
+            habit_data (dict): The habit data, including the summary record with this check-off.
+            checkoff (str): The date and time of the check-off in ISO 8601 format.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO checkoffs (habit_id, checked_off_at) "
+                "SELECT id, ? FROM habits WHERE normalised_name = ?", (checkoff, self.normalise_name(habit_data["name"])))
+            self.connection.execute(
+                "UPDATE habits SET has_checked_off_today = ?, summary = COALESCE(?, summary) WHERE normalised_name = ?",
+                (int(habit_data.get("has_checked_off_today", True)), self._dump_summary(habit_data), self.normalise_name(habit_data["name"])))
+
+
+    def delete_habit(self, habit_name: str):
+        """This method deletes a habit alongside its check-off history.
+
+        Args:
+            habit_name (str): The name of the habit to delete.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM habits WHERE normalised_name = ?", (self.normalise_name(habit_name),))
+
+
+    def iter_habits(self, archived: bool = None, periodicity: str = None, include_history: bool = True):
+        """This method yields all habits matching the given filters. The filters are
+        applied by the database via the periodicity and archived indexes, and all
+        check-off histories are fetched with a single ordered query.
+
+        Args:
+            archived (bool, optional): Only yields habits with this archived status. Defaults to None (all habits).
+            periodicity (str, optional): Only yields habits with this periodicity. Defaults to None (all habits).
+            include_history (bool, optional): Whether the check-off history is loaded. Defaults to True.
+
+        Yields:
+            loaded_habit (dict): The habit data in the same format as the JSON habit files.
+        """
+        conditions = []
+        parameters = []
+        if archived is not None:
+            conditions.append("archived = ?")
+            parameters.append(int(archived))
+        if periodicity is not None:
+            conditions.append("periodicity = ?")
+            parameters.append(periodicity)
+        where_clause = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+
+        rows = self.connection.execute(
+            "SELECT id, name, description, periodicity, archived, has_checked_off_today, creation_date_time, summary "
+            "FROM habits" + where_clause + " ORDER BY id", parameters).fetchall()
+
+        if not include_history:
+            for row in rows:
+                yield self._row_to_habit(row, None)
+            return
+
+        # The check-offs of all matching habits are read in one pass, ordered by habit,
+        # then grouped so that each habit receives its own history.
+        checkoffs = self.connection.execute(
+            "SELECT habit_id, checked_off_at FROM checkoffs WHERE habit_id IN "
+            "(SELECT id FROM habits" + where_clause + ") ORDER BY habit_id, id", parameters)
+        histories = {habit_id: [checkoff[1] for checkoff in group] for habit_id, group in groupby(checkoffs, key=lambda checkoff: checkoff[0])}
+
+        for row in rows:
+            yield self._row_to_habit(row, histories.get(row[0], []))
+
+
+    def _row_to_habit(self, row: tuple, check_off_history: list):
+        """This method converts a row of the habits table into the JSON habit format.
+
+        Args:
+            row (tuple): The row selected from the habits table.
+            check_off_history (list): The check-off history of the habit, or None to leave it out.
+
+        Returns:
+            loaded_habit (dict): The habit data in the same format as the JSON habit files.
+        """
+        loaded_habit = {
+            "name": row[1],
+            "description": row[2],
+            "periodicity": row[3],
+            "archived": bool(row[4]),
+            "has_checked_off_today": bool(row[5]),
+            "creation_date_time": row[6],
+        }
+        if row[7] is not None:
+            loaded_habit["summary"] = json.loads(row[7])
+        if check_off_history is not None:
+            loaded_habit["check_off_history"] = check_off_history
+        return loaded_habit
+
+
+    def _dump_summary(self, habit_data: dict):
+        """This method converts the summary record of a habit into the JSON stored within the database.
+
+        Args:
+            habit_data (dict): The habit data.
+
+        Returns:
+            summary (str): The summary record as JSON, or None if the habit has no summary.
+        """
+        if habit_data.get("summary") is None:
+            return None
+        return json.dumps(habit_data["summary"])
+
+
+# Storages are shared per database so that a running program only opens one connection.
+_shared_storages = {}
+
+
+def get_storage(database_path: str = os.path.join("Habits", DATABASE_FILENAME)):
+    """This function returns the shared SQLiteStorage for a database, creating it if necessary.
+
+    Args:
+        database_path (str, optional): The path of the SQLite database file. Defaults to "Habits/habits.sqlite3".
+
+    Returns:
+        storage (SQLiteStorage): The storage of the database.
+    """
+    if database_path not in _shared_storages:
+        _shared_storages[database_path] = SQLiteStorage(database_path)
+    return _shared_storages[database_path]
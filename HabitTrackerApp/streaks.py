@@ -0,0 +1,197 @@
+from collections import namedtuple
+from timestamp_codec import day_numbers, format_checkoff, parse_checkoff, today_day_number, SECONDS_PER_DAY
+
+
+# The range of days (inclusive) that may lie between two consecutive check-offs for the
+# streak to continue. Daily habits must be checked-off on consecutive days, while weekly
+# habits must be checked-off again between 7 and 13 days later. Habits with an unknown
+# periodicity never continue a streak.
+STREAK_GAPS = {
+    "daily": (1, 1),
+    "weekly": (7, 13),
+}
+
+
+def period_key(day: int, periodicity: str):
+    """This function returns the period that a day falls into. For daily habits, this is the
+    day itself, while for weekly habits, it is the day number of the Monday starting the week.
+    Since 1970-01-01 was a Thursday, the Monday of a week lies "(day + 3) % 7" days earlier.
+
+    Args:
+        day (int): The day number (days since 1970-01-01).
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+
+    Returns:
+        period_key (int): The day number identifying the period.
+    """
+    if periodicity == "weekly":
+        return day - (day + 3) % 7
+    return day
+
+
+# The streaks found within the check-off history of a single habit:
+# - longest_streak (int): The longest number of consecutive check-offs.
+# - current_streak (int): The number of consecutive check-offs up to the latest check-off,
+#   or 0 if the streak has already been broken as of "today."
+# - streak_count (int): The number of streaks, i.e. runs of at least two consecutive check-offs.
+# A plain named tuple is used rather than "typing.NamedTuple" to keep the start-up time low.
+StreakResult = namedtuple("StreakResult", ["longest_streak", "current_streak", "streak_count"])
+
+
+def calculate_streaks(check_off_days, periodicity: str, today: int = None):
+    """This function calculates the longest streak, the current streak and the number
+    of streaks of a habit in a single pass over the day numbers of its check-offs.
+    No datetime objects are created, as only the difference between consecutive day
+    numbers is needed.
+
+    Args:
+        check_off_days (iterable): The day numbers (days since 1970-01-01 in UTC) of the check-offs,
+        in chronological order.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+        today (int, optional): The day number of today. If given, a current streak whose next
+        check-off is already overdue is reported as 0. Defaults to None.
+
+    Returns:
+        streaks (StreakResult): The streaks found within the check-off history.
+    """
+
+    shortest_gap, longest_gap = STREAK_GAPS.get(periodicity, (1, 0))
+    longest_streak = 0
+    streak_counter = 0
+    streak_count = 0
+    previous_day = None
+
+    # For every check-off, the difference in days to the previous check-off decides whether the
+    # streak continues or starts again at 1. A streak is counted once it reaches two check-offs.
+    for day in check_off_days:
+        if (previous_day is not None) and (shortest_gap <= day - previous_day <= longest_gap):
+            streak_counter += 1
+            if streak_counter == 2:
+                streak_count += 1
+        else:
+            streak_counter = 1
+
+        if streak_counter > longest_streak:
+            longest_streak = streak_counter
+        previous_day = day
+
+    # The streak up to the latest check-off is only current if it can still be continued.
+    current_streak = streak_counter
+    if (today is not None) and (previous_day is not None) and (today - previous_day > longest_gap):
+        current_streak = 0
+
+    return StreakResult(longest_streak, current_streak, streak_count)
+
+
+def calculate_history_streaks(check_off_history: list, periodicity: str, today: int = None):
+    """This function calculates the streaks of a check-off history as stored within a habit,
+    i.e. as ISO 8601 strings or epoch seconds.
+
+    Args:
+        check_off_history (list): The check-offs of the habit, in chronological order.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+        today (int, optional): The day number of today. Defaults to None.
+
+    Returns:
+        streaks (StreakResult): The streaks found within the check-off history.
+    """
+    return calculate_streaks(day_numbers(check_off_history), periodicity, today)
+
+
+def summarise_history(check_off_history: list, periodicity: str):
+    """This function creates the summary record of a habit from its full check-off history.
+    It is used when a habit is written in full and to repair summaries that drifted.
+
+    Args:
+        check_off_history (list): The check-offs of the habit, in chronological order.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+
+    Returns:
+        summary (dict): The total number of check-offs, the current and longest streak, and the
+        first and last check-off (as ISO 8601 strings, or None without any check-offs). The current
+        streak is the streak up to the last check-off, so it can be extended by "extend_summary()";
+        "current_streak()" tells whether it is still current as of today.
+    """
+    streaks = calculate_history_streaks(check_off_history, periodicity)
+    return {
+        "total_count": len(check_off_history),
+        "current_streak": streaks.current_streak,
+        "longest_streak": streaks.longest_streak,
+        "first_checkoff": format_checkoff(check_off_history[0]) if check_off_history else None,
+        "last_checkoff": format_checkoff(check_off_history[-1]) if check_off_history else None,
+    }
+
+
+def habit_summary(loaded_habit: dict):
+    """This function returns the summary record of a habit. Should the summary be missing,
+    or should it not match the number of check-offs within the history (for example,
+    because the habit file was edited by hand), it is recalculated from the history.
+
+    Args:
+        loaded_habit (dict): The habit data.
+
+    Returns:
+        summary (dict): The summary record of the habit.
+    """
+    summary = loaded_habit.get("summary")
+    check_off_history = loaded_habit.get("check_off_history")
+
+    if (summary is None) or ((check_off_history is not None) and (summary["total_count"] != len(check_off_history))):
+        summary = summarise_history(check_off_history or [], loaded_habit.get("periodicity"))
+    return summary
+
+
+def extend_summary(summary: dict, checkoff, periodicity: str):
+    """This function updates the summary record of a habit with a single new check-off
+    in constant time, applying the same rule as "calculate_streaks()" to the gap between
+    the new check-off and the previous last check-off.
+
+    Args:
+        summary (dict): The summary record before the check-off.
+        checkoff (int | str): The new check-off as epoch seconds or as an ISO 8601 string.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+
+    Returns:
+        summary (dict): A new summary record that includes the check-off.
+    """
+    shortest_gap, longest_gap = STREAK_GAPS.get(periodicity, (1, 0))
+    formatted_checkoff = format_checkoff(checkoff)
+    new_summary = dict(summary)
+
+    if summary["total_count"] == 0:
+        new_summary["first_checkoff"] = formatted_checkoff
+        new_summary["current_streak"] = 1
+    else:
+        difference_in_days = parse_checkoff(checkoff) // SECONDS_PER_DAY - parse_checkoff(summary["last_checkoff"]) // SECONDS_PER_DAY
+        if shortest_gap <= difference_in_days <= longest_gap:
+            new_summary["current_streak"] = summary["current_streak"] + 1
+        else:
+            new_summary["current_streak"] = 1
+
+    new_summary["total_count"] = summary["total_count"] + 1
+    new_summary["longest_streak"] = max(summary["longest_streak"], new_summary["current_streak"])
+    new_summary["last_checkoff"] = formatted_checkoff
+    return new_summary
+
+
+def current_streak(summary: dict, periodicity: str, today: int = None):
+    """This function returns the current streak of a habit from its summary record. The summary
+    stores the streak up to the last check-off, which is only current if the next check-off is
+    not yet overdue, applying the same rule as "calculate_streaks()".
+
+    Args:
+        summary (dict): The summary record of the habit.
+        periodicity (str): The periodicity of the habit ("daily" or "weekly").
+        today (int, optional): The day number of today. Defaults to None (today's date).
+
+    Returns:
+        current_streak (int): The current streak, or 0 if it has already been broken.
+    """
+    if summary.get("last_checkoff") is None:
+        return 0
+
+    longest_gap = STREAK_GAPS.get(periodicity, (1, 0))[1]
+    today = today_day_number() if today is None else today
+    if today - parse_checkoff(summary["last_checkoff"]) // SECONDS_PER_DAY > longest_gap:
+        return 0
+    return summary["current_streak"]
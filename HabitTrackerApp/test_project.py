@@ -1,6 +1,68 @@
-from habits import Habits
+from habits import Habits, SEED_MARKER, ARCHIVE_DIRECTORY
 from analytics import Analytics
+from habit_index import get_index, INDEX_FILENAME
+from checkoff_log import CheckoffLog, COMPACTION_THRESHOLD
+from timestamp_codec import epoch_array, iso_history, parse_checkoff, today_day_number, checkoffs_in_range, count_checkoffs_in_range, SECONDS_PER_DAY
+from streaks import calculate_streaks, current_streak, summarise_history, period_key, StreakResult
+from datetime import datetime, timezone
+import batch_cli
+import habit_loader
+from habit_layout import layout_path
+from habit_lock import HabitLock, LOCK_DIRECTORY
+from habit_cache import HabitCache, get_cache
+from habit_storage import HabitStorage, MemoryStorage
+from json_storage import JSONStorage
+from benchmarks.store_generator import generate_store
+import analytics_output
+from instrumentation import OperationStats, write_json
+import atomic_write
+import contextlib
+import io
+import json
+import multiprocessing
 import os
+import shutil
+import pytest
+
+
+def hammer_checkoffs(directory: str, habit_name: str, checkoff_count: int, concurrency: str = "locking"):
+    """This function checks-off a habit many times within a separate process, for the stress test
+    of the habit locks. The habit is never treated as checked-off within the current period, so
+    every call records a new check-off.
+
+    Args:
+        directory (str): The directory containing the "Habits" directory.
+        habit_name (str): The name of the habit to check-off.
+        checkoff_count (int): The number of check-offs to record.
+        concurrency (str, optional): The concurrency mode of the process. Defaults to "locking".
+    """
+    def never_checked_off(self, loaded_habit):
+        loaded_habit["has_checked_off_today"] = False
+        return False
+    
+    os.chdir(directory)
+    Habits._refresh_checked_off = never_checked_off
+    Habits.concurrency = concurrency
+    with contextlib.redirect_stdout(io.StringIO()):
+        for checkoff in range(checkoff_count):
+            assert (Habits(habit_name = habit_name).checkoff_habit(confirmed = True) == True)
+
+
+def create_habits(directory: str, process_number: int, habit_count: int):
+    """This function creates many habits within a separate process, for the stress test of the
+    habit index, which every process updates alongside the others.
+
+    Args:
+        directory (str): The directory containing the "Habits" directory.
+        process_number (int): The number of the process, which makes the habit names unique.
+        habit_count (int): The number of habits to create.
+    """
+    os.chdir(directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for habit_number in range(habit_count):
+            habit_data = {"name": "Habit " + str(process_number) + "-" + str(habit_number), "description": "Created alongside other processes.", "periodicity": "daily",
+                          "archived": False, "has_checked_off_today": False, "creation_date_time": "2024-01-01T08:00:00Z", "check_off_history": []}
+            assert (Habits(habit_data = habit_data).create_habit_file() == True)
 
 
 class TestProject:
@@ -96,7 +158,7 @@ class TestProject:
         # "Go to the gym" is, but also verifies that it is a streak of 19 days;
         # the expected streak length.
         longest_gym_streak = test_analytics.get_longest_streak_single_habit()
-        assert (longest_gym_streak == 19)
+        assert (longest_gym_streak.longest_streak == 19)
         
         test_analytics.get_longest_streak_all_habits()
         
@@ -104,13 +166,13 @@ class TestProject:
         # verified whether the answer correlates to the expected outcome,
         # "Message a friend"
         most_checkoff_history = test_analytics.get_most_checkoff_history()
-        assert (most_checkoff_history == "Message a friend")
+        assert (most_checkoff_history.habit_names == ["Message a friend"])
         
         # This method checks which habit has the least checkoffs. It is then
         # verified whether the answer correlates to the expected outcome,
         # "Clean the house"
         least_checkoff_history = test_analytics.get_least_checkoff_history()
-        assert(least_checkoff_history == "Clean the house")
+        assert(least_checkoff_history.habit_names == ["Clean the house"])
         
         test_analytics.get_habits_with_same_periodicity("daily")
         
@@ -119,6 +181,859 @@ class TestProject:
         test_analytics.get_archived_habits()
         
         
+    def test_habit_index(self):
+        """This method tests whether the habit index finds habit files without
+        scanning the "Habits" directory, and whether it is rebuilt when missing.
+        """
+        
+        # The index should point directly to the file of a predefined habit.
+        assert (get_index().lookup("Go to the gym") == os.path.join("Habits", "go_to_the_gym.json"))
+        assert (get_index().lookup("Not a real habit") == None)
+        
+        # Should the index file be deleted, it is rebuilt on the next lookup.
+        os.remove(os.path.join("Habits", INDEX_FILENAME))
+        loaded_output = Habits(habit_name = "Do the laundry").load_habit_file()
+        assert (loaded_output["name"] == "Do the laundry")
+        assert (os.path.exists(os.path.join("Habits", INDEX_FILENAME)))
+        
+        # Check-offs are recorded within a check-off log next to the habit file (and the first check-off
+        # creates the lock directory), neither of which makes the index stale, so creating a habit
+        # afterwards opens no other habit files.
+        shutil.rmtree(LOCK_DIRECTORY, ignore_errors = True)
+        get_index().rebuild()
+        assert (Habits(habit_name = "Go to the gym").checkoff_habit(confirmed = True) == True)
+        index_data = {"name": "Testing index", "description": "", "periodicity": "daily", "archived": False,
+                      "has_checked_off_today": False, "creation_date_time": "2025-03-30T15:23:11Z", "check_off_history": []}
+        get_cache().clear()
+        try:
+            with OperationStats() as stats:
+                assert (Habits(habit_data = index_data, habit_name = "Testing index").create_habit_file() == True)
+            assert (stats.counters["json_loads"] == 0)
+        finally:
+            Habits(habit_name = "Testing index").delete_habit_file()
+            CheckoffLog(os.path.join("Habits", "go_to_the_gym.json")).remove()
+        
+        
+    def test_sqlite_storage(self):
+        """This method tests whether the Habits and Analytics classes behave the same
+        when the SQLite storage mode is selected instead of the JSON files.
+        """
+        
+        predefined_habit_names = ["Message a friend", "Go to the gym", "Do the laundry", "Clean the house", "Writing in a journal"]
+        Habits.storage_mode = "sqlite"
+        
+        try:
+            Habits().create_predefined_habits()
+            
+            # The same analytics as with the JSON files are expected.
+            assert (Analytics(habit_name = "Go to the gym").get_longest_streak_single_habit().longest_streak == 19)
+            assert (Analytics().get_most_checkoff_history().habit_names == ["Message a friend"])
+            assert (Analytics().get_least_checkoff_history().habit_names == ["Clean the house"])
+            
+            # Archiving a habit should be persisted within the database.
+            Habits(habit_name = "Go to the gym").archive_habit()
+            assert (Habits(habit_name = "Go to the gym").load_habit_file()["archived"] == True)
+            
+        finally:
+            for habit_name in predefined_habit_names:
+                Habits(habit_name = habit_name).delete_habit_file()
+            Habits.storage_mode = "json"
+        
+        
+    def test_checkoff_log(self):
+        """This method tests whether check-offs are appended to the check-off log of a
+        habit instead of rewriting its JSON file, and whether the log is compacted.
+        """
+        
+        test_data = {
+            "name": "Testing log",
+            "description": "Lorem ipsum dolor sit amet",
+            "periodicity": "daily",
+            "archived": False,
+            "has_checked_off_today": False,
+            "creation_date_time": "2025-03-30T15:23:11Z",
+            "check_off_history": ["2025-03-30T15:24:42Z"]
+        }
+        Habits(habit_data = test_data).create_habit_file()
+        
+        try:
+            # A check-off should leave the habit file untouched and only append to the log.
+            test_habit = Habits(habit_name = "Testing log")
+            loaded_output = test_habit.load_habit_file()
+            with open(test_habit.habit_file_path, mode="r", encoding="utf-8") as read_file:
+                file_before_checkoff = read_file.read()
+            
+            test_habit._record_checkoff(loaded_output, "2025-03-31T10:00:00Z")
+            
+            with open(test_habit.habit_file_path, mode="r", encoding="utf-8") as read_file:
+                assert (read_file.read() == file_before_checkoff)
+            assert (len(CheckoffLog(test_habit.habit_file_path).read()) == 1)
+            
+            # Loading the habit again should include the logged check-off.
+            loaded_output = Habits(habit_name = "Testing log").load_habit_file()
+            assert (loaded_output["check_off_history"] == ["2025-03-30T15:24:42Z", "2025-03-31T10:00:00Z"])
+            
+            # Once the compaction threshold is reached, the log is folded into the habit file.
+            test_habit = Habits(habit_name = "Testing log")
+            loaded_output = test_habit.load_habit_file()
+            for day in range(COMPACTION_THRESHOLD - 1):
+                test_habit._record_checkoff(loaded_output, "2025-04-01T10:00:00Z")
+            assert (CheckoffLog(test_habit.habit_file_path).read() == [])
+            assert (len(Habits(habit_name = "Testing log").load_habit_file()["check_off_history"]) == COMPACTION_THRESHOLD + 1)
+            
+        finally:
+            Habits(habit_name = "Testing log").delete_habit_file()
+        
+        
+    def test_epoch_history_encoding(self):
+        """This method tests whether check-offs can be stored as epoch seconds and
+        converted back into the legacy ISO 8601 format without losing information.
+        """
+        
+        legacy_history = ["2025-03-30T15:24:42Z", "2025-03-31T00:00:00Z", "2024-02-29T23:59:59Z"]
+        assert (iso_history(epoch_array(legacy_history)) == legacy_history)
+        assert (parse_checkoff("2025-03-30T15:24:42Z") == parse_checkoff("2025-03-30T17:24:42+02:00"))
+        
+        test_data = {
+            "name": "Testing encoding",
+            "description": "Lorem ipsum dolor sit amet",
+            "periodicity": "daily",
+            "archived": False,
+            "has_checked_off_today": False,
+            "creation_date_time": "2025-03-30T15:23:11Z",
+            "check_off_history": ["2025-03-30T15:24:42Z", "2025-03-31T10:00:00Z", "2025-04-01T09:00:00Z"]
+        }
+        Habits.history_encoding = "epoch"
+        
+        try:
+            # The habit file should store integers, while the streak stays the same.
+            Habits(habit_data = test_data).create_habit_file()
+            loaded_output = Habits(habit_name = "Testing encoding").load_habit_file()
+            assert (loaded_output["check_off_history"] == list(epoch_array(test_data["check_off_history"])))
+            assert (Analytics(habit_name = "Testing encoding").get_longest_streak_single_habit().longest_streak == 3)
+            
+        finally:
+            Habits.history_encoding = "iso"
+            Habits(habit_name = "Testing encoding").delete_habit_file()
+        
+        
+    def test_streak_engine(self):
+        """This method tests the streak engine on its own, including the current
+        streak and the number of streaks, with day numbers as its input.
+        """
+        
+        # Daily habit: a streak of 3, a gap, then a streak of 2 that is still current.
+        daily_streaks = calculate_streaks([100, 101, 102, 105, 106], "daily", today = 107)
+        assert (daily_streaks == StreakResult(longest_streak = 3, current_streak = 2, streak_count = 2))
+        
+        # The current streak is broken once the next check-off is overdue.
+        assert (calculate_streaks([100, 101, 102, 105, 106], "daily", today = 108).current_streak == 0)
+        
+        # Weekly habit: gaps between 7 and 13 days continue the streak.
+        assert (calculate_streaks([100, 107, 120, 140], "weekly").longest_streak == 3)
+        assert (calculate_streaks([], "daily") == StreakResult(0, 0, 0))
+        
+        # The summary record stores the streak up to the last check-off, which is compared with today when read.
+        summary = summarise_history([105 * SECONDS_PER_DAY, 106 * SECONDS_PER_DAY], "daily")
+        assert (summary["current_streak"] == 2)
+        assert (current_streak(summary, "daily", today = 107) == 2)
+        assert (current_streak(summary, "daily", today = 108) == 0)
+        assert (current_streak(summarise_history([], "weekly"), "weekly") == 0)
+        
+        # The statistics of a habit that has not been checked-off for a long time show no current streak.
+        laundry_statistics = [statistics for statistics in Analytics().get_habit_statistics() if statistics.name == "Do the laundry"][0]
+        assert (laundry_statistics.current_streak == 0)
+        assert ("current streak 0 weeks" in analytics_output.format_result(Analytics().get_habit_statistics()))
+        assert (analytics_output._streak_unit("daily", 1) == " day")
+        
+        
+    def test_habit_summary(self):
+        """This method tests whether the summary record of a habit is kept up to date by
+        check-offs, and whether drifted summaries are rebuilt from the check-off history.
+        """
+        
+        test_data = {
+            "name": "Testing summary",
+            "description": "Lorem ipsum dolor sit amet",
+            "periodicity": "daily",
+            "archived": False,
+            "has_checked_off_today": False,
+            "creation_date_time": "2025-03-30T15:23:11Z",
+            "check_off_history": ["2025-03-30T15:24:42Z", "2025-03-31T10:00:00Z"]
+        }
+        Habits(habit_data = test_data).create_habit_file()
+        
+        try:
+            # Each check-off extends the summary, which should match one calculated from the full history.
+            test_habit = Habits(habit_name = "Testing summary")
+            loaded_output = test_habit.load_habit_file()
+            test_habit._record_checkoff(loaded_output, "2025-04-01T08:00:00Z")
+            test_habit._record_checkoff(loaded_output, "2025-04-05T08:00:00Z")
+            
+            loaded_output = Habits(habit_name = "Testing summary").load_habit_file()
+            assert (loaded_output["summary"] == summarise_history(loaded_output["check_off_history"], "daily"))
+            assert (loaded_output["summary"]["longest_streak"] == 3)
+            assert (loaded_output["summary"]["current_streak"] == 1)
+            assert (loaded_output["summary"]["last_checkoff"] == "2025-04-05T08:00:00Z")
+            
+            # A summary that was changed by hand should be repaired.
+            test_habit = Habits(habit_name = "Testing summary")
+            loaded_output = test_habit.load_habit_file()
+            loaded_output["summary"]["longest_streak"] = 99
+            with open(test_habit.habit_file_path, mode="w", encoding="utf-8") as write_file:
+                json.dump(loaded_output, write_file, indent=4)
+            CheckoffLog(test_habit.habit_file_path).remove()
+            
+            assert (Habits().rebuild_summaries() >= 1)
+            assert (Habits(habit_name = "Testing summary").load_habit_file()["summary"]["longest_streak"] == 3)
+            
+        finally:
+            Habits(habit_name = "Testing summary").delete_habit_file()
+        
+        
+    def test_lazy_checkoff_rollover(self):
+        """This method tests whether "has_checked_off_today" is derived from the last
+        check-off when a habit is loaded, instead of relying on a sweep at startup.
+        """
+        
+        # The predefined habits were last checked-off in May 2025, so a stale cached value is ignored.
+        test_habit = Habits(habit_name = "Go to the gym")
+        loaded_output = test_habit.load_habit_file()
+        assert (loaded_output["has_checked_off_today"] == False)
+        
+        # Checking the habit off now marks it as checked-off for the current period.
+        current_datetime = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+        test_habit._record_checkoff(loaded_output, current_datetime)
+        try:
+            assert (Habits(habit_name = "Go to the gym").load_habit_file()["has_checked_off_today"] == True)
+        finally:
+            CheckoffLog(test_habit.habit_file_path).remove()
+        
+        # A check-off earlier within the same week still counts for weekly habits.
+        today = today_day_number()
+        assert (period_key(today, "weekly") == period_key(today - (today + 3) % 7, "weekly"))
+        assert (period_key(today - (today + 3) % 7 - 1, "weekly") < period_key(today, "weekly"))
+        
+        
+    def test_seed_predefined_habits(self):
+        """This method tests whether the predefined habits are only seeded once per
+        "Habits" directory, unless seeding is explicitly requested again.
+        """
+        
+        if os.path.exists(SEED_MARKER):
+            os.remove(SEED_MARKER)
+        
+        # The first call seeds the directory, while later calls only check the marker.
+        assert (Habits().seed_predefined_habits() == True)
+        assert (Habits().seed_predefined_habits() == False)
+        assert (Habits().seed_predefined_habits(force = True) == True)
+        assert (os.path.exists(SEED_MARKER))
+        
+        
+    def test_batch_cli(self, capsys):
+        """This method tests the non-interactive batch command line, which must work
+        without prompting the user and without importing "questionary".
+        """
+        
+        total_count = Habits(habit_name = "Go to the gym").load_habit_file()["summary"]["total_count"]
+        assert (batch_cli.main(["checkoff", "Go to the gym"]) == 0)
+        try:
+            # A second check-off within the same period is refused with a failing exit code.
+            assert (batch_cli.main(["checkoff", "Go to the gym"]) == 1)
+            assert (batch_cli.main(["checkoff", "Not a habit"]) == 1)
+            
+            capsys.readouterr()
+            assert (batch_cli.main(["stats", "--json"]) == 0)
+            habit_statistics = {statistics["name"]: statistics for statistics in json.loads(capsys.readouterr().out)}
+            assert (habit_statistics["Go to the gym"]["has_checked_off_today"] == True)
+            assert (habit_statistics["Go to the gym"]["total_count"] == total_count + 1)
+        finally:
+            CheckoffLog(os.path.join("Habits", "go_to_the_gym.json")).remove()
+        
+        assert (batch_cli.main(["list", "--periodicity", "weekly"]) == 0)
+        assert ("- Do the laundry" in capsys.readouterr().out)
+        
+        # Archiving, unarchiving and deleting also fail with an exit code if nothing was changed.
+        assert (batch_cli.main(["archive", "Do the laundry"]) == 0)
+        try:
+            assert (batch_cli.main(["archive", "Do the laundry"]) == 1)
+        finally:
+            assert (batch_cli.main(["unarchive", "Do the laundry"]) == 0)
+        assert (batch_cli.main(["unarchive", "Do the laundry"]) == 1)
+        for command in ["archive", "unarchive", "delete"]:
+            assert (batch_cli.main([command, "Not a habit"]) == 1)
+        
+        
+    def test_instrumentation_budget(self):
+        """This method tests the I/O and parse budgets of common operations using the
+        instrumentation counters, so that regressions in the number of files read are caught.
+        """
+        
+        # Loading a single habit parses exactly one habit file once the index is loaded.
+        Habits(habit_name = "Go to the gym").load_habit_file()
+        with OperationStats() as stats:
+            assert (Habits(habit_name = "Go to the gym").load_habit_file() != False)
+        assert (stats.counters["files_opened"] <= 1)
+        assert (stats.counters["json_loads"] <= 1)
+        assert (stats.counters["json_dumps"] == 0)
+        assert (stats.methods["Habits.load_habit_file"]["calls"] == 1)
+        
+        # The summary-based analytics never parse any check-offs.
+        with OperationStats() as stats:
+            Analytics().get_most_checkoff_history()
+        assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 5)
+        assert (stats.counters["datetime_parses"] == 0)
+        
+        # The history of a single habit is only decoded once for as long as it is unchanged, so
+        # calculating its streak again only parses its last check-off (to derive its checked-off status).
+        longest_streak = Analytics(habit_name = "Go to the gym").get_longest_streak_single_habit().longest_streak
+        with OperationStats() as streak_stats:
+            assert (Analytics(habit_name = "Go to the gym").get_longest_streak_single_habit().longest_streak == longest_streak)
+        assert (streak_stats.counters["datetime_parses"] <= 1)
+        
+        # Nothing is counted once the context manager has been exited.
+        Habits(habit_name = "Go to the gym").load_habit_file()
+        assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 5)
+        
+        
+    def test_full_report(self):
+        """This method tests whether the full report matches the individual analytics
+        while loading every habit only once.
+        """
+        
+        with OperationStats() as stats:
+            report = Analytics().full_report()
+        assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 5)
+        
+        assert (len(report.habits.habit_names) == 5)
+        assert ("Do the laundry" in report.habits_by_periodicity["weekly"].habit_names)
+        assert (report.archived_habits.habit_names == [])
+        assert (report.longest_streak == Analytics().get_longest_streak_all_habits())
+        assert (report.most_checkoffs == Analytics().get_most_checkoff_history())
+        assert (report.least_checkoffs == Analytics().get_least_checkoff_history())
+        
+        # The presentation layer prints the report on a single screen or converts it into JSON.
+        assert ("Most check-offs (29): Message a friend" in analytics_output.format_result(report))
+        assert (json.loads(analytics_output.to_json(report))["longest_streak"]["longest_streak"] == report.longest_streak.longest_streak)
+        
+        
+    def test_checkoffs_in_range(self):
+        """This method tests whether the binary search over check-off histories finds
+        the same check-offs as filtering the whole history, for closed and open ranges.
+        """
+        
+        check_off_history = Habits(habit_name = "Go to the gym").load_habit_file()["check_off_history"]
+        epochs = list(epoch_array(check_off_history))
+        start_epoch = epochs[3]
+        end_epoch = epochs[-4]
+        
+        # Both ISO 8601 and epoch histories are searched, with either bound left open.
+        for history in (check_off_history, epochs):
+            for start, end in ((start_epoch, end_epoch), (start_epoch, None), (None, end_epoch), (None, None), (end_epoch, start_epoch)):
+                expected = [epoch for epoch in epochs if (start is None or epoch >= start) and (end is None or epoch <= end)]
+                assert (list(epoch_array(checkoffs_in_range(history, start, end))) == expected)
+                assert (count_checkoffs_in_range(history, start, end) == len(expected))
+        
+        # Check-offs in other ISO 8601 variants are compared by their time, not as strings.
+        variant_history = ["2025-04-01T08:00:00Z", "2025-04-02T10:00:00+02:00", "2025-04-02T23:30:00-02:00", "2025-04-04T08:00:00.500Z"]
+        day_start = parse_checkoff("2025-04-02T00:00:00Z")
+        assert (checkoffs_in_range(variant_history, day_start, day_start + SECONDS_PER_DAY - 1) == variant_history[1:2])
+        assert (count_checkoffs_in_range(variant_history, parse_checkoff("2025-04-04T00:00:00Z")) == 1)
+        
+        # The analytic includes the whole end date and does not prompt for the dates.
+        start_date = datetime.fromtimestamp(start_epoch, timezone.utc).date().isoformat()
+        end_date = datetime.fromtimestamp(end_epoch, timezone.utc).date().isoformat()
+        result = Analytics(habit_name = "Go to the gym").get_checkoffs_in_range(start_date, end_date)
+        expected = [epoch for epoch in epochs if start_epoch - start_epoch % SECONDS_PER_DAY <= epoch < end_epoch - end_epoch % SECONDS_PER_DAY + SECONDS_PER_DAY]
+        assert (list(epoch_array(result.checkoffs)) == expected)
+        assert (result.check_off_count == len(expected))
+        
+        counted = Analytics(habit_name = "Go to the gym").get_checkoffs_in_range(start_date = start_date, count_only = True)
+        assert (counted.checkoffs is None)
+        assert (counted.check_off_count == len(epochs) - 3)
+        assert ("checked-off " + str(len(epochs) - 3) + " time(s) since " + start_date in analytics_output.format_result(counted))
+        
+        
+    def test_checkoffs_across_habits(self, tmp_path, monkeypatch):
+        """This method tests whether the check-offs of all habits are merged into chronological
+        order (with the history of every habit loaded only once), and whether they can be
+        streamed into a CSV file.
+        """
+        
+        expected = []
+        for loaded_habit in Habits()._storage().iter_habits(archived=False):
+            expected.extend((epoch, loaded_habit.get("name")) for epoch in epoch_array(loaded_habit["check_off_history"]))
+        expected.sort()
+        
+        loaded_habits = []
+        original_load_habit = JSONStorage.load_habit
+        def counting_load_habit(self, habit_name, include_history = True):
+            loaded_habits.append(habit_name)
+            return original_load_habit(self, habit_name, include_history)
+        monkeypatch.setattr(JSONStorage, "load_habit", counting_load_habit)
+        checkoffs = list(Analytics().get_checkoffs_across_habits())
+        monkeypatch.undo()
+        assert ([(parse_checkoff(checkoff.checked_off_at), checkoff.habit_name) for checkoff in checkoffs] == expected)
+        assert (sorted(loaded_habits) == sorted(set(loaded_habits)))
+        assert (set(loaded_habits) == set(habit_name for epoch, habit_name in expected))
+        
+        # Only the check-offs of weekly habits within the range are included.
+        start_date = datetime.fromtimestamp(expected[10][0], timezone.utc).date().isoformat()
+        weekly_checkoffs = list(Analytics().get_checkoffs_across_habits(start_date = start_date, periodicity = "weekly"))
+        assert (weekly_checkoffs)
+        assert all(checkoff.periodicity == "weekly" and checkoff.checked_off_at[:10] >= start_date for checkoff in weekly_checkoffs)
+        
+        output_path = str(tmp_path / "checkoffs.csv")
+        assert (batch_cli.main(["timeline", "--periodicity", "weekly", "--start", start_date, "--output", output_path]) == 0)
+        with open(output_path, encoding="utf-8") as read_file:
+            rows = read_file.read().splitlines()
+        assert (rows[0] == "checked_off_at,habit_name,periodicity")
+        assert (len(rows) == len(weekly_checkoffs) + 1)
+        
+        
+    def test_parallel_habit_loader(self, tmp_path, monkeypatch):
+        """This method tests whether loading habit files with a pool of threads yields the
+        same habits as loading them one after the other, in order when requested.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        generate_store(habit_count = 2 * habit_loader.PARALLEL_THRESHOLD, history_length = 20, archived_ratio = 0)
+        
+        serial_habits = list(habit_loader.iter_habits(workers = 1))
+        assert (len(serial_habits) == 2 * habit_loader.PARALLEL_THRESHOLD)
+        assert ([path_of_file for path_of_file, loaded_habit in serial_habits] == sorted(habit_loader.habit_file_paths()))
+        assert (list(habit_loader.iter_habits(workers = 4)) == serial_habits)
+        assert (sorted(habit_loader.iter_habits(ordered = False, workers = 4), key = lambda habit: habit[0]) == serial_habits)
+        
+        # Every file is still counted exactly once while being loaded by several threads.
+        with OperationStats() as stats:
+            assert (len(Analytics().get_habit_statistics()) == 2 * habit_loader.PARALLEL_THRESHOLD)
+        assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 2 * habit_loader.PARALLEL_THRESHOLD)
+        
+        
+    def test_process_pool_summaries(self, tmp_path, monkeypatch):
+        """This method tests whether the analytics give the same answers when the habit files
+        are summarised by a pool of processes (including archived habits), and fall back to a
+        single process for small stores.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        generate_store(habit_count = 40, history_length = 20)
+        archived_name = Analytics().show_all_habits().habit_names[0]
+        Habits(habit_name = archived_name).archive_habit()
+        serial_report = Analytics().full_report()
+        assert (archived_name in serial_report.archived_habits.habit_names)
+        assert (habit_loader.summarise_habits(workers = 2) is None)
+        
+        monkeypatch.setattr(habit_loader, "PROCESS_THRESHOLD", 10)
+        monkeypatch.setattr(habit_loader, "PROCESS_WORKERS", 2)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        summaries = habit_loader.summarise_habits(archived = False, workers = 2)
+        assert (len(summaries) == len(serial_report.habits.habit_names))
+        assert (Analytics().full_report() == serial_report)
+        assert (Analytics().get_longest_streak_all_habits() == serial_report.longest_streak)
+        assert (Analytics().get_most_checkoff_history() == serial_report.most_checkoffs)
+        
+        
+    def test_habit_cache(self, tmp_path):
+        """This method tests whether the habit cache only parses files that changed, hands out
+        independent copies and removes the least recently used files once it is full.
+        """
+        
+        cache = HabitCache(max_size = 2)
+        paths = [str(tmp_path / ("habit_" + str(number) + ".json")) for number in range(3)]
+        for number, path_of_file in enumerate(paths):
+            with open(path_of_file, mode="w", encoding="utf-8") as write_file:
+                json.dump({"name": "Habit " + str(number), "check_off_history": []}, write_file)
+        
+        with OperationStats() as stats:
+            cache.load(paths[0])["check_off_history"].append("2025-01-01T00:00:00Z")
+            assert (cache.load(paths[0])["check_off_history"] == [])
+        assert (stats.counters["cache_misses"] == 1)
+        assert (stats.counters["cache_hits"] == 1)
+        assert (stats.counters["json_loads"] == 1)
+        
+        # A changed file is parsed again.
+        with open(paths[0], mode="w", encoding="utf-8") as write_file:
+            json.dump({"name": "Changed habit", "check_off_history": []}, write_file)
+        assert (cache.load(paths[0])["name"] == "Changed habit")
+        assert ((cache.hits, cache.misses) == (1, 2))
+        
+        # A file replaced by another of the same size is parsed again, even with the same modification time.
+        file_stat = os.stat(paths[0])
+        with open(paths[0] + ".tmp", mode="w", encoding="utf-8") as write_file:
+            json.dump({"name": "Renamed habit", "check_off_history": []}, write_file)
+        os.replace(paths[0] + ".tmp", paths[0])
+        os.utime(paths[0], ns = (file_stat.st_atime_ns, file_stat.st_mtime_ns))
+        assert ((os.stat(paths[0]).st_mtime_ns, os.stat(paths[0]).st_size) == (file_stat.st_mtime_ns, file_stat.st_size))
+        assert (cache.load(paths[0])["name"] == "Renamed habit")
+        assert ((cache.hits, cache.misses) == (1, 3))
+        
+        # Loading a third file removes the least recently used one.
+        cache.load(paths[1])
+        cache.load(paths[0])
+        cache.load(paths[2])
+        assert (len(cache.entries) == 2)
+        cache.load(paths[1])
+        assert ((cache.hits, cache.misses) == (2, 6))
+        
+        # The decoded check-off history is kept alongside the cached file, and handed out as a copy.
+        with open(paths[2], mode="w", encoding="utf-8") as write_file:
+            json.dump({"name": "Habit 2", "check_off_history": ["2025-01-01T00:00:00Z", 1735776000]}, write_file)
+        with OperationStats() as stats:
+            cache.load_epochs(paths[2]).append(0)
+            assert (list(cache.load_epochs(paths[2])) == [1735689600, 1735776000])
+        assert (stats.counters["datetime_parses"] == 1)
+        assert (stats.counters["json_loads"] == 1)
+        
+        
+    def test_metadata_split_from_history(self):
+        """This method tests whether listing habits only reads the small habit files, while the
+        check-off histories are read from their own files, and whether habit files that still
+        contain their history (as written before the split) can be read and are split once saved.
+        """
+        
+        with open("Habits/go_to_the_gym.json", mode="r", encoding="utf-8") as read_file:
+            assert ("check_off_history" not in json.load(read_file))
+        gym_history = Habits(habit_name = "Go to the gym").load_habit_file()["check_off_history"]
+        assert (len(gym_history) > 0)
+        
+        with OperationStats() as stats:
+            Analytics().show_all_habits()
+            Analytics().get_habits_with_same_periodicity("weekly")
+            Analytics().get_archived_habits()
+        assert (stats.counters["datetime_parses"] == 0)
+        # Archived habits are listed from the index of the archive directory without loading any habit files.
+        assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 10)
+        
+        # A habit file that still contains its history is read as it is.
+        test_habit = Habits(habit_name = "Go to the gym")
+        loaded_output = test_habit.load_habit_file()
+        loaded_output["check_off_history"] = gym_history[:3]
+        with open(test_habit.habit_file_path, mode="w", encoding="utf-8") as write_file:
+            json.dump(loaded_output, write_file, indent=4)
+        
+        test_habit = Habits(habit_name = "Go to the gym")
+        loaded_output = test_habit.load_habit_file()
+        assert (loaded_output["check_off_history"] == gym_history[:3])
+        test_habit._save_habit(loaded_output)
+        with open("Habits/go_to_the_gym.json", mode="r", encoding="utf-8") as read_file:
+            assert ("check_off_history" not in json.load(read_file))
+        assert (Habits(habit_name = "Go to the gym").load_habit_file()["check_off_history"] == gym_history[:3])
+        
+        
+    def test_archive_tier(self):
+        """This method tests whether archiving a habit moves its files into the archive directory,
+        so that scans of unarchived habits never open it, and whether unarchiving moves them back.
+        """
+        
+        laundry_history = Habits(habit_name = "Do the laundry").load_habit_file()["check_off_history"]
+        Habits(habit_name = "Do the laundry").archive_habit()
+        try:
+            assert (not os.path.exists("Habits/do_the_laundry.json"))
+            assert (os.path.exists(os.path.join(ARCHIVE_DIRECTORY, "do_the_laundry.json")))
+            assert (os.path.exists(os.path.join(ARCHIVE_DIRECTORY, "do_the_laundry.history")))
+            
+            with OperationStats() as stats:
+                assert ("Do the laundry" not in Analytics().show_all_habits().habit_names)
+                assert (Analytics().get_archived_habits().habit_names == ["Do the laundry"])
+            assert (stats.counters["cache_hits"] + stats.counters["cache_misses"] == 4)
+            
+            # Archived habits can still be loaded, including their check-off history.
+            assert (Habits(habit_name = "Do the laundry").load_habit_file()["check_off_history"] == laundry_history)
+            
+        finally:
+            Habits(habit_name = "Do the laundry").unarchive_habit()
+        
+        assert (os.path.exists("Habits/do_the_laundry.json"))
+        assert (not os.path.exists(os.path.join(ARCHIVE_DIRECTORY, "do_the_laundry.json")))
+        assert (Analytics().get_archived_habits().habit_names == [])
+        assert ("Do the laundry" in Analytics().show_all_habits().habit_names)
+        
+        
+    def test_sharded_layout(self, tmp_path, monkeypatch):
+        """This method tests whether habits are created, found, archived and listed within the
+        sharded layout, and whether a store can be resharded into either layout.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        generate_store(habit_count = 20, history_length = 10)
+        flat_report = Analytics().full_report()
+        
+        assert (Habits().reshard_store("sharded") == 20)
+        assert (not any(name.endswith(".json") for name in os.listdir("Habits")))
+        assert (len(habit_loader.habit_file_paths()) == len(flat_report.habits.habit_names))
+        assert (Analytics().full_report() == flat_report)
+        
+        # New habits are created within their shard, and archiving keeps them in the same shard.
+        monkeypatch.setattr(Habits, "layout", "sharded")
+        habit_data = {"name": "Read a book", "description": "Read a chapter.", "periodicity": "daily", "archived": False,
+                      "has_checked_off_today": False, "creation_date_time": "2024-01-01T08:00:00Z", "check_off_history": []}
+        assert (Habits(habit_data = habit_data, habit_name = "Read a book").create_habit_file() == True)
+        assert (Habits(habit_data = habit_data, habit_name = "Read a book").create_habit_file() != True)
+        shard_path = layout_path("Habits", "read_a_book.json", "sharded")
+        assert (os.path.exists(shard_path))
+        assert (Habits(habit_name = "Read a book").checkoff_habit(confirmed = True) == True)
+        Habits(habit_name = "Read a book").archive_habit()
+        assert (os.path.exists(layout_path(ARCHIVE_DIRECTORY, "read_a_book.json", "sharded")))
+        assert ("Read a book" in Analytics().get_archived_habits().habit_names)
+        Habits(habit_name = "Read a book").unarchive_habit()
+        assert (len(Habits(habit_name = "Read a book").load_habit_file()["check_off_history"]) == 1)
+        
+        # Moving the store back into the flat layout removes the emptied shards.
+        assert (Habits().reshard_store("flat") == 21)
+        assert (os.path.exists("Habits/read_a_book.json"))
+        assert (os.path.exists("Habits/read_a_book.history"))
+        assert (sorted(name for name in os.listdir("Habits") if os.path.isdir(os.path.join("Habits", name))) == [".locks", "archive"])
+        assert ("Read a book" in Analytics().show_all_habits().habit_names)
+        
+        
+    def test_atomic_writes(self, tmp_path, monkeypatch):
+        """This method tests whether a failed write leaves the previous contents of a file intact,
+        and whether every durability mode flushes the expected number of files and directories.
+        """
+        
+        path_of_file = str(tmp_path / "habit.json")
+        write_json(path_of_file, {"name": "Before"})
+        
+        # A crash between writing the temporary file and replacing the file is simulated.
+        def failing_replace(source, destination):
+            raise OSError("Simulated crash")
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            write_json(path_of_file, {"name": "After"})
+        monkeypatch.undo()
+        assert (json.loads((tmp_path / "habit.json").read_text()) == {"name": "Before"})
+        assert (os.listdir(tmp_path) == ["habit.json"])
+        
+        # Every write is flushed alongside its directory, or the files of a group and their directory once.
+        with OperationStats() as stats:
+            atomic_write.write_atomically(path_of_file, b"{}", durability = "fsync")
+        assert (stats.counters["fsyncs"] == 2)
+        
+        monkeypatch.setattr(atomic_write, "_group_commit", atomic_write.GroupCommit(size = 3, interval = 60))
+        with OperationStats() as stats:
+            for number in range(5):
+                atomic_write.write_atomically(str(tmp_path / ("habit_" + str(number) + ".json")), b"{}", durability = "group")
+            assert (stats.counters["fsyncs"] == 3 + 1)
+            assert (atomic_write.flush_writes() == 2)
+        assert (stats.counters["fsyncs"] == (3 + 1) + (2 + 1))
+        assert (not any(name.endswith(".tmp") for name in os.listdir(tmp_path)))
+        
+        # Check-off logs are appended to in place, and follow the durability mode all the same.
+        checkoff_log = CheckoffLog(str(tmp_path / "logged.json"))
+        monkeypatch.setattr(atomic_write, "DURABILITY", "fsync")
+        with OperationStats() as stats:
+            checkoff_log.append(0, "2025-01-01T08:00:00Z")
+            assert (stats.counters["fsyncs"] == 2)
+            checkoff_log.append(1, "2025-01-02T08:00:00Z")
+        assert (stats.counters["fsyncs"] == 2 + 1)
+        
+        monkeypatch.setattr(atomic_write, "DURABILITY", "group")
+        with OperationStats() as stats:
+            checkoff_log.append(2, "2025-01-03T08:00:00Z")
+            checkoff_log.append(3, "2025-01-04T08:00:00Z")
+            assert (stats.counters["fsyncs"] == 0)
+            assert (atomic_write.flush_writes() == 1)
+        assert (stats.counters["fsyncs"] == 1 + 1)
+        assert ([entry["position"] for entry in checkoff_log.read()] == [0, 1, 2, 3])
+        
+        
+    @pytest.mark.parametrize("concurrency", ["locking", "optimistic"])
+    def test_concurrent_checkoffs(self, tmp_path, monkeypatch, concurrency):
+        """This method tests whether check-offs of the same habit made by many processes at once
+        are all recorded, including those compacted from the check-off log into the habit file,
+        in both concurrency modes.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        habit_data = {"name": "Stress test", "description": "Checked-off by many processes at once.", "periodicity": "daily", "archived": False,
+                      "has_checked_off_today": False, "creation_date_time": "2024-01-01T08:00:00Z", "check_off_history": []}
+        assert (Habits(habit_data = habit_data).create_habit_file() == True)
+        
+        process_count = 8
+        checkoff_count = COMPACTION_THRESHOLD // 2
+        processes = [multiprocessing.Process(target = hammer_checkoffs, args = (str(tmp_path), "Stress test", checkoff_count, concurrency)) for process in range(process_count)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert ([process.exitcode for process in processes] == [0] * process_count)
+        
+        loaded_output = Habits(habit_name = "Stress test").load_habit_file()
+        assert (len(loaded_output["check_off_history"]) == process_count * checkoff_count)
+        assert (loaded_output["summary"]["total_count"] == process_count * checkoff_count)
+        assert (loaded_output["version"] >= process_count * checkoff_count)
+        
+        
+    def test_concurrent_index_updates(self, tmp_path, monkeypatch):
+        """This method tests whether habits created by many processes at once all end up in the
+        habit index, which every process changes while holding its lock, and whether the index
+        file is replaced without leaving any temporary files behind.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("Habits")
+        
+        process_count = 8
+        habit_count = 10
+        processes = [multiprocessing.Process(target = create_habits, args = (str(tmp_path), process_number, habit_count)) for process_number in range(process_count)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert ([process.exitcode for process in processes] == [0] * process_count)
+        
+        # The index is read from the disk, as written by the other processes, without being rebuilt.
+        habit_index = get_index(os.path.join(str(tmp_path), "Habits"))
+        habit_index.entries = None
+        habit_index._ensure_loaded()
+        assert (habit_index.is_stale() == False)
+        assert (len(habit_index.list_entries()) == process_count * habit_count)
+        for process_number in range(process_count):
+            for habit_number in range(habit_count):
+                assert (habit_index.normalise_name("Habit " + str(process_number) + "-" + str(habit_number)) in habit_index.entries)
+        assert ([file_name for file_name in os.listdir("Habits") if file_name.endswith(".tmp")] == [])
+        
+        
+    def test_habit_lock_nesting(self):
+        """This method tests whether locks of the same habit can be nested within a thread, and
+        whether a shared lock is refused rather than converted into an exclusive one, which would
+        briefly leave the habit unlocked.
+        """
+        
+        with HabitLock("Go to the gym"):
+            with HabitLock("Go to the gym", shared = True):
+                with HabitLock("Go to the gym"):
+                    pass
+        
+        with HabitLock("Go to the gym", shared = True):
+            with pytest.raises(RuntimeError):
+                with HabitLock("Go to the gym"):
+                    pass
+        
+        # Every lock was released, so the habit can be locked again without waiting.
+        with HabitLock("Go to the gym", blocking = False):
+            pass
+        
+        
+    def test_optimistic_concurrency(self, monkeypatch):
+        """This method tests whether every change increases the version of a habit, and whether a
+        change is attempted again with the latest data should another session change the habit first.
+        """
+        
+        monkeypatch.setattr(Habits, "concurrency", "optimistic")
+        version = Habits(habit_name = "Clean the house").load_habit_file()["version"]
+        Habits(habit_name = "Clean the house").archive_habit()
+        Habits(habit_name = "Clean the house").unarchive_habit()
+        assert (Habits(habit_name = "Clean the house").load_habit_file()["version"] == version + 2)
+        
+        # Another session archives the habit right before the first attempt is saved.
+        original_load_version = JSONStorage.load_version
+        def conflicting_load_version(self, habit_name):
+            if not conflicts:
+                conflicts.append(habit_name)
+                Habits(habit_name = "Clean the house").archive_habit()
+            return original_load_version(self, habit_name)
+        conflicts = []
+        monkeypatch.setattr(JSONStorage, "load_version", conflicting_load_version)
+        
+        with OperationStats() as stats:
+            Habits(habit_name = "Clean the house").unarchive_habit()
+        assert (stats.counters["version_conflicts"] == 1)
+        loaded_output = Habits(habit_name = "Clean the house").load_habit_file()
+        assert (loaded_output["archived"] == False)
+        assert (loaded_output["version"] == version + 4)
+        
+        
+    @pytest.mark.parametrize("storage_mode", ["json", "sqlite", "memory"])
+    def test_rename_collision(self, tmp_path, monkeypatch, storage_mode):
+        """This method tests whether every storage refuses to rename a habit to the name of
+        another habit, which leaves both habits unchanged, while renaming a habit to a
+        differently capitalised version of its own name is still allowed.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        if storage_mode == "sqlite":
+            import sqlite_storage
+            storage = sqlite_storage.SQLiteStorage(os.path.join("Habits", sqlite_storage.DATABASE_FILENAME))
+        elif storage_mode == "memory":
+            storage = MemoryStorage()
+        else:
+            storage = JSONStorage()
+        assert (Habits(storage = storage).seed_predefined_habits() == True)
+        gym_checkoffs = len(storage.load_habit("Go to the gym")["check_off_history"])
+        friend_checkoffs = len(storage.load_habit("Message a friend")["check_off_history"])
+        
+        # The habit is renamed via "edit_habit_file()", with the answers of the user given in turn.
+        def edit_habit(new_name):
+            answers = iter([new_name, "", "", "yes"])
+            monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                Habits(habit_name = "Go to the gym", storage = storage).edit_habit_file()
+            return output.getvalue()
+        
+        assert ("already exists" in edit_habit("message_a_friend"))
+        assert (storage.load_habit("Go to the gym")["name"] == "Go to the gym")
+        assert (len(storage.load_habit("Go to the gym")["check_off_history"]) == gym_checkoffs)
+        assert (storage.load_habit("Message a friend")["name"] == "Message a friend")
+        assert (len(storage.load_habit("Message a friend")["check_off_history"]) == friend_checkoffs)
+        assert (len(list(storage.iter_summaries())) == 5)
+        
+        # The storage itself refuses the rename as well, should it be asked directly.
+        assert (storage.update_habit("Go to the gym", dict(storage.load_habit("Go to the gym"), name = "Message a friend")) == False)
+        assert (storage.load_habit("Message a friend")["name"] == "Message a friend")
+        
+        assert ("successfully edited" in edit_habit("Go To The Gym"))
+        assert (storage.load_habit("go to the gym")["name"] == "Go To The Gym")
+        assert (len(storage.load_habit("go to the gym")["check_off_history"]) == gym_checkoffs)
+        
+        
+    def test_memory_storage(self, tmp_path, monkeypatch):
+        """This method tests whether the Habits and Analytics classes behave the same when
+        the habits are only kept in memory, without anything being written to the disk.
+        """
+        
+        monkeypatch.chdir(tmp_path)
+        storage = MemoryStorage()
+        assert (Habits(storage = storage).seed_predefined_habits() == True)
+        assert (Habits(storage = storage).seed_predefined_habits() == False)
+        
+        # The same analytics as with the JSON files are expected.
+        assert (Analytics(habit_name = "Go to the gym", storage = storage).get_longest_streak_single_habit().longest_streak == 19)
+        assert (Analytics(storage = storage).get_most_checkoff_history().habit_names == ["Message a friend"])
+        assert (Analytics(storage = storage).get_least_checkoff_history().habit_names == ["Clean the house"])
+        assert (Analytics(habit_name = "Do the laundry", storage = storage).get_checkoffs_in_range("2025-04-01", "2025-04-30", count_only = True).check_off_count == 4)
+        
+        # Changes are kept by the storage, and every change increases the version of the habit.
+        version = Habits(habit_name = "Go to the gym", storage = storage).load_habit_file()["version"]
+        assert (Habits(habit_name = "Go to the gym", storage = storage).checkoff_habit(confirmed = True) == True)
+        Habits(habit_name = "Go to the gym", storage = storage).archive_habit()
+        loaded_output = Habits(habit_name = "Go to the gym", storage = storage).load_habit_file()
+        assert (len(loaded_output["check_off_history"]) == 29)
+        assert (loaded_output["version"] == version + 2)
+        assert (Analytics(storage = storage).get_archived_habits().habit_names == ["Go to the gym"])
+        
+        # Changing loaded habit data does not change the stored habit.
+        loaded_output["check_off_history"].clear()
+        assert (len(Habits(habit_name = "Go to the gym", storage = storage).load_habit_file()["check_off_history"]) == 29)
+        
+        # Renaming a habit to the name of another habit is refused, leaving both habits unchanged.
+        assert (storage.update_habit("Go to the gym", dict(loaded_output, name = "Message a friend")) == False)
+        assert (storage.load_habit("Go to the gym")["name"] == "Go to the gym")
+        assert (len(storage.load_habit("Message a friend")["check_off_history"]) == 29)
+        assert (storage.load_habit("Message a friend")["archived"] == False)
+        
+        # Every storage must implement the abstract methods of the storage interface.
+        with pytest.raises(TypeError):
+            HabitStorage()
+        
+        Habits(habit_name = "Go to the gym", storage = storage).delete_habit_file()
+        assert (Habits(habit_name = "Go to the gym", storage = storage).load_habit_file() == False)
+        assert (os.listdir(tmp_path) == [])
+        
+        
     def teardown_method(self):
         """This method runs after the main testing has concluded.
         All files that had been created upon startup are removed, creating
@@ -130,3 +1045,10 @@ class TestProject:
         os.remove("Habits/go_to_the_gym.json")
         os.remove("Habits/message_a_friend.json")
         os.remove("Habits/writing_in_a_journal.json")
+        
+        # The check-off histories are stored within their own files next to the habit files.
+        os.remove("Habits/clean_the_house.history")
+        os.remove("Habits/do_the_laundry.history")
+        os.remove("Habits/go_to_the_gym.history")
+        os.remove("Habits/message_a_friend.history")
+        os.remove("Habits/writing_in_a_journal.history")
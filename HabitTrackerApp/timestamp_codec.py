@@ -0,0 +1,243 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date
+from instrumentation import count
+
+
+# The legacy format of check-offs within the "check_off_history" attribute.
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# The number of seconds within a single day, used to convert epoch seconds into day numbers.
+SECONDS_PER_DAY = 86400
+
+# The proleptic Gregorian ordinal of 1970-01-01, used to convert dates into day numbers.
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _days_from_civil(year: int, month: int, day: int):
+    """This function calculates the number of days between 1970-01-01 and a given
+    date in the proleptic Gregorian calendar using integer arithmetic only, which
+    avoids constructing a datetime object for every check-off.
+
+    Args:
+        year (int): The year of the date.
+        month (int): The month of the date (1-12).
+        day (int): The day of the month (1-31).
+
+    Returns:
+        days (int): The number of days since 1970-01-01.
+    """
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_checkoff(checkoff):
+    """This function converts a single check-off into epoch seconds. Check-offs that
+    are already stored as epoch seconds are returned unchanged, while check-offs in the
+    legacy ISO 8601 format (for example, "2025-04-01T12:54:39Z") are parsed by slicing
+    the string. Any other ISO 8601 variant falls back to "datetime.fromisoformat()".
+
+    Args:
+        checkoff (int | str): The check-off as epoch seconds or as an ISO 8601 string.
+
+    Returns:
+        epoch_seconds (int): The number of seconds since 1970-01-01T00:00:00Z.
+    """
+    if isinstance(checkoff, int):
+        return checkoff
+
+    count("datetime_parses")
+    return _parse_iso_checkoff(checkoff)
+
+
+def _parse_iso_checkoff(checkoff: str):
+    """This function converts a check-off stored as an ISO 8601 string into epoch seconds
+    without counting the conversion, which allows whole histories to be counted at once.
+
+    Args:
+        checkoff (str): The check-off as an ISO 8601 string.
+
+    Returns:
+        epoch_seconds (int): The number of seconds since 1970-01-01T00:00:00Z.
+    """
+    if (len(checkoff) == 20) and (checkoff[10] == "T") and (checkoff[19] == "Z"):
+        days = _days_from_civil(int(checkoff[0:4]), int(checkoff[5:7]), int(checkoff[8:10]))
+        return days * SECONDS_PER_DAY + int(checkoff[11:13]) * 3600 + int(checkoff[14:16]) * 60 + int(checkoff[17:19])
+
+    return int(datetime.fromisoformat(checkoff.replace("Z", "+00:00")).timestamp())
+
+
+def _canonical_iso_checkoff(checkoff: str):
+    """This function returns a check-off stored as an ISO 8601 string in the legacy format
+    (for example, "2025-04-01T12:54:39Z"), in which check-offs sort in chronological order
+    when compared as strings. Check-offs already in that format are returned unchanged, while
+    any other ISO 8601 variant (such as one with a time zone offset) is converted.
+
+    Args:
+        checkoff (str): The check-off as an ISO 8601 string.
+
+    Returns:
+        canonical_checkoff (str): The check-off in the legacy ISO 8601 format.
+    """
+    if (len(checkoff) == 20) and (checkoff[10] == "T") and (checkoff[19] == "Z"):
+        return checkoff
+    return time.strftime(ISO_FORMAT, time.gmtime(_parse_iso_checkoff(checkoff)))
+
+
+def format_checkoff(checkoff, pattern: str = ISO_FORMAT):
+    """This function converts a single check-off into a string in UTC.
+
+    Args:
+        checkoff (int | str): The check-off as epoch seconds or as an ISO 8601 string.
+        pattern (str, optional): The "strftime" pattern to use. Defaults to the legacy ISO 8601 format.
+
+    Returns:
+        formatted_checkoff (str): The formatted check-off.
+    """
+    if isinstance(checkoff, str) and (pattern == ISO_FORMAT):
+        return checkoff
+    return time.strftime(pattern, time.gmtime(parse_checkoff(checkoff)))
+
+
+def today_day_number():
+    """This function returns the number of days between 1970-01-01 and today's date.
+    As before, today's date is taken from the local calendar, while check-offs are
+    compared by their date in UTC.
+
+    Returns:
+        day_number (int): The day number of today.
+    """
+    return date.today().toordinal() - _UNIX_EPOCH_ORDINAL
+
+
+def epoch_array(check_off_history: list):
+    """This function encodes a check-off history as epoch seconds within an
+    "array('q')" buffer, which stores every check-off as a single 8-byte integer.
+
+    Args:
+        check_off_history (list): The check-offs as epoch seconds, ISO 8601 strings, or a mix of both.
+
+    Returns:
+        epoch_seconds (array): The check-offs as epoch seconds.
+    """
+    try:
+        return array("q", check_off_history)
+    except TypeError:
+        epoch_seconds = array("q", [checkoff if isinstance(checkoff, int) else _parse_iso_checkoff(checkoff) for checkoff in check_off_history])
+        count("datetime_parses", sum(isinstance(checkoff, str) for checkoff in check_off_history))
+        return epoch_seconds
+
+
+def day_numbers(check_off_history: list):
+    """This function converts a check-off history into the number of days since
+    1970-01-01 (in UTC) for every check-off.
+
+    Args:
+        check_off_history (list): The check-offs as epoch seconds, ISO 8601 strings, or a mix of both.
+
+    Returns:
+        day_numbers (array): The day number of every check-off.
+    """
+    return array("q", [epoch_seconds // SECONDS_PER_DAY for epoch_seconds in epoch_array(check_off_history)])
+
+
+def iso_history(check_off_history: list):
+    """This function decodes a check-off history into the legacy ISO 8601 format.
+
+    Args:
+        check_off_history (list): The check-offs as epoch seconds, ISO 8601 strings, or a mix of both.
+
+    Returns:
+        check_off_history (list): The check-offs as ISO 8601 strings.
+    """
+    return [format_checkoff(checkoff) for checkoff in check_off_history]
+
+
+def encode_history(check_off_history: list, encoding: str):
+    """This function encodes a check-off history for storage within a habit file.
+
+    Args:
+        check_off_history (list): The check-offs as epoch seconds, ISO 8601 strings, or a mix of both.
+        encoding (str): Either "iso" for the legacy ISO 8601 strings or "epoch" for epoch seconds.
+
+    Returns:
+        check_off_history (list): The encoded check-offs.
+    """
+    if encoding == "epoch":
+        return epoch_array(check_off_history).tolist()
+    return iso_history(check_off_history)
+
+
+def checkoff_range_bounds(check_off_history, start_epoch: int = None, end_epoch: int = None):
+    """This function finds the check-offs within a range of time by binary search, which
+    relies on check-off histories being appended in chronological order. Histories stored
+    as epoch seconds are searched directly, while histories in the legacy ISO 8601 format
+    are searched by comparing strings, as the format sorts in chronological order. Only the
+    check-offs the search looks at that use another ISO 8601 variant (which would not compare
+    correctly as strings) are converted into the legacy format, so neither requires parsing the
+    history. Only a history that mixes epoch seconds and strings is converted first.
+
+    Args:
+        check_off_history (list | array): The check-offs in chronological order.
+        start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+        end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+    Returns:
+        bounds (tuple): The index of the first check-off within the range and the index after the last one,
+        so that "check_off_history[first:stop]" are the check-offs within the range.
+    """
+    if len(check_off_history) == 0:
+        return 0, 0
+
+    # A history only mixes both formats after the history encoding was changed, in which case
+    # the older check-offs use one format and the newer ones the other.
+    if type(check_off_history[0]) is not type(check_off_history[-1]):
+        return checkoff_range_bounds(epoch_array(check_off_history), start_epoch, end_epoch)
+
+    try:
+        stored_as_text = isinstance(check_off_history[0], str)
+        start_key = format_checkoff(start_epoch) if stored_as_text and (start_epoch is not None) else start_epoch
+        end_key = format_checkoff(end_epoch) if stored_as_text and (end_epoch is not None) else end_epoch
+        search_key = _canonical_iso_checkoff if stored_as_text else None
+        first = 0 if start_key is None else bisect_left(check_off_history, start_key, key=search_key)
+        stop = len(check_off_history) if end_key is None else bisect_right(check_off_history, end_key, key=search_key)
+    except TypeError:
+        return checkoff_range_bounds(epoch_array(check_off_history), start_epoch, end_epoch)
+
+    return first, max(first, stop)
+
+
+def checkoffs_in_range(check_off_history, start_epoch: int = None, end_epoch: int = None):
+    """This function returns the check-offs within a range of time, as they are stored.
+
+    Args:
+        check_off_history (list | array): The check-offs in chronological order.
+        start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+        end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+    Returns:
+        checkoffs (list | array): The check-offs within the range.
+    """
+    first, stop = checkoff_range_bounds(check_off_history, start_epoch, end_epoch)
+    return check_off_history[first:stop]
+
+
+def count_checkoffs_in_range(check_off_history, start_epoch: int = None, end_epoch: int = None):
+    """This function counts the check-offs within a range of time without copying them.
+
+    Args:
+        check_off_history (list | array): The check-offs in chronological order.
+        start_epoch (int, optional): The earliest check-off to include, in epoch seconds. Defaults to None (no limit).
+        end_epoch (int, optional): The latest check-off to include, in epoch seconds. Defaults to None (no limit).
+
+    Returns:
+        check_off_count (int): The number of check-offs within the range.
+    """
+    first, stop = checkoff_range_bounds(check_off_history, start_epoch, end_epoch)
+    return stop - first
+